@@ -1,5 +1,75 @@
+from typing import TYPE_CHECKING
+import importlib
 from .__version__ import __version__, __version_info__
-from . import generatepop
-from .generatepop import generate_pop
-from .impl.enum import EnzymeRateCLintUnits, EnzymeRateParameter, EnzymeRateVmaxUnits, Dataset, FlowUnits, PopulationType
-from .impl.poptocsv import pop_to_csv
+
+# Public names and the modules they are defined in. The modules, and NumPy with them, are only
+# imported when a name is first used, so that importing the package itself is fast.
+_LAZY_ATTRIBUTES = {
+    'generatepop': '.generatepop',
+    'generate_pop': '.generatepop',
+    'iter_pop': '.generatepop',
+    'extend_pop': '.generatepop',
+    'generatepopasync': '.generatepopasync',
+    'generate_pop_async': '.generatepopasync',
+    'iter_pop_async': '.generatepopasync',
+    'generatepops': '.generatepops',
+    'generate_pops': '.generatepops',
+    'ScenarioResult': '.impl.scenarioresult',
+    'EnzymeRateCLintUnits': '.impl.enum',
+    'EnzymeRateParameter': '.impl.enum',
+    'EnzymeRateVmaxUnits': '.impl.enum',
+    'Dataset': '.impl.enum',
+    'FlowUnits': '.impl.enum',
+    'PopulationType': '.impl.enum',
+    'Engine': '.impl.enum',
+    'Stage': '.impl.enum',
+    'PoolType': '.impl.enum',
+    'OutputFormat': '.impl.enum',
+    'Progress': '.impl.progress',
+    'pop_to_csv': '.impl.poptocsv',
+    'write_pop_csv': '.impl.writepopcsv',
+    'PopWriter': '.impl.popwriter',
+    'save_pop': '.impl.savepop',
+    'load_pop': '.impl.loadpop',
+    'PopCache': '.impl.popcache',
+    'StatsAccumulator': '.impl.statsaccumulator',
+    'SummaryAccumulator': '.impl.summaryaccumulator',
+}
+
+__all__ = ['__version__', '__version_info__', *_LAZY_ATTRIBUTES]
+
+if TYPE_CHECKING:
+    from . import generatepop
+    from .generatepop import generate_pop, iter_pop, extend_pop
+    from . import generatepopasync
+    from .generatepopasync import generate_pop_async, iter_pop_async
+    from . import generatepops
+    from .generatepops import generate_pops
+    from .impl.scenarioresult import ScenarioResult
+    from .impl.enum import EnzymeRateCLintUnits, EnzymeRateParameter, EnzymeRateVmaxUnits, Dataset, FlowUnits, PopulationType, Engine, Stage, PoolType, OutputFormat
+    from .impl.progress import Progress
+    from .impl.poptocsv import pop_to_csv
+    from .impl.writepopcsv import write_pop_csv
+    from .impl.popwriter import PopWriter
+    from .impl.savepop import save_pop
+    from .impl.loadpop import load_pop
+    from .impl.popcache import PopCache
+    from .impl.statsaccumulator import StatsAccumulator
+    from .impl.summaryaccumulator import SummaryAccumulator
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+    value = module if name == module.__name__.rpartition('.')[2] else getattr(module, name)
+
+    # Cache, so that __getattr__ is not called again for this name
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(__all__)
@@ -1,9 +1,10 @@
 import numpy as np
-from typing import Any
+from typing import Any, Optional
 from pathlib import Path
 import json
 import pickle
 from defineconsts.parsemeanvaluesxml import parse_mean_values_xml
+from defineconsts.hashsources import hash_sources
 from defineconsts.indicesoforgans import indices_of_organs
 from defineconsts.numpyencoder import NumpyEncoder
 from defineconsts.readcoeffsfromfile import read_coeffs_from_file
@@ -11,7 +12,10 @@ from defineconsts.readcoeffsfromfile import read_coeffs_from_file
 THIS_DIR = Path(__file__).parent
 
 
-def define_consts_for_popgen() -> dict[str, Any]:
+def define_consts_for_popgen(
+    pkl_path: Path = THIS_DIR / '../popgenconsts.pkl',
+    json_path: Optional[Path] = THIS_DIR / 'data/popgenconsts.json'
+) -> dict[str, Any]:
 
     in_file_path = THIS_DIR / 'data/MeanValues.xml'
     mean_individual = parse_mean_values_xml(in_file_path)
@@ -339,13 +343,17 @@ def define_consts_for_popgen() -> dict[str, Any]:
         }
     }
 
-    with open(THIS_DIR / 'data/popgenconsts.json', 'w', encoding='utf-8') as f:
-        json.dump(CONSTS, f, ensure_ascii=False, indent=2, cls=NumpyEncoder)
+    if json_path is not None:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(CONSTS, f, ensure_ascii=False, indent=2, cls=NumpyEncoder)
 
-    with open(THIS_DIR / '../popgenconsts.pkl', 'wb') as f:
+    # Lets get_consts tell that the pickle is up to date with its sources
+    CONSTS["SOURCE_HASH"] = hash_sources()
+
+    with open(pkl_path, 'wb') as f:
         pickle.dump(CONSTS, f)
 
-    with open(THIS_DIR / '../popgenconsts.pkl', 'rb') as f:
+    with open(pkl_path, 'rb') as f:
         CONSTS = pickle.load(f)
 
     return CONSTS
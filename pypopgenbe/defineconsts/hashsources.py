@@ -0,0 +1,27 @@
+import hashlib
+from pathlib import Path
+
+THIS_DIR = Path(__file__).parent
+
+# Written alongside popgenconsts.pkl by define_consts_for_popgen, so not one of its sources
+BUILD_OUTPUTS = ['popgenconsts.json']
+
+
+def hash_sources(sources_dir: Path = THIS_DIR / 'data') -> str:
+    """
+    Returns a SHA-256 hash of the names and contents of the files popgenconsts.pkl is built from.
+
+    Parameters:
+    sources_dir (Path): The directory of the sources.
+
+    Returns:
+    str: The hex digest.
+    """
+    sha = hashlib.sha256()
+    for path in sorted(sources_dir.iterdir()):
+        if not path.is_file() or path.name in BUILD_OUTPUTS:
+            continue
+        sha.update(path.name.encode('utf-8'))
+        sha.update(path.read_bytes())
+
+    return sha.hexdigest()
@@ -1,10 +1,10 @@
-from typing import Union, List, Optional, Dict, Any, Tuple, cast, Callable
+from typing import Union, List, Optional, Dict, Any, Tuple, cast, Callable, Iterator, Deque
 import numpy as np
-from scipy.interpolate import interp1d
-from numpy.polynomial.polynomial import Polynomial
-from pathlib import Path
-import pickle
+import copy
 import time
+from pathlib import Path
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, wait
 
 from pypopgenbe.impl.createethnicitybreaks import create_ethnicity_breaks
 from pypopgenbe.impl.assignsex import assign_sex
@@ -24,11 +24,47 @@ from pypopgenbe.impl.varyinvitroenzymerates import vary_in_vitro_enzyme_rates
 from pypopgenbe.impl.calculateinvivoenzymerate import calculate_in_vivo_enzyme_rate
 from pypopgenbe.impl.convertenzymerateunits import convert_enzyme_rate_units
 from pypopgenbe.impl.invertindicies import invert_indices
-from pypopgenbe.impl.generatestats import generate_stats
 from pypopgenbe.impl.collateinputs import collate_inputs
-from pypopgenbe.impl.enum import EnzymeRateCLintUnits, EnzymeRateParameter, EnzymeRateVmaxUnits, Dataset, FlowUnits, PopulationType
-
-THIS_DIR = Path(__file__).parent
+from pypopgenbe.impl.samplecandidates import sample_candidates
+from pypopgenbe.impl.compileanthropometriccurves import compile_anthropometric_curves
+from pypopgenbe.impl.evaluateanthropometriccurves import evaluate_anthropometric_curves
+from pypopgenbe.impl.sampleorganflows import sample_organ_flows
+from pypopgenbe.impl.compileorganvariation import compile_organ_variation
+from pypopgenbe.impl.getconsts import get_consts, get_compiled
+from pypopgenbe.impl.estimatebatchsize import estimate_batch_size
+from pypopgenbe.impl.isbudgetexhausted import is_budget_exhausted
+from pypopgenbe.impl.wilsoninterval import wilson_interval
+from pypopgenbe.impl.progress import Progress
+from pypopgenbe.impl.progressreporter import ProgressReporter
+from pypopgenbe.impl.summaryaccumulator import SummaryAccumulator
+from pypopgenbe.impl.hashinputs import hash_inputs
+from pypopgenbe.impl.popcache import PopCache
+from pypopgenbe.impl.checkpointer import Checkpointer
+from pypopgenbe.impl.mpcontext import mp_context
+from pypopgenbe.impl.enum import EnzymeRateCLintUnits, EnzymeRateParameter, EnzymeRateVmaxUnits, Dataset, FlowUnits, PopulationType, Engine, Stage
+
+# Bounds on the number of candidates sampled per batch by the vectorized engine
+_MIN_BATCH_SIZE = 256
+_MAX_BATCH_SIZE = 65536
+
+# Reasons for discarding a candidate, in the order the tests are applied
+_REJECTION_REASONS = ("NegativeMass", "AdiposeFraction", "BMI")
+
+# Bounds on the number of candidates sampled to check min_acceptance_rate, and the spawn key of the
+# stream they are drawn from, which is kept apart from the streams of the population itself
+_MIN_PILOT_SIZE = 1024
+_MAX_PILOT_SIZE = 1048576
+_PILOT_SPAWN_KEY = 2**32 - 1
+
+# Chunks sampled per worker process, so that progress is reported while sampling rather than at its end
+_CHUNKS_PER_WORKER = 4
+
+# Seconds between checks for cancellation while waiting on worker processes
+_PARALLEL_POLL_INTERVAL = 0.01
+
+# Arguments of generate_pop that say how to run it rather than which population to generate, so that
+# _validate_inputs does not take them
+_RUN_ARGUMENTS = ('workers', 'cache', 'checkpoint_dir', 'checkpoint_every')
 
 
 def generate_pop(
@@ -50,7 +86,19 @@ def generate_pop(
     molecular_weight: Optional[float] = None,
     seed: Optional[int] = None,
     population_type: Union[PopulationType, str] = PopulationType.Realistic,
-    callback: Optional[Callable[[int, int], bool]] = None
+    callback: Optional[Callable[[int, int], bool]] = None,
+    engine: Union[Engine, str] = Engine.Loop,
+    workers: int = 1,
+    max_attempts: Optional[int] = None,
+    deadline_seconds: Optional[float] = None,
+    min_acceptance_rate: Optional[float] = None,
+    progress: Optional[Callable[[Progress], bool]] = None,
+    progress_interval: float = 0.5,
+    progress_fraction: float = 0.05,
+    cancel_event: Optional[Any] = None,
+    cache: Optional[Union[str, Path, PopCache]] = None,
+    checkpoint_dir: Optional[Union[str, Path]] = None,
+    checkpoint_every: float = 60.
 ) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
     """
     Generates a population of virtual individuals with data on organ masses and flows and some enzyme abundances.
@@ -94,12 +142,36 @@ def generate_pop(
     population_type : str, optional
         The type of population desired. Either 'Realistic' or 'HighVariation'. Default is 'Realistic'.
     callback : Optional[Callable[[int, int], bool]]
-        Function called during generation. Parameters are number generated and number discard. Return value indicates whether or not to continue generation.
+        Function called during sampling, as often as progress is. Parameters are number generated and number discarded. Returning True cancels generation.
+    engine : str, optional
+        How individuals are sampled. Either 'Loop', which builds one individual at a time, or 'Vectorized', which samples batches of candidates as arrays and keeps those that pass the filters. Default is 'Loop'.
+    workers : int, optional
+        The number of processes to sample individuals in. With more than one, the population is split into four chunks per worker, each sampled from an independent stream spawned from the seed. The callback is called while the chunks are sampled, and cancelling stops the workers mid-chunk. Results are reproducible for a given seed and number of workers. Each worker imports the caller's main module, so a script must call generate_pop under `if __name__ == '__main__':`. Default is 1.
+    max_attempts : int, optional
+        The most candidates to sample, accepted or discarded. When it is reached, sampling stops and the individuals accepted so far are returned, as when the callback cancels generation. Default is None, for no limit.
+    deadline_seconds : float, optional
+        The most time to spend sampling, in seconds from the call. When it passes, sampling stops and the individuals accepted so far are returned. Default is None, for no limit.
+    min_acceptance_rate : float, optional
+        If given, a pilot batch of candidates is sampled before the population, from a stream of its own, and a ValueError is raised if the filters are estimated to accept fewer than this fraction of candidates. Default is None, for no check.
+    progress : Optional[Callable[[Progress], bool]]
+        Function called with a Progress at the start of each stage (Sampling, Aggregation, Enzymes, Stats) and during sampling, once progress_interval seconds have passed or another progress_fraction of the population has been accepted since the last call, whichever is sooner. Returning True during sampling cancels generation. Default is None.
+    progress_interval : float, optional
+        The most seconds between calls to progress and callback during sampling. Default is 0.5.
+    progress_fraction : float, optional
+        The most fraction of the population accepted between calls to progress and callback during sampling. Default is 0.05.
+    cancel_event : optional
+        An object with an is_set method, such as a threading.Event. Once it is set, sampling stops within a few milliseconds of the next candidate or batch, as when the callback cancels generation. Default is None.
+    cache : Union[str, Path, PopCache], optional
+        A PopCache, or the directory of one of the default size, to look the population up in before generating it, and to save it to once it is complete. The population is looked up by a hash of the inputs, the number of workers, and the versions of the library and constants; when it is found, its arrays are memory-mapped read-only and the callbacks are not called. Only used if seed is given, as the population is otherwise different every time. Default is None.
+    checkpoint_dir : Union[str, Path], optional
+        A directory to save the state of sampling to every checkpoint_every seconds, and when sampling stops early: the individuals accepted, the numbers rejected and the random state. A later call with the same inputs carries on from the last checkpoint, and returns the population an uninterrupted run would have. With the vectorized engine, a last batch cut short by max_attempts is left out of the checkpoint, as an uninterrupted run would draw a full batch in its place. The checkpoint is removed once the population is complete. The checkpoint is found by a hash of the inputs, as for cache, so seed must be given, and workers must be 1. Default is None.
+    checkpoint_every : float, optional
+        The least seconds between checkpoints. Default is 60.
 
     Returns
     -------
     population : dict
-        The generated population details in a structured format.
+        The generated population details in a structured format. Its 'Diagnostics' give the number of candidates sampled and accepted, the acceptance rate, and the number of candidates rejected for each reason: 'NegativeMass', 'AdiposeFraction' (below the minimum adipose fraction) and 'BMI' (outside bmi_range). 'StoppedBy' is None if the population is complete, and otherwise 'Callback' (cancelled by callback, progress or cancel_event), 'MaxAttempts' or 'Deadline'. With the loop engine and one worker, population['Inputs']['Resume'] records the random state sampling finished with and the inputs not otherwise recorded, so that extend_pop can add individuals to it.
     number_of_individuals_discarded : int
         The number of individuals discarded due to out-of-range values or negative tissue masses.
     """
@@ -107,9 +179,315 @@ def generate_pop(
     if population_size < 1:
         return None, None
 
-    with open(THIS_DIR / 'popgenconsts.pkl', 'rb') as f:
-        CONSTS: Dict[str, Any] = pickle.load(f)
-    
+    if workers < 1:
+        raise ValueError(f"Number of workers must be at least 1: {workers}")
+
+    inputs = _validate_inputs(
+        population_size,
+        dataset_name,
+        age_range,
+        bmi_range,
+        height_range,
+        prob_of_male,
+        probs_of_ethnicities,
+        is_slowly_perfused_tissue_discrete,
+        is_richly_perfused_tissue_discrete,
+        enzyme_rate_parameter,
+        enzyme_names,
+        in_vitro_enzyme_rates,
+        in_vitro_enzyme_rate_coeffs_of_var,
+        flow_units,
+        enzyme_rate_units,
+        molecular_weight,
+        seed,
+        population_type,
+        callback,
+        engine,
+        max_attempts,
+        deadline_seconds,
+        min_acceptance_rate,
+        progress,
+        progress_interval,
+        progress_fraction,
+        cancel_event
+    )
+
+    checkpointer = None
+    if checkpoint_dir is not None:
+        if seed is None or seed < 0:
+            raise ValueError("A seed is required to checkpoint, so that a restarted run can find its checkpoint")
+        if workers > 1:
+            raise ValueError(f"Checkpoints are only taken with one worker, not {workers}")
+        checkpointer = Checkpointer(Path(checkpoint_dir) / f"{hash_inputs(inputs, workers)}.npz", checkpoint_every)
+
+    if cache is None or seed is None or seed < 0:
+        return _generate_pop(**inputs, workers=workers, checkpointer=checkpointer)
+
+    if not isinstance(cache, PopCache):
+        cache = PopCache(cache)
+
+    key = hash_inputs(inputs, workers)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    population, number_of_individuals_discarded = _generate_pop(**inputs, workers=workers, checkpointer=checkpointer)
+
+    # A population cut short by the callback or budget is not the one these inputs ask for
+    if population is not None and population["Diagnostics"]["StoppedBy"] is None:
+        cache.put(key, population)
+
+    return population, number_of_individuals_discarded
+
+
+def iter_pop(chunk_size: int, workers: int = 1, **kwargs: Any) -> Iterator[Tuple[Dict[str, Any], int]]:
+    """
+    Generates a population in chunks, so that each chunk can be written or reduced before the next is generated.
+
+    Each chunk is a self-contained population of at most chunk_size individuals, with the same structure as
+    the population returned by generate_pop, and only one chunk is held in memory at a time. Chunk k is sampled
+    from the k-th stream spawned from the seed, exactly as generate_pop does for its k-th worker, so when the
+    population divides evenly into chunks of chunk_size, the chunks hold the same individuals as
+    generate_pop(workers=population_size // chunk_size). The in-vitro enzyme rates are varied once and shared
+    by every chunk. Summary statistics describe each chunk alone.
+
+    Parameters
+    ----------
+    chunk_size : int
+        The maximum number of individuals in each chunk.
+    workers : int, optional
+        The number of processes to generate chunks in. With more than one, up to one chunk per worker is generated
+        ahead of the consumer, the chunks are still yielded in order, and each chunk may sample its share of
+        max_attempts. Progress is reported as each chunk arrives. Default is 1.
+    **kwargs
+        Arguments of generate_pop, other than cache, checkpoint_dir and checkpoint_every, which iter_pop does not
+        take, and workers, which is its own. The callback and progress report the totals generated and
+        discarded over all chunks so far, and the stages of each chunk in turn. Cancelling ends the iteration
+        after the chunk being sampled.
+
+    Returns
+    -------
+    Iterator[Tuple[dict, int]]
+        Each chunk and the number of individuals discarded while sampling it.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size must be at least 1: {chunk_size}")
+
+    if workers < 1:
+        raise ValueError(f"Number of workers must be at least 1: {workers}")
+
+    if "population_size" in kwargs and kwargs["population_size"] < 1:
+        return iter(())
+
+    inputs = _validate_inputs(**kwargs)
+
+    # Validation happens here, when iter_pop is called, rather than on the first iteration
+    return _iter_pop(chunk_size, workers, **inputs)
+
+
+def extend_pop(
+    pop: Dict[str, Any],
+    additional_size: int,
+    callback: Optional[Callable[[int, int], bool]] = None,
+    max_attempts: Optional[int] = None,
+    deadline_seconds: Optional[float] = None,
+    progress: Optional[Callable[[Progress], bool]] = None,
+    progress_interval: float = 0.5,
+    progress_fraction: float = 0.05,
+    cancel_event: Optional[Any] = None
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Adds individuals to a population without generating it again.
+
+    Only the new individuals are sampled, carrying on from the random state the population's sampling finished
+    with, which generate_pop records in population['Inputs']['Resume'] when it samples with the loop engine in one
+    process. The result is the population generate_pop would have returned for the larger size: the roots,
+    tissues, enzymes, diagnostics and summary are identical. Because the variation in the enzymes is drawn after
+    sampling, the MPPGLs and varied in-vitro rates of every individual are drawn again, from the liver masses of the
+    individuals, which are recorded in population['Inputs']['Resume'] if the liver is aggregated. The summary is
+    then accumulated over the original individuals and the new ones, which takes a small fraction of the time
+    sampling does.
+
+    Parameters
+    ----------
+    pop : dict
+        A population returned by generate_pop, extend_pop or load_pop. It is not changed.
+    additional_size : int
+        The number of individuals to add.
+    callback, max_attempts, deadline_seconds, progress, progress_interval, progress_fraction, cancel_event
+        As for generate_pop, applied to sampling the new individuals. If sampling stops early, the individuals
+        accepted so far are added, and the result can be extended again.
+
+    Returns
+    -------
+    population : dict
+        The extended population.
+    number_of_individuals_discarded : int
+        The number of individuals discarded generating the whole population.
+    """
+    if additional_size < 0:
+        raise ValueError(f"Number of individuals to add must be non-negative: {additional_size}")
+
+    recorded_inputs = pop["Inputs"]
+    resume = recorded_inputs.get("Resume")
+    if resume is None:
+        raise ValueError("Only populations sampled by the loop engine in one process can be extended")
+
+    if additional_size == 0:
+        return pop, sum(pop["Diagnostics"]["Rejections"].values())
+
+    number_accepted = pop["Roots"]["Values"].shape[0]
+    probs_of_ethnicities = recorded_inputs["Probability"]["Ethnicity"]
+    enzyme_rate_units = recorded_inputs["Units"]["EnzymeRate"]
+
+    inputs = _validate_inputs(
+        number_accepted + additional_size,
+        recorded_inputs["Population"]["Dataset"],
+        tuple(recorded_inputs["Filter"]["Age"]),
+        tuple(recorded_inputs["Filter"]["BMI"]),
+        tuple(recorded_inputs["Filter"]["Height"]),
+        recorded_inputs["Probability"]["Male"],
+        None if probs_of_ethnicities is None else tuple(probs_of_ethnicities),
+        list(resume["IsSlowlyPerfusedTissueDiscrete"]),
+        list(resume["IsRichlyPerfusedTissueDiscrete"]),
+        resume["EnzymeRateParameter"],
+        list(pop["Enzymes"]["Names"]),
+        list(resume["InVitroEnzymeRates"]),
+        list(resume["InVitroEnzymeRateCoeffsOfVar"]),
+        recorded_inputs["Units"]["Flow"],
+        None if enzyme_rate_units == 'None' else enzyme_rate_units,
+        resume["MolecularWeight"],
+        recorded_inputs["Population"]["Seed"],
+        recorded_inputs["Population"]["Type"],
+        callback,
+        Engine.Loop,
+        max_attempts,
+        deadline_seconds,
+        None,
+        progress,
+        progress_interval,
+        progress_fraction,
+        cancel_event
+    )
+    CONSTS = inputs["CONSTS"]
+
+    reporter = ProgressReporter(
+        additional_size, callback, progress, progress_interval, progress_fraction, cancel_event)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sample_individuals, sample_inputs, curves = _prepare_sampling(
+            inputs["dataset"],
+            inputs["age_range"],
+            inputs["bmi_range"],
+            inputs["height_range"],
+            inputs["prob_of_male"],
+            inputs["probs_of_ethnicities"],
+            inputs["population_type"],
+            Engine.Loop
+        )
+
+        rng = np.random.default_rng()
+        rng.bit_generator.state = resume["RngState"]
+
+        reporter.set_stage(Stage.Sampling)
+
+        personal_details, tissues, rejections = sample_individuals(
+            additional_size,
+            *sample_inputs,
+            reporter.update,
+            inputs["budget"],
+            curves,
+            CONSTS,
+            rng
+        )
+
+        reporter.update(personal_details.shape[0], sum(rejections.values()))
+        sampling_state = rng.bit_generator.state
+        stopped_by = _stopped_by(personal_details.shape[0], additional_size, reporter.is_cancelled, inputs["budget"])
+
+        reporter.set_stage(Stage.Aggregation)
+
+        tissues, liver_masses, organ_names = _aggregate_tissues(
+            personal_details,
+            tissues,
+            inputs["is_slowly_perfused_tissue_discrete"],
+            inputs["is_richly_perfused_tissue_discrete"],
+            inputs["flow_units"],
+            CONSTS
+        )
+
+        population = _complete_pop(
+            np.concatenate((pop["Roots"]["Values"], personal_details)),
+            np.concatenate((pop["Tissues"]["Values"], tissues)),
+            np.concatenate((_recorded_liver_masses(pop, CONSTS), liver_masses)),
+            organ_names,
+            {k: pop["Diagnostics"]["Rejections"][k] + v for k, v in rejections.items()},
+            number_accepted + additional_size,
+            inputs["dataset"],
+            inputs["age_range"],
+            inputs["bmi_range"],
+            inputs["height_range"],
+            inputs["prob_of_male"],
+            inputs["probs_of_ethnicities"],
+            inputs["is_slowly_perfused_tissue_discrete"],
+            inputs["is_richly_perfused_tissue_discrete"],
+            inputs["enzyme_names"],
+            inputs["in_vitro_enzyme_rates"],
+            inputs["in_vitro_enzyme_rate_coeffs_of_var"],
+            inputs["flow_units"],
+            inputs["enzyme_rate_units"],
+            inputs["molecular_weight"],
+            inputs["seed"],
+            inputs["population_type"],
+            reporter,
+            CONSTS,
+            rng,
+            sampling_state
+        )
+
+        population["Diagnostics"]["StoppedBy"] = stopped_by
+
+        return population, sum(population["Diagnostics"]["Rejections"].values())
+
+
+def _population_arguments(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns the arguments of generate_pop without those that only say how to run it, for _validate_inputs."""
+    return {k: v for k, v in arguments.items() if k not in _RUN_ARGUMENTS}
+
+
+def _validate_inputs(
+    population_size: int,
+    dataset_name: str,
+    age_range: Tuple[float, float],
+    bmi_range: Tuple[float, float],
+    height_range: Tuple[float, float],
+    prob_of_male: float,
+    probs_of_ethnicities: Optional[Tuple[float, float, float]],
+    is_slowly_perfused_tissue_discrete: Union[bool, List[bool]] = False,
+    is_richly_perfused_tissue_discrete: Union[bool, List[bool]] = False,
+    enzyme_rate_parameter: Optional[Union[str, EnzymeRateParameter]] = None,
+    enzyme_names: Optional[List[str]] = None,
+    in_vitro_enzyme_rates: Optional[List[float]] = None,
+    in_vitro_enzyme_rate_coeffs_of_var: Optional[List[float]] = None,
+    flow_units: Union[str, FlowUnits] = FlowUnits.MilliLitresPerMinute,
+    enzyme_rate_units: Optional[Union[EnzymeRateVmaxUnits, EnzymeRateCLintUnits, str]] = None,
+    molecular_weight: Optional[float] = None,
+    seed: Optional[int] = None,
+    population_type: Union[PopulationType, str] = PopulationType.Realistic,
+    callback: Optional[Callable[[int, int], bool]] = None,
+    engine: Union[Engine, str] = Engine.Loop,
+    max_attempts: Optional[int] = None,
+    deadline_seconds: Optional[float] = None,
+    min_acceptance_rate: Optional[float] = None,
+    progress: Optional[Callable[[Progress], bool]] = None,
+    progress_interval: float = 0.5,
+    progress_fraction: float = 0.05,
+    cancel_event: Optional[Any] = None
+) -> Dict[str, Any]:
+    """Checks the inputs to generate_pop and converts them to the arguments of _generate_pop."""
+
+    CONSTS = get_consts()
+
     dataset = Dataset(dataset_name) # will raise if invalid
 
     lower_age, upper_age = age_range
@@ -216,30 +594,57 @@ def generate_pop(
     if isinstance(population_type, str):
         population_type = PopulationType(population_type)
 
-    if callback is None:
-        callback = lambda _,__:  False
+    if isinstance(engine, str):
+        engine = Engine(engine)
 
-    return _generate_pop(
-        population_size,
-        dataset,
-        age_range,
-        bmi_range,
-        height_range,
-        prob_of_male,
-        probs_of_ethnicities,
-        is_slowly_perfused_tissue_discrete,
-        is_richly_perfused_tissue_discrete,
-        enzyme_names,
-        in_vitro_enzyme_rates,
-        in_vitro_enzyme_rate_coeffs_of_var,
-        flow_units,
-        enzyme_rate_units,
-        molecular_weight,
-        seed,
-        population_type,
-        callback,
-        CONSTS
-    )
+    if max_attempts is not None and max_attempts < 1:
+        raise ValueError(f"Maximum number of attempts must be at least 1: {max_attempts}")
+
+    if deadline_seconds is not None and not deadline_seconds > 0:
+        raise ValueError(f"Deadline must be a positive number of seconds: {deadline_seconds}")
+
+    if min_acceptance_rate is not None and not 0 < min_acceptance_rate <= 1:
+        raise ValueError(f"Minimum acceptance rate must be greater than 0 and at most 1: {min_acceptance_rate}")
+
+    if not progress_interval >= 0:
+        raise ValueError(f"Progress interval must be a non-negative number of seconds: {progress_interval}")
+
+    if not 0 < progress_fraction <= 1:
+        raise ValueError(f"Progress fraction must be greater than 0 and at most 1: {progress_fraction}")
+
+    budget = {
+        "MaxAttempts": max_attempts,
+        "Deadline": None if deadline_seconds is None else time.time() + deadline_seconds
+    }
+
+    return {
+        "population_size": population_size,
+        "dataset": dataset,
+        "age_range": age_range,
+        "bmi_range": bmi_range,
+        "height_range": height_range,
+        "prob_of_male": prob_of_male,
+        "probs_of_ethnicities": probs_of_ethnicities,
+        "is_slowly_perfused_tissue_discrete": is_slowly_perfused_tissue_discrete,
+        "is_richly_perfused_tissue_discrete": is_richly_perfused_tissue_discrete,
+        "enzyme_names": enzyme_names,
+        "in_vitro_enzyme_rates": in_vitro_enzyme_rates,
+        "in_vitro_enzyme_rate_coeffs_of_var": in_vitro_enzyme_rate_coeffs_of_var,
+        "flow_units": flow_units,
+        "enzyme_rate_units": enzyme_rate_units,
+        "molecular_weight": molecular_weight,
+        "seed": seed,
+        "population_type": population_type,
+        "engine": engine,
+        "callback": callback,
+        "progress": progress,
+        "progress_interval": progress_interval,
+        "progress_fraction": progress_fraction,
+        "cancel_event": cancel_event,
+        "budget": budget,
+        "min_acceptance_rate": min_acceptance_rate,
+        "CONSTS": CONSTS
+    }
 
 
 def _generate_pop(
@@ -260,137 +665,497 @@ def _generate_pop(
     molecular_weight: Optional[float],
     seed: int,
     population_type: PopulationType,
-    callback: Callable[[int, int], bool],
-    CONSTS: Optional[Dict[str, Any]]
+    engine: Engine,
+    workers: int,
+    callback: Optional[Callable[[int, int], bool]],
+    progress: Optional[Callable[[Progress], bool]],
+    progress_interval: float,
+    progress_fraction: float,
+    cancel_event: Optional[Any],
+    budget: Dict[str, Optional[float]],
+    min_acceptance_rate: Optional[float],
+    CONSTS: Dict[str, Any],
+    checkpointer: Optional[Checkpointer] = None
 ) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
 
+    # Also remembers whether generation was cancelled, to tell it apart from running out of budget
+    reporter = ProgressReporter(
+        population_size, callback, progress, progress_interval, progress_fraction, cancel_event)
+
     # Ignore diagnostics arising from adipose calcs and columns of zeros for liver total mass and lung bronchial mass:
     # lognrnd0.py:19: RuntimeWarning: invalid value encountered in log, mu = np.log(mean) - sigma**2 / 2
     # generatestats.py:60: RuntimeWarning: divide by zero encountered in log, geo_std_dev = np.exp(np.std(np.log(x), axis=0))
-    # Is this a good idea? ¯\_(ツ)_/¯
-    np.seterr(invalid='ignore', divide='ignore')
+    # The state is local to this call (and thread), so concurrent callers are unaffected.
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sample_individuals, sample_inputs, curves = _prepare_sampling(
+            dataset,
+            age_range,
+            bmi_range,
+            height_range,
+            prob_of_male,
+            probs_of_ethnicities,
+            population_type,
+            engine
+        )
+
+        reporter.set_stage(Stage.Sampling)
+
+        if min_acceptance_rate is not None:
+            _check_acceptance_rate(sample_inputs, curves, min_acceptance_rate, seed, CONSTS)
+
+        if workers > 1:
+            # One stream per chunk, plus one for the enzyme variation applied after merging
+            number_of_chunks = min(workers * _CHUNKS_PER_WORKER, population_size)
+            seed_sequences = np.random.SeedSequence(seed).spawn(number_of_chunks + 1)
+            rng = np.random.default_rng(seed_sequences[-1])
+
+            personal_details, tissues, rejections = _sample_individuals_parallel(
+                sample_individuals,
+                population_size,
+                sample_inputs,
+                seed_sequences[:-1],
+                workers,
+                reporter.update,
+                budget,
+                curves,
+                CONSTS
+            )
+            sampling_state = None
+        else:
+            rng = np.random.default_rng(seed)
+
+            personal_details, tissues, rejections = sample_individuals(
+                population_size,
+                *sample_inputs,
+                reporter.update,
+                budget,
+                curves,
+                CONSTS,
+                rng,
+                checkpointer
+            )
+
+            # The loop engine samples one candidate at a time, so sampling more from this state gives the
+            # individuals a larger population would have had
+            sampling_state = rng.bit_generator.state if engine == Engine.Loop else None
+
+        reporter.update(personal_details.shape[0], sum(rejections.values()))
+
+        population = _assemble_pop(
+            personal_details,
+            tissues,
+            rejections,
+            population_size,
+            dataset,
+            age_range,
+            bmi_range,
+            height_range,
+            prob_of_male,
+            probs_of_ethnicities,
+            is_slowly_perfused_tissue_discrete,
+            is_richly_perfused_tissue_discrete,
+            enzyme_names,
+            in_vitro_enzyme_rates,
+            in_vitro_enzyme_rate_coeffs_of_var,
+            flow_units,
+            enzyme_rate_units,
+            molecular_weight,
+            seed,
+            population_type,
+            reporter,
+            CONSTS,
+            rng,
+            sampling_state
+        )
 
-    if CONSTS is None:
-        with open(THIS_DIR / 'popgenconsts.pkl', 'rb') as f:
-            CONSTS = cast(Dict[str, Any], pickle.load(f))
+        population["Diagnostics"]["StoppedBy"] = _stopped_by(
+            personal_details.shape[0], population_size, reporter.is_cancelled, budget)
 
-    np.random.seed(seed)
+        # A population cut short keeps its checkpoint, so that it can be finished later
+        if checkpointer is not None and population["Diagnostics"]["StoppedBy"] is None:
+            checkpointer.remove()
 
-    callback_interval = min(50, max(population_size // 10, 2))
+        return population, sum(rejections.values())
 
-    # Generate parameters for each individual
+
+def _iter_pop(
+    chunk_size: int,
+    workers: int,
+    population_size: int,
+    dataset: Dataset,
+    age_range: Tuple[float, float],
+    bmi_range: Tuple[float, float],
+    height_range: Tuple[float, float],
+    prob_of_male: float,
+    probs_of_ethnicities: Optional[Tuple[float, float, float]],
+    is_slowly_perfused_tissue_discrete: List[bool],
+    is_richly_perfused_tissue_discrete: List[bool],
+    enzyme_names: List[str],
+    in_vitro_enzyme_rates: List[float],
+    in_vitro_enzyme_rate_coeffs_of_var: List[float],
+    flow_units: FlowUnits,
+    enzyme_rate_units: Optional[Union[EnzymeRateVmaxUnits, EnzymeRateCLintUnits]],
+    molecular_weight: Optional[float],
+    seed: int,
+    population_type: PopulationType,
+    engine: Engine,
+    callback: Optional[Callable[[int, int], bool]],
+    progress: Optional[Callable[[Progress], bool]],
+    progress_interval: float,
+    progress_fraction: float,
+    cancel_event: Optional[Any],
+    budget: Dict[str, Optional[float]],
+    min_acceptance_rate: Optional[float],
+    CONSTS: Dict[str, Any]
+) -> Iterator[Tuple[Dict[str, Any], int]]:
+
+    number_of_chunks = -(-population_size // chunk_size)
+
+    # One stream per chunk, plus one after them for the enzyme variation shared by all chunks. Each is made
+    # when it is needed, with the spawn key SeedSequence.spawn would give it, so that neither memory nor the
+    # time to the first chunk grows with the number of chunks.
+    # Only the error state is set here: a context spanning the yields would leak into the consumer.
+
+    reporter = ProgressReporter(
+        population_size, callback, progress, progress_interval, progress_fraction, cancel_event)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sample_individuals, sample_inputs, curves = _prepare_sampling(
+            dataset,
+            age_range,
+            bmi_range,
+            height_range,
+            prob_of_male,
+            probs_of_ethnicities,
+            population_type,
+            engine
+        )
+
+        if min_acceptance_rate is not None:
+            _check_acceptance_rate(sample_inputs, curves, min_acceptance_rate, seed, CONSTS)
+
+        # The in-vitro rates are varied once for the whole population, not once per chunk
+        varied_in_vitro_enzyme_rates = np.array(in_vitro_enzyme_rates, dtype=float)
+        vary_in_vitro_enzyme_rates(
+            varied_in_vitro_enzyme_rates,
+            np.array(in_vitro_enzyme_rate_coeffs_of_var),
+            np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(number_of_chunks,)))
+        )
+
+    # The arguments of _assemble_pop that are the same for every chunk
+    assemble_inputs = {
+        "population_size": population_size,
+        "dataset": dataset,
+        "age_range": age_range,
+        "bmi_range": bmi_range,
+        "height_range": height_range,
+        "prob_of_male": prob_of_male,
+        "probs_of_ethnicities": probs_of_ethnicities,
+        "is_slowly_perfused_tissue_discrete": is_slowly_perfused_tissue_discrete,
+        "is_richly_perfused_tissue_discrete": is_richly_perfused_tissue_discrete,
+        "enzyme_names": enzyme_names,
+        "in_vitro_enzyme_rates": list(varied_in_vitro_enzyme_rates),
+        "in_vitro_enzyme_rate_coeffs_of_var": [np.nan] * len(enzyme_names),
+        "flow_units": flow_units,
+        "enzyme_rate_units": enzyme_rate_units,
+        "molecular_weight": molecular_weight,
+        "seed": seed,
+        "population_type": population_type
+    }
+
+    if workers > 1:
+        yield from _iter_chunks_parallel(
+            sample_individuals,
+            sample_inputs,
+            chunk_size,
+            number_of_chunks,
+            seed,
+            workers,
+            reporter,
+            budget,
+            assemble_inputs,
+            curves,
+            CONSTS
+        )
+        return
+
+    number_generated = 0
     number_of_individuals_discarded = 0
-    index_of_person = 0
-    personal_details = np.zeros((population_size, 6))
+
+    for k in range(number_of_chunks):
+        # What is left of the budget after the chunks so far
+        number_of_candidates = number_generated + number_of_individuals_discarded
+        chunk_budget = {
+            "MaxAttempts": None if budget["MaxAttempts"] is None else budget["MaxAttempts"] - number_of_candidates,
+            "Deadline": budget["Deadline"]
+        }
+        if is_budget_exhausted(chunk_budget, 0):
+            return
+
+        # The reporter counts over all chunks, the sampler over this one
+        def update(generated: int, discarded: int) -> bool:
+            return reporter.update(number_generated + generated, number_of_individuals_discarded + discarded)
+
+        reporter.set_stage(Stage.Sampling)
+
+        chunk, discarded = _make_chunk(
+            sample_individuals,
+            sample_inputs,
+            min(chunk_size, population_size - k * chunk_size),
+            np.random.SeedSequence(seed, spawn_key=(k,)),
+            update,
+            chunk_budget,
+            reporter,
+            assemble_inputs,
+            curves,
+            CONSTS
+        )
+
+        number_generated += chunk["Diagnostics"]["Accepted"]
+        number_of_individuals_discarded += discarded
+
+        yield chunk, discarded
+
+        if chunk["Diagnostics"]["StoppedBy"] is not None or reporter.is_cancelled:
+            return
+
+
+def _iter_chunks_parallel(
+    sample_individuals: Callable[..., Tuple[np.ndarray, np.ndarray, Dict[str, int]]],
+    sample_inputs: Tuple[Any, ...],
+    chunk_size: int,
+    number_of_chunks: int,
+    seed: int,
+    workers: int,
+    reporter: ProgressReporter,
+    budget: Dict[str, Optional[float]],
+    assemble_inputs: Dict[str, Any],
+    curves: Dict[str, Any],
+    CONSTS: Dict[str, Any]
+) -> Iterator[Tuple[Dict[str, Any], int]]:
+
+    population_size = assemble_inputs["population_size"]
+    number_generated = 0
     number_of_individuals_discarded = 0
-    tissues = np.zeros(
-        (population_size, CONSTS["NUMBER_OF_TISSUES"]["Extended"], 2)
+
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context())
+    try:
+        # At most one chunk per worker is in progress or waiting to be yielded
+        futures: Deque[Future] = deque()
+        next_chunk = 0
+
+        while next_chunk < number_of_chunks or futures:
+            while next_chunk < number_of_chunks and len(futures) < workers:
+                this_chunk_size = min(chunk_size, population_size - next_chunk * chunk_size)
+                # Each chunk may sample its share of the candidates, by the same deadline
+                chunk_budget = {
+                    "MaxAttempts": None if budget["MaxAttempts"] is None else
+                        -(-budget["MaxAttempts"] * this_chunk_size // population_size),
+                    "Deadline": budget["Deadline"]
+                }
+                futures.append(executor.submit(
+                    _make_chunk_in_worker,
+                    sample_individuals,
+                    sample_inputs,
+                    this_chunk_size,
+                    np.random.SeedSequence(seed, spawn_key=(next_chunk,)),
+                    chunk_budget,
+                    assemble_inputs,
+                    curves,
+                    CONSTS
+                ))
+                next_chunk += 1
+
+            chunk, discarded = futures.popleft().result()
+
+            number_generated += chunk["Diagnostics"]["Accepted"]
+            number_of_individuals_discarded += discarded
+            is_cancelled = reporter.update(number_generated, number_of_individuals_discarded)
+
+            yield chunk, discarded
+
+            if chunk["Diagnostics"]["StoppedBy"] is not None or is_cancelled:
+                return
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _make_chunk(
+    sample_individuals: Callable[..., Tuple[np.ndarray, np.ndarray, Dict[str, int]]],
+    sample_inputs: Tuple[Any, ...],
+    chunk_size: int,
+    seed_sequence: np.random.SeedSequence,
+    callback: Callable[[int, int], bool],
+    budget: Dict[str, Optional[float]],
+    reporter: ProgressReporter,
+    assemble_inputs: Dict[str, Any],
+    curves: Dict[str, Any],
+    CONSTS: Dict[str, Any]
+) -> Tuple[Dict[str, Any], int]:
+    """Samples and assembles one chunk of iter_pop from its own stream."""
+    rng = np.random.default_rng(seed_sequence)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        personal_details, tissues, rejections = sample_individuals(
+            chunk_size,
+            *sample_inputs,
+            callback,
+            budget,
+            curves,
+            CONSTS,
+            rng
+        )
+
+        discarded = sum(rejections.values())
+        callback(personal_details.shape[0], discarded)
+
+        chunk = _assemble_pop(
+            personal_details,
+            tissues,
+            rejections,
+            **assemble_inputs,
+            reporter=reporter,
+            CONSTS=CONSTS,
+            rng=rng
+        )
+
+    chunk["Diagnostics"]["StoppedBy"] = _stopped_by(
+        personal_details.shape[0], chunk_size, reporter.is_cancelled, budget)
+
+    return chunk, discarded
+
+
+def _make_chunk_in_worker(
+    sample_individuals: Callable[..., Tuple[np.ndarray, np.ndarray, Dict[str, int]]],
+    sample_inputs: Tuple[Any, ...],
+    chunk_size: int,
+    seed_sequence: np.random.SeedSequence,
+    budget: Dict[str, Optional[float]],
+    assemble_inputs: Dict[str, Any],
+    curves: Dict[str, Any],
+    CONSTS: Dict[str, Any]
+) -> Tuple[Dict[str, Any], int]:
+    # Progress is reported by the main process as each chunk arrives
+    return _make_chunk(
+        sample_individuals,
+        sample_inputs,
+        chunk_size,
+        seed_sequence,
+        _never_cancel,
+        budget,
+        ProgressReporter(chunk_size),
+        assemble_inputs,
+        curves,
+        CONSTS
     )
-    sexes = np.zeros(population_size)
-    ages = np.zeros(population_size)
+
+
+def _prepare_sampling(
+    dataset: Dataset,
+    age_range: Tuple[float, float],
+    bmi_range: Tuple[float, float],
+    height_range: Tuple[float, float],
+    prob_of_male: float,
+    probs_of_ethnicities: Optional[Tuple[float, float, float]],
+    population_type: PopulationType,
+    engine: Engine
+) -> Tuple[Callable[..., Tuple[np.ndarray, np.ndarray, Dict[str, int]]], Tuple[Any, ...], Dict[str, Any]]:
 
     if probs_of_ethnicities is None:
         ethnicity_breaks = cast(np.ndarray, None)
     else:
         ethnicity_breaks = create_ethnicity_breaks(probs_of_ethnicities)
 
-    key_ethnicity = {
-        v: k
-        for k, v in CONSTS["KEY"]["Ethnicity"][dataset.name].items()
-    }
+    curves = get_compiled(compile_anthropometric_curves)
 
-    key_sex = {
-        v: k
-        for k, v in CONSTS["KEY"]["Sex"].items()
-    }
+    if engine == Engine.Vectorized:
+        sample_individuals = _sample_individuals_vectorized
+    else:
+        sample_individuals = _sample_individuals_loop
+
+    sample_inputs = (
+        dataset,
+        age_range,
+        bmi_range,
+        height_range,
+        prob_of_male,
+        ethnicity_breaks,
+        population_type
+    )
+
+    return sample_individuals, sample_inputs, curves
+
+
+def _sample_individuals_loop(
+    population_size: int,
+    dataset: Dataset,
+    age_range: Tuple[float, float],
+    bmi_range: Tuple[float, float],
+    height_range: Tuple[float, float],
+    prob_of_male: float,
+    ethnicity_breaks: np.ndarray,
+    population_type: PopulationType,
+    callback: Callable[[int, int], bool],
+    budget: Dict[str, Optional[float]],
+    curves: Dict[str, Any],
+    CONSTS: Dict[str, Any],
+    rng: np.random.Generator,
+    checkpointer: Optional[Checkpointer] = None
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, int]]:
+
+    # Generate parameters for each individual
+    index_of_person = 0
+    personal_details = np.zeros((population_size, 6))
+    number_of_individuals_discarded = 0
+    rejections = dict.fromkeys(_REJECTION_REASONS, 0)
+    tissues = np.zeros(
+        (population_size, CONSTS["NUMBER_OF_TISSUES"]["Extended"], 2)
+    )
+
+    if checkpointer is not None:
+        index_of_person = checkpointer.restore(personal_details, tissues, rejections, rng)
+        number_of_individuals_discarded = sum(rejections.values())
 
     while (index_of_person < population_size):
 
-        # Assign personal details
-        sex = assign_sex(prob_of_male)
-        sex_name = key_sex[sex]
-        sex_name_lc = sex_name.lower()
+        if is_budget_exhausted(budget, index_of_person + number_of_individuals_discarded):
+            break
 
-        age = assign_age(population_type, age_range)
+        # Called for every candidate, accepted or not, so that slow runs still report their progress
+        if callback(index_of_person, number_of_individuals_discarded):
+            break
 
-        if age > 16 and sex_name == 'Female':
-            age_class = 'Adult'
-        elif age > 16 and sex_name == 'Male':
-            age_class = 'Adult'
-        else:
-            age_class = 'Child'
+        if checkpointer is not None:
+            checkpointer.save_if_due(
+                personal_details[:index_of_person], tissues[:index_of_person], rejections, rng)
+
+        # Assign personal details
+        sex = assign_sex(prob_of_male, rng=rng)
+
+        age = assign_age(population_type, age_range, rng=rng)
 
         if dataset == Dataset.NDNS:
             ethnicity = 1
         else:
-            ethnicity = assign_ethnicity(ethnicity_breaks)
-
-        ethnicity_name = key_ethnicity[ethnicity]
-        ethnicity_name_lc = ethnicity_name.lower()
+            ethnicity = assign_ethnicity(ethnicity_breaks, rng=rng)
 
         # Modified by kmcnally 27/06/13. Changes to mean body weight to ensure 
         # that excess mass after full height is ascribed to the adipose tissue.
         # Assign mean BodyWeight, Height and BMI
-        if dataset == Dataset.ICRP:
-            bw = CONSTS["BodyWeight"][dataset.name]
-            h = CONSTS["Height"][dataset.name]
-            mean_body_weight = interp1d(
-                bw["Ages"],
-                bw["Values"][:, sex-1],
-                fill_value=cast(float, "extrapolate")
-            )(age)
-            mean_body_weight_at_maturity = interp1d(
-                bw["Ages"],
-                bw["Values"][:, sex-1],
-                fill_value=cast(float, "extrapolate")
-            )(min(age, 20 if sex_name == 'Male' else 16))
-            mean_height = interp1d(
-                h["Ages"],
-                h["Values"][:, sex-1],
-                fill_value=cast(float, "extrapolate")
-            )(age)
-        elif dataset == Dataset.NDNS:
-            bw = CONSTS["BodyWeight"][dataset.name]
-            h = CONSTS["Height"][dataset.name]
-            mean_body_weight = Polynomial(
-                bw[sex_name_lc][ethnicity_name_lc][::-1]
-            )(age)
-            mean_body_weight_at_maturity = Polynomial(
-                bw[sex_name_lc][ethnicity_name_lc][::-1]
-            )(min(age, 20 if sex_name == 'Male' else 16))
-            mean_height = Polynomial(
-                h[sex_name_lc][ethnicity_name_lc][::-1]
-            )(age)
-        elif dataset == Dataset.HSE:
-            bw = CONSTS["BodyWeight"]["HSE"][age_class]
-            h = CONSTS["Height"]["HSE"][age_class]
-            mean_body_weight = Polynomial(
-                bw[sex_name_lc][ethnicity_name_lc][::-1]
-            )(age)
-            mean_body_weight_at_maturity = Polynomial(
-                bw[sex_name_lc][ethnicity_name_lc][::-1]
-            )(min(age, 20 if sex_name == 'Male' else 16))
-            mean_height = Polynomial(
-                h[sex_name_lc][ethnicity_name_lc][::-1]
-            )(age)
-        else:
-            bw = CONSTS["BodyWeight"]["P3M"][age_class]
-            h = CONSTS["Height"]["P3M"][age_class]
-            mean_body_weight = Polynomial(
-                bw[sex_name_lc][ethnicity_name_lc][::-1]
-            )(age)
-            mean_body_weight_at_maturity = Polynomial(
-                bw[sex_name_lc][ethnicity_name_lc][::-1]
-            )(min(age, 20 if sex_name == 'Male' else 16))
-            mean_height = Polynomial(
-                h[sex_name_lc][ethnicity_name_lc][::-1]
-            )(age)
-
-        # from ICRP Ref. Man. P139
-        mean_cardiac_output = interp1d(
-            CONSTS["AgeGroups"]["ICRP"],
-            CONSTS["CardiacOutput"]["ICRP"][:, sex-1]
-        )(age)
+        (
+            mean_height,
+            mean_body_weight,
+            mean_body_weight_at_maturity,
+            mean_cardiac_output
+        ) = (
+            x[0] for x in evaluate_anthropometric_curves(
+                curves,
+                dataset,
+                np.array([age]),
+                np.array([sex]),
+                np.array([ethnicity])
+            )
+        )
 
         # Scaling of individual Mass
         body_weight_range = (
@@ -401,19 +1166,22 @@ def _generate_pop(
             population_type,
             height_range,
             mean_height,
-            CONSTS["COEFF_OF_VAR"]["Height"][sex-1]
+            CONSTS["COEFF_OF_VAR"]["Height"][sex-1],
+            rng
         )
         target_body_weight = assign_target_body_weight(
             population_type,
             body_weight_range,
             mean_body_weight,
-            CONSTS["COEFF_OF_VAR"]["BodyWeight"][sex-1]
+            CONSTS["COEFF_OF_VAR"]["BodyWeight"][sex-1],
+            rng
         )
 
         scaled_height, target_organ_mass = calculate_target_organ_mass(
             age,
-            sex_name,
-            ethnicity_name,
+            sex,
+            ethnicity,
+            CONSTS["KEY"]["Ethnicity"][dataset.name],
             mean_body_weight_at_maturity,
             mean_height,
             target_body_weight,
@@ -426,7 +1194,8 @@ def _generate_pop(
         add_stochastic_variation(
             target_organ_mass,
             CONSTS["ORGAN"]["Mass"]["CoeffOfVar"][sex-1],
-            CONSTS["DISTRIBUTION"]["Mass"][sex-1]
+            CONSTS["DISTRIBUTION"]["Mass"][sex-1],
+            rng
         )
 
         # The mean adipose is wrong after adding stocastic variation. Recalculate.
@@ -437,23 +1206,26 @@ def _generate_pop(
         adipose_mean = max(adipose_mean, 0.01)
 
         # Get stochastic variation of the adipose
-        temp = lognrnd0(adipose_mean, 0.42)
+        temp = lognrnd0(adipose_mean, 0.42, rng)
 
         # Overwrite the adipose on our individual.
         target_organ_mass[CONSTS["INDEX"]["Adipose"]] = temp
 
         if not all(target_organ_mass > 0):
             number_of_individuals_discarded += 1
+            rejections["NegativeMass"] += 1
             continue
 
         target_body_weight = np.sum(target_organ_mass)
         if target_organ_mass[CONSTS["INDEX"]["Adipose"]] / target_body_weight <= CONSTS["MIN_ADIPOSE_FRACTION"]:
             number_of_individuals_discarded += 1
+            rejections["AdiposeFraction"] += 1
             continue
 
         target_body_mass_index = calculate_bmi(target_body_weight, target_height)
         if not (bmi_range[0] <= target_body_mass_index <= bmi_range[1]):
             number_of_individuals_discarded += 1
+            rejections["BMI"] += 1
             continue
 
         # Scaling of individual flows
@@ -463,7 +1235,8 @@ def _generate_pop(
         add_stochastic_variation(
             target_organ_flow, 
             CONSTS["ORGAN"]["Flow"]["CoeffOfVar"][sex-1], 
-            CONSTS["DISTRIBUTION"]["Flow"][sex-1]
+            CONSTS["DISTRIBUTION"]["Flow"][sex-1],
+            rng
         )
         
         target_cardiac_output = \
@@ -493,22 +1266,619 @@ def _generate_pop(
             CONSTS["INDEX"]["Flow"]
         ] = target_organ_flow
         
-        sexes[index_of_person] = sex
-        
-        ages[index_of_person] = age
-
         index_of_person += 1
-        
-        if (index_of_person + 1) % callback_interval == 0:
-            if callback(index_of_person + 1, number_of_individuals_discarded):
-                break
 
     if index_of_person < population_size:
+        _save_checkpoint(checkpointer, personal_details[:index_of_person], tissues[:index_of_person], rejections, rng)
+        personal_details = np.delete(personal_details, np.s_[index_of_person:], 0)
+        tissues = np.delete(tissues, np.s_[index_of_person:], 0)
+
+    return personal_details, tissues, rejections
+
+
+
+def _sample_individuals_vectorized(
+    population_size: int,
+    dataset: Dataset,
+    age_range: Tuple[float, float],
+    bmi_range: Tuple[float, float],
+    height_range: Tuple[float, float],
+    prob_of_male: float,
+    ethnicity_breaks: np.ndarray,
+    population_type: PopulationType,
+    callback: Callable[[int, int], bool],
+    budget: Dict[str, Optional[float]],
+    curves: Dict[str, Any],
+    CONSTS: Dict[str, Any],
+    rng: np.random.Generator,
+    checkpointer: Optional[Checkpointer] = None
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, int]]:
+
+    number_of_base_tissues = CONSTS["NUMBER_OF_TISSUES"]["Base"]
+
+    index_of_person = 0
+    personal_details = np.zeros((population_size, 6))
+    number_of_individuals_discarded = 0
+    rejections = dict.fromkeys(_REJECTION_REASONS, 0)
+    tissues = np.zeros(
+        (population_size, CONSTS["NUMBER_OF_TISSUES"]["Extended"], 2)
+    )
+
+    mass_variation = compile_organ_variation(CONSTS, "Mass")
+    flow_variation = compile_organ_variation(CONSTS, "Flow")
+
+    number_of_candidates = 0
+    batch_size = population_size
+
+    # Where sampling was before a batch cut short by max_attempts. An uninterrupted run would draw a full batch
+    # there, so a checkpoint is taken from there rather than after the short batch.
+    boundary: Optional[Tuple[int, Dict[str, int], np.random.Generator]] = None
+
+    if checkpointer is not None:
+        index_of_person = checkpointer.restore(personal_details, tissues, rejections, rng)
+        number_of_individuals_discarded = sum(rejections.values())
+        number_of_candidates = index_of_person + number_of_individuals_discarded
+        # Checkpoints are taken between batches, so the next batch is sized as it was then
+        if number_of_candidates > 0:
+            batch_size = estimate_batch_size(population_size - index_of_person, number_of_candidates, index_of_person)
+
+    while (index_of_person < population_size):
+
+        if is_budget_exhausted(budget, number_of_candidates):
+            break
+
+        batch_size = min(_MAX_BATCH_SIZE, max(_MIN_BATCH_SIZE, batch_size))
+        if budget["MaxAttempts"] is not None and int(budget["MaxAttempts"]) - number_of_candidates < batch_size:
+            batch_size = int(budget["MaxAttempts"]) - number_of_candidates
+            if checkpointer is not None:
+                boundary = (index_of_person, dict(rejections), copy.deepcopy(rng))
+
+        candidates = sample_candidates(
+            batch_size,
+            dataset,
+            population_type,
+            age_range,
+            bmi_range,
+            height_range,
+            prob_of_male,
+            ethnicity_breaks,
+            curves,
+            mass_variation,
+            CONSTS,
+            rng
+        )
+
+        # Keep accepted candidates in the order they were drawn, stopping once the population is full
+        accepted = np.flatnonzero(candidates["IsAccepted"])
+        number_remaining = population_size - index_of_person
+        if accepted.size > number_remaining:
+            accepted = accepted[:number_remaining]
+            number_considered = accepted[-1] + 1
+        else:
+            number_considered = batch_size
+
+        number_of_candidates += number_considered
+        number_of_individuals_discarded += number_considered - accepted.size
+
+        _count_rejections(candidates, number_considered, rejections)
+
+        sexes = candidates["Sex"][accepted]
+        target_organ_flow, target_cardiac_output = sample_organ_flows(
+            sexes,
+            candidates["ScaledHeight"][accepted],
+            candidates["MeanCardiacOutput"][accepted],
+            flow_variation,
+            CONSTS,
+            rng
+        )
+
+        people = np.s_[index_of_person:index_of_person + accepted.size]
+
+        personal_details[people, :] = np.column_stack((
+            candidates["Age"][accepted],
+            sexes,
+            candidates["Ethnicity"][accepted],
+            candidates["BodyWeight"][accepted],
+            candidates["Height"][accepted],
+            target_cardiac_output
+        ))
+
+        tissues[people, :number_of_base_tissues, CONSTS["INDEX"]["Mass"]] = \
+            candidates["OrganMass"][accepted]
+
+        tissues[people, :number_of_base_tissues, CONSTS["INDEX"]["Flow"]] = \
+            target_organ_flow
+
+        index_of_person += accepted.size
+
+        if index_of_person < population_size and checkpointer is not None and boundary is None:
+            checkpointer.save_if_due(
+                personal_details[:index_of_person], tissues[:index_of_person], rejections, rng)
+
+        if index_of_person < population_size and callback(index_of_person, number_of_individuals_discarded):
+            break
+
+        # Size the next batch from the acceptance rate seen so far, so that it is likely to be the last
+        batch_size = estimate_batch_size(population_size - index_of_person, number_of_candidates, index_of_person)
+
+    if index_of_person < population_size:
+        if boundary is None:
+            _save_checkpoint(
+                checkpointer, personal_details[:index_of_person], tissues[:index_of_person], rejections, rng)
+        else:
+            number_saved, saved_rejections, saved_rng = boundary
+            _save_checkpoint(
+                checkpointer, personal_details[:number_saved], tissues[:number_saved], saved_rejections, saved_rng)
         personal_details = np.delete(personal_details, np.s_[index_of_person:], 0)
         tissues = np.delete(tissues, np.s_[index_of_person:], 0)
-        sexes = np.delete(sexes, np.s_[index_of_person:], 0)
-        ages = np.delete(ages, np.s_[index_of_person:], 0)
 
+    return personal_details, tissues, rejections
+
+
+def _sample_individuals_parallel(
+    sample_individuals: Callable[..., Tuple[np.ndarray, np.ndarray, Dict[str, int]]],
+    population_size: int,
+    sample_inputs: Tuple[Any, ...],
+    seed_sequences: List[np.random.SeedSequence],
+    workers: int,
+    callback: Callable[[int, int], bool],
+    budget: Dict[str, Optional[float]],
+    curves: Dict[str, Any],
+    CONSTS: Dict[str, Any]
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, int]]:
+
+    number_of_chunks = len(seed_sequences)
+    chunk_size, remainder = divmod(population_size, number_of_chunks)
+    chunk_sizes = [chunk_size + (k < remainder) for k in range(number_of_chunks)]
+
+    # Each chunk may sample its share of the candidates, by the same deadline. Shares are differences of
+    # rounded-down cumulative shares, so that they add up to exactly max_attempts however many chunks there are
+    chunk_ends = np.cumsum([0] + chunk_sizes)
+    chunk_budgets = [
+        {
+            "MaxAttempts": None if budget["MaxAttempts"] is None else
+                int(budget["MaxAttempts"]) * int(chunk_ends[k + 1]) // population_size -
+                int(budget["MaxAttempts"]) * int(chunk_ends[k]) // population_size,
+            "Deadline": budget["Deadline"]
+        }
+        for k in range(number_of_chunks)
+    ]
+
+    chunks = []
+    number_generated = 0
+    rejections = dict.fromkeys(_REJECTION_REASONS, 0)
+
+    # Set to stop the workers, whose samplers check it as the serial sampler checks cancel_event
+    context = mp_context()
+    manager = context.Manager()
+    stop_event = manager.Event()
+
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    try:
+        futures = [
+            executor.submit(
+                _sample_chunk,
+                sample_individuals,
+                seed_sequences[k],
+                chunk_sizes[k],
+                sample_inputs,
+                chunk_budgets[k],
+                curves,
+                CONSTS,
+                stop_event
+            )
+            for k in range(number_of_chunks)
+        ]
+
+        def stop():
+            stop_event.set()
+            for future in futures:
+                future.cancel()
+
+        # Merge in chunk order so the result does not depend on which worker finishes first
+        is_stopped = False
+        for future in futures:
+            # Keep reporting, and checking for cancellation, while the chunk is sampled
+            while not is_stopped and not wait([future], timeout=_PARALLEL_POLL_INTERVAL).done:
+                if callback(number_generated, sum(rejections.values())):
+                    is_stopped = True
+                    stop()
+
+            # A chunk that had not started when sampling stopped adds nothing
+            if future.cancelled():
+                continue
+
+            personal_details, tissues, chunk_rejections = future.result()
+            chunks.append((personal_details, tissues))
+            number_generated += personal_details.shape[0]
+            for reason, count in chunk_rejections.items():
+                rejections[reason] += count
+
+            if not is_stopped and number_generated < population_size and \
+                    callback(number_generated, sum(rejections.values())):
+                is_stopped = True
+                stop()
+    finally:
+        stop_event.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+        manager.shutdown()
+
+    if not chunks:
+        return np.zeros((0, 6)), np.zeros((0, CONSTS["NUMBER_OF_TISSUES"]["Extended"], 2)), rejections
+
+    return (
+        np.concatenate([personal_details for personal_details, _ in chunks]),
+        np.concatenate([tissues for _, tissues in chunks]),
+        rejections
+    )
+
+
+def _sample_chunk(
+    sample_individuals: Callable[..., Tuple[np.ndarray, np.ndarray, Dict[str, int]]],
+    seed_sequence: np.random.SeedSequence,
+    chunk_size: int,
+    sample_inputs: Tuple[Any, ...],
+    budget: Dict[str, Optional[float]],
+    curves: Dict[str, Any],
+    CONSTS: Dict[str, Any],
+    stop_event: Any
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, int]]:
+
+    # Progress is reported by the main process, which sets stop_event to cancel
+    reporter = ProgressReporter(chunk_size, cancel_event=stop_event)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sample_individuals(
+            chunk_size,
+            *sample_inputs,
+            reporter.update,
+            budget,
+            curves,
+            CONSTS,
+            np.random.default_rng(seed_sequence)
+        )
+
+
+def _save_checkpoint(
+    checkpointer: Optional[Checkpointer],
+    personal_details: np.ndarray,
+    tissues: np.ndarray,
+    rejections: Dict[str, int],
+    rng: np.random.Generator
+):
+    """Saves where sampling stopped short, if anything was sampled, so that a later call can finish it."""
+    if checkpointer is not None and personal_details.shape[0] + sum(rejections.values()) > 0:
+        checkpointer.save(personal_details, tissues, rejections, rng)
+
+
+def _never_cancel(_: int, __: int) -> bool:
+    return False
+
+
+def _count_rejections(candidates: Dict[str, np.ndarray], number_considered: int, rejections: Dict[str, int]):
+    """Attributes each of the first number_considered candidates that was discarded to the first test it failed."""
+    is_positive = candidates["IsPositive"][:number_considered]
+    is_adipose_ok = candidates["IsAdiposeOk"][:number_considered]
+    is_bmi_ok = candidates["IsBmiOk"][:number_considered]
+    rejections["NegativeMass"] += int(np.sum(~is_positive))
+    rejections["AdiposeFraction"] += int(np.sum(is_positive & ~is_adipose_ok))
+    rejections["BMI"] += int(np.sum(is_positive & is_adipose_ok & ~is_bmi_ok))
+
+
+def _check_acceptance_rate(
+    sample_inputs: Tuple[Any, ...],
+    curves: Dict[str, Any],
+    min_acceptance_rate: float,
+    seed: int,
+    CONSTS: Dict[str, Any]
+):
+    """
+    Samples pilot batches of candidates until their acceptance rate is known to be above or below
+    min_acceptance_rate, and raises if it is below. The pilot is drawn from its own stream, so it
+    does not change the population sampled afterwards.
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(_PILOT_SPAWN_KEY,)))
+
+    # Enough candidates to expect ten acceptances at the minimum rate
+    max_pilot_size = min(_MAX_PILOT_SIZE, max(_MIN_PILOT_SIZE, int(np.ceil(10. / min_acceptance_rate))))
+
+    number_of_candidates = 0
+    number_accepted = 0
+    rejections = dict.fromkeys(_REJECTION_REASONS, 0)
+    batch_size = _MIN_PILOT_SIZE
+
+    while True:
+        candidates = _sample_pilot(sample_inputs, curves, batch_size, CONSTS, rng)
+        number_of_candidates += batch_size
+        number_accepted += int(np.sum(candidates["IsAccepted"]))
+        _count_rejections(candidates, batch_size, rejections)
+
+        lower, upper = wilson_interval(number_accepted, number_of_candidates)
+        if lower >= min_acceptance_rate:
+            return
+        if upper < min_acceptance_rate or number_of_candidates >= max_pilot_size:
+            break
+
+        batch_size = min(number_of_candidates, max_pilot_size - number_of_candidates)
+
+    acceptance_rate = number_accepted / number_of_candidates
+    if acceptance_rate >= min_acceptance_rate:
+        return
+
+    main_reason = max(rejections, key=lambda reason: rejections[reason])
+    raise ValueError(
+        f"The filters accept an estimated {acceptance_rate:.3g} of candidates, below the minimum acceptance rate "
+        f"of {min_acceptance_rate}: {number_accepted} of {number_of_candidates} pilot candidates were accepted, "
+        f"and most were rejected for {main_reason}. Check that age_range, bmi_range and height_range are compatible."
+    )
+
+
+def _estimate_cost(inputs: Dict[str, Any]) -> float:
+    """
+    Estimates the number of candidates needed to generate a population, from one pilot batch.
+
+    Parameters:
+    inputs (Dict[str, Any]): The inputs returned by _validate_inputs.
+
+    Returns:
+    float: The population size divided by the estimated acceptance rate.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        _, sample_inputs, curves = _prepare_sampling(
+            inputs["dataset"],
+            inputs["age_range"],
+            inputs["bmi_range"],
+            inputs["height_range"],
+            inputs["prob_of_male"],
+            inputs["probs_of_ethnicities"],
+            inputs["population_type"],
+            inputs["engine"]
+        )
+        rng = np.random.default_rng(np.random.SeedSequence(inputs["seed"], spawn_key=(_PILOT_SPAWN_KEY,)))
+        candidates = _sample_pilot(sample_inputs, curves, _MIN_PILOT_SIZE, inputs["CONSTS"], rng)
+
+    # Smoothed, so that a pilot with no acceptances gives a large but finite cost
+    acceptance_rate = (np.sum(candidates["IsAccepted"]) + 1.) / (_MIN_PILOT_SIZE + 2.)
+    return inputs["population_size"] / float(acceptance_rate)
+
+
+def _sample_pilot(
+    sample_inputs: Tuple[Any, ...],
+    curves: Dict[str, Any],
+    batch_size: int,
+    CONSTS: Dict[str, Any],
+    rng: np.random.Generator
+) -> Dict[str, np.ndarray]:
+    dataset, age_range, bmi_range, height_range, prob_of_male, ethnicity_breaks, population_type = sample_inputs
+
+    return sample_candidates(
+        batch_size,
+        dataset,
+        population_type,
+        age_range,
+        bmi_range,
+        height_range,
+        prob_of_male,
+        ethnicity_breaks,
+        curves,
+        compile_organ_variation(CONSTS, "Mass"),
+        CONSTS,
+        rng
+    )
+
+
+def _recorded_liver_masses(pop: Dict[str, Any], CONSTS: Dict[str, Any]) -> np.ndarray:
+    """The liver masses of a population, from its tissues, or from its inputs if the liver was aggregated."""
+    liver_masses = pop["Inputs"]["Resume"]["LiverMasses"]
+    if liver_masses is not None:
+        return np.array(liver_masses, dtype=float)
+
+    liver_name = CONSTS["ORGAN"]["ExtendedNames"][CONSTS["INDEX"]["Liver"]]
+    return pop["Tissues"]["Values"][:, pop["Tissues"]["Names"].index(liver_name), CONSTS["INDEX"]["Mass"]]
+
+
+def _stopped_by(
+    number_accepted: int,
+    population_size: int,
+    is_cancelled: bool,
+    budget: Dict[str, Optional[float]]
+) -> Optional[str]:
+    """Why sampling stopped short of population_size: 'Callback', 'Deadline' or 'MaxAttempts'. None if it did not."""
+    if number_accepted >= population_size:
+        return None
+    if is_cancelled:
+        return "Callback"
+    if budget["Deadline"] is not None and time.time() >= budget["Deadline"]:
+        return "Deadline"
+    return "MaxAttempts"
+
+
+def _assemble_pop(
+    personal_details: np.ndarray,
+    tissues: np.ndarray,
+    rejections: Dict[str, int],
+    population_size: int,
+    dataset: Dataset,
+    age_range: Tuple[float, float],
+    bmi_range: Tuple[float, float],
+    height_range: Tuple[float, float],
+    prob_of_male: float,
+    probs_of_ethnicities: Optional[Tuple[float, float, float]],
+    is_slowly_perfused_tissue_discrete: List[bool],
+    is_richly_perfused_tissue_discrete: List[bool],
+    enzyme_names: List[str],
+    in_vitro_enzyme_rates: List[float],
+    in_vitro_enzyme_rate_coeffs_of_var: List[float],
+    flow_units: FlowUnits,
+    enzyme_rate_units: Optional[Union[EnzymeRateVmaxUnits, EnzymeRateCLintUnits]],
+    molecular_weight: Optional[float],
+    seed: int,
+    population_type: PopulationType,
+    reporter: ProgressReporter,
+    CONSTS: Dict[str, Any],
+    rng: np.random.Generator,
+    sampling_state: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+
+    reporter.set_stage(Stage.Aggregation)
+
+    tissues, liver_masses, organ_names = _aggregate_tissues(
+        personal_details,
+        tissues,
+        is_slowly_perfused_tissue_discrete,
+        is_richly_perfused_tissue_discrete,
+        flow_units,
+        CONSTS
+    )
+
+    return _complete_pop(
+        personal_details,
+        tissues,
+        liver_masses,
+        organ_names,
+        rejections,
+        population_size,
+        dataset,
+        age_range,
+        bmi_range,
+        height_range,
+        prob_of_male,
+        probs_of_ethnicities,
+        is_slowly_perfused_tissue_discrete,
+        is_richly_perfused_tissue_discrete,
+        enzyme_names,
+        in_vitro_enzyme_rates,
+        in_vitro_enzyme_rate_coeffs_of_var,
+        flow_units,
+        enzyme_rate_units,
+        molecular_weight,
+        seed,
+        population_type,
+        reporter,
+        CONSTS,
+        rng,
+        sampling_state
+    )
+
+
+def _complete_pop(
+    personal_details: np.ndarray,
+    tissues: np.ndarray,
+    liver_masses: np.ndarray,
+    organ_names: List[str],
+    rejections: Dict[str, int],
+    population_size: int,
+    dataset: Dataset,
+    age_range: Tuple[float, float],
+    bmi_range: Tuple[float, float],
+    height_range: Tuple[float, float],
+    prob_of_male: float,
+    probs_of_ethnicities: Optional[Tuple[float, float, float]],
+    is_slowly_perfused_tissue_discrete: List[bool],
+    is_richly_perfused_tissue_discrete: List[bool],
+    enzyme_names: List[str],
+    in_vitro_enzyme_rates: List[float],
+    in_vitro_enzyme_rate_coeffs_of_var: List[float],
+    flow_units: FlowUnits,
+    enzyme_rate_units: Optional[Union[EnzymeRateVmaxUnits, EnzymeRateCLintUnits]],
+    molecular_weight: Optional[float],
+    seed: int,
+    population_type: PopulationType,
+    reporter: ProgressReporter,
+    CONSTS: Dict[str, Any],
+    rng: np.random.Generator,
+    sampling_state: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Calculates the enzymes and summary of aggregated individuals, and puts the population together."""
+
+    reporter.set_stage(Stage.Enzymes)
+
+    enzymes = _calculate_enzymes(
+        personal_details[:, 0],
+        liver_masses,
+        enzyme_names,
+        in_vitro_enzyme_rates,
+        in_vitro_enzyme_rate_coeffs_of_var,
+        enzyme_rate_units,
+        molecular_weight,
+        rng
+    )
+
+    reporter.set_stage(Stage.Stats)
+
+    # Output structure
+    population = {}
+    population["Roots"] = {
+        "Ethnicities": list(CONSTS["NAMES"]["Ethnicity"][dataset.name]),
+        "Sexes": list(CONSTS["NAMES"]["Sex"]),
+        "Names": list(CONSTS["NAMES"]["PersonalDetails"]),
+        "Values": personal_details
+    }
+
+    population["Tissues"] = {
+        "Names": organ_names,
+        "Properties": list(CONSTS["NAMES"]["OrganProperties"]),
+        "Values": tissues
+    }
+
+    population["Enzymes"] = enzymes
+    population["Summary"] = _summarise(population)
+
+    number_accepted = personal_details.shape[0]
+    number_of_candidates = number_accepted + sum(rejections.values())
+    population["Diagnostics"] = {
+        "Candidates": number_of_candidates,
+        "Accepted": number_accepted,
+        "AcceptanceRate": number_accepted / number_of_candidates if number_of_candidates > 0 else np.nan,
+        "Rejections": dict(rejections)
+    }
+
+    population["Inputs"] = collate_inputs(
+        population_size,
+        dataset,
+        population_type,
+        seed,
+        age_range,
+        bmi_range,
+        height_range,
+        prob_of_male,
+        probs_of_ethnicities,
+        flow_units,
+        enzyme_rate_units
+    )
+
+    # What extend_pop needs beyond the inputs above to carry on sampling where this population stopped
+    if sampling_state is not None:
+        population["Inputs"]["Resume"] = {
+            "RngState": sampling_state,
+            "IsSlowlyPerfusedTissueDiscrete": [bool(x) for x in is_slowly_perfused_tissue_discrete],
+            "IsRichlyPerfusedTissueDiscrete": [bool(x) for x in is_richly_perfused_tissue_discrete],
+            "EnzymeRateParameter": None if enzyme_rate_units is None else (
+                EnzymeRateParameter.CLint if isinstance(enzyme_rate_units, EnzymeRateCLintUnits) else EnzymeRateParameter.Vmax
+            ).value,
+            "InVitroEnzymeRates": [float(x) for x in in_vitro_enzyme_rates],
+            "InVitroEnzymeRateCoeffsOfVar": [float(x) for x in in_vitro_enzyme_rate_coeffs_of_var],
+            "MolecularWeight": molecular_weight,
+            # Kept in Tissues unless the liver is aggregated
+            "LiverMasses": None if CONSTS["ORGAN"]["ExtendedNames"][CONSTS["INDEX"]["Liver"]] in organ_names else
+                [float(x) for x in liver_masses]
+        }
+
+    return population
+
+
+def _aggregate_tissues(
+    personal_details: np.ndarray,
+    tissues: np.ndarray,
+    is_slowly_perfused_tissue_discrete: List[bool],
+    is_richly_perfused_tissue_discrete: List[bool],
+    flow_units: FlowUnits,
+    CONSTS: Dict[str, Any]
+) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """
+    Forms the aggregate tissues of sampled individuals, converts their flows, in place, and removes the tissues
+    that were aggregated. Returns the tissues kept, the liver masses and the names of the tissues kept.
+    """
     # Extra tissue flows formed from others
     # Combine components that feed the liver
     aggregate_organs(
@@ -562,6 +1932,31 @@ def _generate_pop(
         flow_units
     )
 
+    # Kept for the enzyme rates, as the liver is removed below if it has been aggregated
+    liver_masses = tissues[:, CONSTS["INDEX"]["Liver"], CONSTS["INDEX"]["Mass"]].copy()
+
+    # Remove organs that have been aggregated
+    index_to_keep = invert_indices(
+        tissues.shape[1],
+        np.union1d(index_slowly_aggregated, index_richly_aggregated)
+    )
+    organ_names = [CONSTS["ORGAN"]["ExtendedNames"][i] for i in index_to_keep]
+
+    return tissues[:, index_to_keep, :], liver_masses, organ_names
+
+
+def _calculate_enzymes(
+    ages: np.ndarray,
+    liver_masses: np.ndarray,
+    enzyme_names: List[str],
+    in_vitro_enzyme_rates: List[float],
+    in_vitro_enzyme_rate_coeffs_of_var: List[float],
+    enzyme_rate_units: Optional[Union[EnzymeRateVmaxUnits, EnzymeRateCLintUnits]],
+    molecular_weight: Optional[float],
+    rng: np.random.Generator
+) -> Dict[str, Any]:
+    """Returns the enzymes of a population."""
+
     # Enzymes abundances and totals
     # Based upon eq'n 11 in Howgate et al 2006. See
     # http://informahealthcare.com/doi/abs/10.1080/00498250600683197
@@ -569,17 +1964,18 @@ def _generate_pop(
     enzymes = {}
     enzymes["Names"] = enzyme_names
     enzymes["NEnzymes"] = len(enzyme_names)
-    enzymes["MPPGLs"] = calculate_mppgl(ages)
+    enzymes["MPPGLs"] = calculate_mppgl(ages, rng=rng)
 
     in_vitro_enzyme_rates_in = np.array(in_vitro_enzyme_rates)
     vary_in_vitro_enzyme_rates(
         in_vitro_enzyme_rates_in,
-        np.array(in_vitro_enzyme_rate_coeffs_of_var)
+        np.array(in_vitro_enzyme_rate_coeffs_of_var),
+        rng
     )
     enzymes["InVivoEnzymeRates"] = calculate_in_vivo_enzyme_rate(
         in_vitro_enzyme_rates_in,
         enzymes["MPPGLs"],
-        tissues[:, CONSTS["INDEX"]["Liver"], CONSTS["INDEX"]["Mass"]]
+        liver_masses
     )
     if enzymes["InVivoEnzymeRates"].size > 0:
         enzymes["InVivoEnzymeRates"] = convert_enzyme_rate_units(
@@ -588,67 +1984,17 @@ def _generate_pop(
             molecular_weight
         )
 
-    # Remove organs that have been aggregated.
-    # This has to happen _after_ enzyme rates are calculated or liver could be set to zero
-    index_to_keep = invert_indices(
-        tissues.shape[1],
-        np.union1d(index_slowly_aggregated, index_richly_aggregated)
-    )
-    tissues = tissues[:, index_to_keep, :]
-    organ_names = [CONSTS["ORGAN"]["ExtendedNames"][i] for i in index_to_keep]
-
-    # Summary stats for each tissue mass/flow (arithmetic & geometric mean and std dev, some percentiles)
-    is_male = sexes == CONSTS["KEY"]["Sex"]["Male"]
-    is_female = sexes == CONSTS["KEY"]["Sex"]["Female"]
-
-    summary_stats = {
-        "Male": {
-            "Mass": generate_stats(tissues[is_male, :, CONSTS["INDEX"]["Mass"]]),
-            "Flow": generate_stats(tissues[is_male, :, CONSTS["INDEX"]["Flow"]]),
-            "MPPGL": generate_stats(enzymes["MPPGLs"][is_male]),
-            "InVivoEnzymeRate": generate_stats(enzymes["InVivoEnzymeRates"][is_male, :])
-        },
-        "Female": {
-            "Mass": generate_stats(tissues[is_female, :, CONSTS["INDEX"]["Mass"]]),
-            "Flow": generate_stats(tissues[is_female, :, CONSTS["INDEX"]["Flow"]]),
-            "MPPGL": generate_stats(enzymes["MPPGLs"][is_female]),
-            "InVivoEnzymeRate": generate_stats(enzymes["InVivoEnzymeRates"][is_female, :])
-        }
-    }
-
-    # Output structure
-    population = {}
-    population["Roots"] = {
-        "Ethnicities": CONSTS["NAMES"]["Ethnicity"][dataset.name],
-        "Sexes": CONSTS["NAMES"]["Sex"],
-        "Names": CONSTS["NAMES"]["PersonalDetails"],
-        "Values": personal_details
-    }
+    return enzymes
 
-    population["Tissues"] = {
-        "Names": organ_names,
-        "Properties": CONSTS["NAMES"]["OrganProperties"],
-        "Values": tissues
-    }
 
-    population["Enzymes"] = enzymes
-    population["Summary"] = summary_stats
-
-    population["Inputs"] = collate_inputs(
-        population_size,
-        dataset,
-        population_type,
-        seed,
-        age_range,
-        bmi_range,
-        height_range,
-        prob_of_male,
-        probs_of_ethnicities,
-        flow_units,
-        enzyme_rate_units
-    )
-
-    return population, number_of_individuals_discarded
+def _summarise(population: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Summary stats for each tissue mass/flow (arithmetic & geometric mean and std dev, some percentiles), from a
+    SummaryAccumulator large enough to hold every individual, so that they are exact.
+    """
+    number_of_individuals = population["Roots"]["Values"].shape[0]
+    accumulator = SummaryAccumulator(capacity=2 * (number_of_individuals // 2 + 1))
+    return accumulator.update(population).summary()
 
 
 # if __name__ == '__main__':
@@ -0,0 +1,195 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Optional, Tuple, Union
+
+from pypopgenbe.generatepop import generate_pop, iter_pop
+from pypopgenbe.impl.mpcontext import mp_context
+from pypopgenbe.impl.warmup import warm_up
+from pypopgenbe.impl.enum import PoolType
+
+# Pools shared by every call that does not bring its own executor, created when first needed
+_lock = threading.Lock()
+_executors: Dict[PoolType, Executor] = {}
+_manager: Optional[Any] = None
+
+# Number of chunks a worker process may get ahead of the consumer of iter_pop_async
+_CHUNK_QUEUE_SIZE = 1
+
+
+async def generate_pop_async(
+    *args: Any,
+    executor: Optional[Union[PoolType, str, Executor]] = None,
+    **kwargs: Any
+) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
+    """
+    Generates a population in an executor, without blocking the event loop.
+
+    Cancelling the awaiting task stops sampling within a few milliseconds: the task sets the cancel_event of
+    generate_pop, waits for the executor to finish with it, and then raises CancelledError. With workers, the
+    worker processes of generate_pop stop as promptly, partway through their chunks. Any progress or
+    callback is called in the executor, so should hand its reports to the event loop with call_soon_threadsafe,
+    and must be picklable when the executor is a process pool.
+
+    Parameters
+    ----------
+    *args, **kwargs
+        Arguments of generate_pop, other than cancel_event.
+    executor : Union[PoolType, str, Executor], optional
+        Where to generate the population: 'Thread' or 'Process', for a pool of that type shared by every call
+        in this process, or an executor of the caller's own. Default is None, for the shared thread pool.
+
+    Returns
+    -------
+    Tuple[dict, int]
+        The population and number of individuals discarded, as returned by generate_pop.
+    """
+    pool, is_process_pool = _get_executor(executor)
+    cancel_event = _make_event(is_process_pool)
+
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(
+        pool,
+        functools.partial(generate_pop, *args, cancel_event=cancel_event, **kwargs)
+    )
+
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        await _stop(future, cancel_event)
+        raise
+
+
+async def iter_pop_async(
+    chunk_size: int,
+    executor: Optional[Union[PoolType, str, Executor]] = None,
+    **kwargs: Any
+) -> AsyncIterator[Tuple[Dict[str, Any], int]]:
+    """
+    Generates a population in chunks in an executor, yielding each chunk as it is ready.
+
+    The chunks are those of iter_pop. In a thread pool, each chunk is generated when the previous one has been
+    consumed. In a process pool, one worker generates the chunks in turn, at most one chunk ahead of the consumer.
+    Cancelling the consuming task, or leaving the iteration early, stops sampling as for generate_pop_async.
+
+    Parameters
+    ----------
+    chunk_size : int
+        The maximum number of individuals in each chunk.
+    executor : Union[PoolType, str, Executor], optional
+        As for generate_pop_async.
+    **kwargs
+        Arguments of iter_pop, other than cancel_event.
+
+    Returns
+    -------
+    AsyncIterator[Tuple[dict, int]]
+        Each chunk and the number of individuals discarded while sampling it.
+    """
+    pool, is_process_pool = _get_executor(executor)
+    cancel_event = _make_event(is_process_pool)
+
+    loop = asyncio.get_running_loop()
+
+    if is_process_pool:
+        # A generator cannot be sent between processes, so a worker runs it and sends back each chunk
+        queue = _get_manager().Queue(maxsize=_CHUNK_QUEUE_SIZE)
+        producer = loop.run_in_executor(
+            pool,
+            functools.partial(_produce_chunks, queue, chunk_size, cancel_event, kwargs)
+        )
+
+        # The get in progress, if any. It is not abandoned on cancellation, as it would take a message.
+        getter: Optional['asyncio.Future[Any]'] = None
+        kind = 'chunk'
+        try:
+            while kind == 'chunk':
+                getter = loop.run_in_executor(None, queue.get)
+                kind, item = await asyncio.shield(getter)
+                getter = None
+                if kind == 'error':
+                    raise item
+                if kind == 'chunk':
+                    yield item
+        finally:
+            if kind == 'chunk':
+                cancel_event.set()
+                # Let the worker finish its current chunk and exit
+                while kind == 'chunk':
+                    if getter is None:
+                        getter = loop.run_in_executor(None, queue.get)
+                    kind, _ = await asyncio.shield(getter)
+                    getter = None
+            await asyncio.shield(producer)
+        return
+
+    chunks = await loop.run_in_executor(
+        pool,
+        functools.partial(iter_pop, chunk_size, cancel_event=cancel_event, **kwargs)
+    )
+    try:
+        while True:
+            future = loop.run_in_executor(pool, next, chunks, None)
+            try:
+                item = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                await _stop(future, cancel_event)
+                raise
+            if item is None:
+                break
+            yield item
+    finally:
+        cancel_event.set()
+        # Release the generator, and any worker pool it holds, now rather than whenever it is collected
+        await asyncio.shield(loop.run_in_executor(pool, chunks.close))
+
+
+def _get_executor(executor: Optional[Union[PoolType, str, Executor]]) -> Tuple[Executor, bool]:
+    """Returns the executor to use and whether it runs in other processes."""
+    if isinstance(executor, Executor):
+        return executor, isinstance(executor, ProcessPoolExecutor)
+
+    pool_type = PoolType.Thread if executor is None else PoolType(executor)
+
+    with _lock:
+        if pool_type not in _executors:
+            if pool_type == PoolType.Process:
+                # Each worker loads the constants when it starts, not on its first population
+                _executors[pool_type] = ProcessPoolExecutor(initializer=warm_up, mp_context=mp_context())
+            else:
+                _executors[pool_type] = ThreadPoolExecutor(thread_name_prefix='pypopgenbe')
+        return _executors[pool_type], pool_type == PoolType.Process
+
+
+def _get_manager() -> Any:
+    global _manager
+    with _lock:
+        if _manager is None:
+            _manager = mp_context().Manager()
+        return _manager
+
+
+def _make_event(is_process_pool: bool) -> Any:
+    return _get_manager().Event() if is_process_pool else threading.Event()
+
+
+async def _stop(future: 'asyncio.Future[Any]', cancel_event: Any):
+    """Sets the cancel event and waits for the executor to return, ignoring what it returns."""
+    cancel_event.set()
+    try:
+        await future
+    except Exception:
+        pass
+
+
+def _produce_chunks(queue: Any, chunk_size: int, cancel_event: Any, kwargs: Dict[str, Any]):
+    try:
+        for item in iter_pop(chunk_size, cancel_event=cancel_event, **kwargs):
+            queue.put(('chunk', item))
+            if cancel_event.is_set():
+                break
+    except Exception as e:
+        queue.put(('error', e))
+    else:
+        queue.put(('done', None))
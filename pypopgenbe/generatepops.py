@@ -0,0 +1,99 @@
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from pypopgenbe.generatepop import generate_pop, _estimate_cost, _population_arguments, _validate_inputs
+from pypopgenbe.impl.scenarioresult import ScenarioResult
+from pypopgenbe.impl.mpcontext import mp_context
+from pypopgenbe.impl.warmup import warm_up
+
+
+def generate_pops(
+    scenarios: Sequence[Dict[str, Any]],
+    workers: Optional[int] = None,
+    ordered: bool = True,
+    executor: Optional[Executor] = None
+) -> Iterator[ScenarioResult]:
+    """
+    Generates a population for each of many scenarios across a pool of worker processes.
+
+    Each scenario is a dict of arguments of generate_pop, such as gp.json_to_inputs returns. Every worker loads
+    the constants once, when it starts, and then generates one scenario after another. The scenarios are
+    submitted in decreasing order of estimated cost, the population size divided by the acceptance rate of a small
+    pilot batch, so that the slowest are not left until last. A scenario that raises, including one whose
+    inputs are invalid, gives a result holding the exception, and the other scenarios carry on. Each scenario is
+    generated in a single worker, so the number of processes is set only by workers here: a scenario that sets
+    workers itself gives a result holding a ValueError.
+
+    Parameters
+    ----------
+    scenarios : Sequence[dict]
+        The arguments of generate_pop for each scenario.
+    workers : int, optional
+        The number of worker processes. Default is None, for the number of processors. Ignored if executor is given.
+    ordered : bool, optional
+        If True, results are given in the order of the scenarios, otherwise as each scenario completes. Default is True.
+    executor : Executor, optional
+        A pool of the caller's own to run the scenarios in, which is left running. Default is None, for a new
+        process pool that is shut down when the iteration ends.
+
+    Returns
+    -------
+    Iterator[ScenarioResult]
+        The scenario index, population, number of individuals discarded and error of each scenario.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError(f"Number of workers must be at least 1: {workers}")
+
+    # Validation happens here, when generate_pops is called, rather than on the first iteration
+    return _generate_pops(list(scenarios), workers, ordered, executor)
+
+
+def _generate_pops(
+    scenarios: List[Dict[str, Any]],
+    workers: Optional[int],
+    ordered: bool,
+    executor: Optional[Executor]
+) -> Iterator[ScenarioResult]:
+
+    failures: Dict[int, ScenarioResult] = {}
+    costs: Dict[int, float] = {}
+    for index, scenario in enumerate(scenarios):
+        try:
+            # Each scenario runs in one worker, as a pool of its own would compete with the others for processors
+            if "workers" in scenario:
+                raise ValueError("Scenarios cannot set workers: the pool size is set by generate_pops(workers=...)")
+            costs[index] = _estimate_cost(_validate_inputs(**_population_arguments(scenario)))
+        except Exception as e:
+            failures[index] = ScenarioResult(index, None, None, e)
+
+    pool = executor if executor is not None else ProcessPoolExecutor(
+        max_workers=workers, initializer=warm_up, mp_context=mp_context())
+    futures: Dict[int, Future] = {}
+    try:
+        # Longest first, so that the pool is not left waiting on one slow scenario at the end
+        for index in sorted(costs, key=lambda index: costs[index], reverse=True):
+            futures[index] = pool.submit(generate_pop, **scenarios[index])
+
+        if ordered:
+            for index in range(len(scenarios)):
+                yield failures[index] if index in failures else _result(index, futures[index])
+        else:
+            yield from failures.values()
+            indices = {future: index for index, future in futures.items()}
+            for future in as_completed(futures.values()):
+                yield _result(indices[future], future)
+    finally:
+        if executor is None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        else:
+            for future in futures.values():
+                future.cancel()
+
+
+def _result(index: int, future: Future) -> ScenarioResult:
+    error = future.exception()
+    if error is not None:
+        return ScenarioResult(index, None, None, error)
+
+    population, number_of_individuals_discarded = future.result()
+    return ScenarioResult(index, population, number_of_individuals_discarded, None)
@@ -1,11 +1,14 @@
 from pathlib import Path
+import argparse
+import gzip
 import sys
-import os
 import json
-from typing import cast, Dict, Any
+from typing import cast, Dict, Any, IO, List, Optional
 
-from generatepop import generate_pop
-from pypopgenbe.impl.poptocsv import pop_to_csv
+from generatepop import generate_pop, iter_pop
+from pypopgenbe.impl.enum import OutputFormat
+from pypopgenbe.impl.inputsfromjson import inputs_from_json
+from pypopgenbe.impl.popwriter import PopWriter
 
 
 def eprint(*args, **kwargs):
@@ -16,11 +19,7 @@ def json_to_inputs(path: Path) -> dict:
     with open(path) as f:
         inputs = json.load(f)
 
-    for k in ['age_range', 'bmi_range', 'height_range', 'probs_of_ethnicities']:
-        if k in inputs and inputs[k] is not None:
-            inputs[k] = tuple(inputs[k])
-
-    return inputs
+    return inputs_from_json(inputs)
 
 
 def gp(inputs: dict) -> Dict[str, Any]:
@@ -32,23 +31,147 @@ def gp(inputs: dict) -> Dict[str, Any]:
     return cast(Dict[str, Any], population)
 
 
-if __name__ == '__main__':
-    if len(sys.argv) < 2:
-        eprint("Expecting at least one arg")
-        sys.exit(1)
-
-    path = Path(sys.argv[1])
-
+def write_pop(
+    inputs: dict,
+    fh: IO[bytes],
+    output_format: OutputFormat = OutputFormat.Csv,
+    chunk_size: Optional[int] = None,
+    workers: Optional[int] = None
+) -> Optional[int]:
+    """
+    Generates a population and writes it to a binary file handle as it is generated.
+
+    Parameters:
+    inputs (dict): Arguments of generate_pop, as read by json_to_inputs.
+    fh (IO[bytes]): A binary handle open for writing.
+    output_format (OutputFormat): 'csv', 'jsonl' or 'npy'. See PopWriter.
+    chunk_size (int, optional): If given, the population is generated and written this many individuals at a
+    time, and its summary accumulated from the chunks. If None, it is generated and written whole.
+    workers (int, optional): The number of processes to generate the population in. If None, the workers in the
+    inputs, or 1 if they do not say. Overrides the workers in the inputs otherwise.
+
+    Returns:
+    int, optional: The number of individuals discarded, or None if no population was generated.
+    """
+    inputs = dict(inputs)
+    inputs_workers = inputs.pop('workers', 1)
+    if workers is None:
+        workers = inputs_workers
+
+    writer = PopWriter(fh, output_format)
+
+    if chunk_size is None:
+        population, number_of_individuals_discarded = generate_pop(**inputs, workers=workers)
+        if population is None:
+            return None
+        writer.write(population)
+    else:
+        number_of_individuals_discarded = None
+        for chunk, discarded in iter_pop(chunk_size, workers=workers, **inputs):
+            writer.write(chunk)
+            number_of_individuals_discarded = (number_of_individuals_discarded or 0) + discarded
+
+    writer.close()
+
+    return number_of_individuals_discarded
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Generate a population and write it out",
+        epilog='''
+            Example:
+            > python3 ./pypopgenbe/gp.py ./pypopgenbe/test/fromXNET/in01.json - --chunk-size 100000 --compress gzip | zcat | head
+        '''
+    )
+
+    parser.add_argument(
+        'inputs',
+        help="JSON file containing PopGen parameters"
+    )
+
+    parser.add_argument(
+        'output',
+        nargs='?',
+        default=None,
+        help="file to write the population to, or - for stdout. Default is the inputs file with the extension of the format"
+    )
+
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        required=False,
+        default=None,
+        help="generate and write this many individuals at a time"
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        required=False,
+        default=None,
+        help="number of processes to generate the population in, overriding workers in the inputs. Default is the inputs' workers, or 1"
+    )
+
+    parser.add_argument(
+        '--format',
+        choices=[f.value for f in OutputFormat],
+        required=False,
+        default=OutputFormat.Csv.value,
+        help="output format"
+    )
+
+    parser.add_argument(
+        '--compress',
+        choices=['gzip'],
+        required=False,
+        default=None,
+        help="compress the output"
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.chunk_size is not None and args.chunk_size < 1:
+        parser.error(f"chunk size must be at least 1: {args.chunk_size}")
+    if args.workers is not None and args.workers < 1:
+        parser.error(f"number of workers must be at least 1: {args.workers}")
+
+    path = Path(args.inputs)
     inputs = json_to_inputs(path)
 
-    population = gp(inputs)
+    output_format = OutputFormat(args.format)
+    is_stdout = args.output == '-'
 
-    if len(sys.argv) > 2:
-        path = Path(sys.argv[2])
+    if is_stdout:
+        fh = sys.stdout.buffer
     else:
-        path = path.parent / (path.stem + ".csv")
+        if args.output is not None:
+            output_path = Path(args.output)
+        else:
+            output_path = path.parent / (path.stem + '.' + output_format.value + ('.gz' if args.compress else ''))
+        fh = open(output_path, 'wb')
+
+    try:
+        if args.compress == 'gzip':
+            # No file name or time in the header, so the same population always compresses to the same bytes
+            with gzip.GzipFile(filename='', mode='wb', fileobj=fh, mtime=0) as gz:
+                number_of_individuals_discarded = write_pop(
+                    inputs, cast(IO[bytes], gz), output_format, args.chunk_size, args.workers)
+        else:
+            number_of_individuals_discarded = write_pop(inputs, fh, output_format, args.chunk_size, args.workers)
+    finally:
+        if is_stdout:
+            fh.flush()
+        else:
+            fh.close()
 
-    csv = pop_to_csv(population)
+    if number_of_individuals_discarded is None:
+        eprint("No data generated.")
+        sys.exit(1)
 
-    with open(path, "w") as f:
-        f.writelines(line + os.linesep for line in csv)
+    # Keep stdout for the population when it is written there
+    (eprint if is_stdout else print)(f"No. of individuals discarded = {number_of_individuals_discarded}")
+
+
+if __name__ == '__main__':
+    main()
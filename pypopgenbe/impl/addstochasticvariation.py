@@ -1,10 +1,15 @@
 import numpy as np
-from typing import Dict
+from typing import Dict, Optional
 from pypopgenbe.impl.normrnd0 import normrnd0
 from pypopgenbe.impl.lognrnd0 import lognrnd0
 
 
-def add_stochastic_variation(target: np.ndarray, coeff_of_var: np.ndarray, dist: Dict[str, np.ndarray]):
+def add_stochastic_variation(
+    target: np.ndarray,
+    coeff_of_var: np.ndarray,
+    dist: Dict[str, np.ndarray],
+    rng: Optional[np.random.Generator] = None
+):
     """
     Adds stochastic variation to organ masses/flows.
 
@@ -12,6 +17,7 @@ def add_stochastic_variation(target: np.ndarray, coeff_of_var: np.ndarray, dist:
     target (np.ndarray): Target organ masses/flows.
     coeff_of_var (np.ndarray): Coefficient of variation for the organ masses/flows.
     dist (Dict[str, np.ndarray]): Distribution information containing 'IsNormal' and 'IsLognormal' fields.
+    rng (np.random.Generator, optional): Source of random numbers. If None, the global NumPy random state is used.
 
     Returns:
     None
@@ -21,8 +27,8 @@ def add_stochastic_variation(target: np.ndarray, coeff_of_var: np.ndarray, dist:
     is_lognormal = dist['IsLognormal']
 
     # Apply normal distribution variation
-    target[is_normal] = normrnd0(target[is_normal], coeff_of_var[is_normal])
+    target[is_normal] = normrnd0(target[is_normal], coeff_of_var[is_normal], rng)
 
     # Apply lognormal distribution variation
     target[is_lognormal] = lognrnd0(
-        target[is_lognormal], coeff_of_var[is_lognormal])
+        target[is_lognormal], coeff_of_var[is_lognormal], rng)
@@ -1,34 +1,41 @@
 import numpy as np
+from typing import Union
 
 
-def age_inv(p: float) -> float:
+def age_inv(p: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
     """
     Inverse CDF for human ages.
 
+    The CDF is linear up to the mid age and quadratic from there to the
+    maximum age, so the inverse is evaluated for both segments and the
+    appropriate one selected without branching on each value.
+
     Parameters
     ----------
-    p : float
+    p : float or np.ndarray
         Input probability values.
 
     Returns
     -------
-    x : float
-        Inverse cumulative distribution function values for the input probability.
+    x : float or np.ndarray
+        Inverse cumulative distribution function values for the input probabilities.
     """
-
-    if p == 0.:
-        return 0.
+    p = np.asarray(p, dtype=float)
 
     mid_age = 45.
     max_age = 100.
 
-    if p == 1.:
-        return max_age
-
     h = 1 / (mid_age + 0.5 * (max_age - mid_age))
     m = h * mid_age
 
-    if p <= m:
-        return p / h
+    # 7975 = 2 * (max_age - mid_age) / h, from inverting the quadratic segment
+    x = np.where(
+        p <= m,
+        p / h,
+        max_age - np.sqrt(7975. * np.maximum(1. - p, 0.))
+    )
+
+    if x.ndim == 0:
+        return float(x)
 
-    return max_age - np.sqrt(7975. * (1. - p))
+    return x
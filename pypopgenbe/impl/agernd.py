@@ -1,9 +1,16 @@
 import numpy as np
+from functools import lru_cache
+from typing import Optional, Tuple, Union
 from pypopgenbe.impl.agecdf import age_cdf
 from pypopgenbe.impl.ageinv import age_inv
 
 
-def age_rnd(lower: float, upper: float) -> float:
+def age_rnd(
+    lower: float,
+    upper: float,
+    size: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None
+) -> Union[float, np.ndarray]:
     """
     Randomly generate an age.
 
@@ -13,13 +20,27 @@ def age_rnd(lower: float, upper: float) -> float:
         Lower bound for age.
     upper : float
         Upper bound for age.
+    size : int, optional
+        Number of ages to generate. If None, a single age is returned.
+    rng : np.random.Generator, optional
+        Source of random numbers. If None, the global NumPy random state is used.
 
     Returns
     -------
-    r : float
-        Randomly generated age.
+    r : float or np.ndarray
+        Randomly generated age(s).
     """
-    bounds = age_cdf(np.array([lower, upper]))
-    quantile = np.random.uniform(bounds[0], bounds[1])
+    bounds = age_cdf_bounds(lower, upper)
+    source = np.random if rng is None else rng
+    quantile = source.uniform(bounds[0], bounds[1], size)
     r = age_inv(quantile)
     return r
+
+
+@lru_cache(maxsize=32)
+def age_cdf_bounds(lower: float, upper: float) -> Tuple[float, float]:
+    """
+    CDF values at the lower and upper age bounds, cached so that they are computed once per age range.
+    """
+    bounds = age_cdf(np.array([lower, upper], dtype=float))
+    return float(bounds[0]), float(bounds[1])
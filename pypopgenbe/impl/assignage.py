@@ -1,9 +1,14 @@
 import numpy as np
-from typing import Tuple
+from typing import Optional, Tuple, Union
 from pypopgenbe.impl.agernd import age_rnd
 from pypopgenbe.impl.enum import PopulationType
 
-def assign_age(population_type: PopulationType, age_range: Tuple[float, float]) -> float:
+def assign_age(
+    population_type: PopulationType,
+    age_range: Tuple[float, float],
+    size: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None
+) -> Union[float, np.ndarray]:
     """
     Assigns an age.
 
@@ -12,10 +17,14 @@ def assign_age(population_type: PopulationType, age_range: Tuple[float, float])
         Either 'Realistic' or 'HighVariation'.
     age_range: Tuple[int, int]
         Lower and upper values of the age range.
+    size: int, optional
+        Number of ages to assign. If None, a single age is returned.
+    rng: np.random.Generator, optional
+        Source of random numbers. If None, the global NumPy random state is used.
 
     Returns:
-    float
-        Assigned age.
+    float or np.ndarray
+        Assigned age(s).
 
     Raises:
     ValueError
@@ -23,12 +32,13 @@ def assign_age(population_type: PopulationType, age_range: Tuple[float, float])
 
     Examples:
     >>> r = assign_age('Realistic', (16, 80))
-    >>> hv = assign_age('HighVariation', (16, 80))
+    >>> hv = assign_age('HighVariation', (16, 80), size=1000)
     """
 
-    def unifrnd(low: float, high: float) -> float:
+    def unifrnd(low: float, high: float, size: Optional[int], rng: Optional[np.random.Generator]) -> Union[float, np.ndarray]:
         # Generate a uniform distribution of ages
-        return np.random.uniform(low, high)
+        source = np.random if rng is None else rng
+        return source.uniform(low, high, size)
 
     # Input validation
     if population_type not in [PopulationType.Realistic, PopulationType.HighVariation]:
@@ -44,7 +54,7 @@ def assign_age(population_type: PopulationType, age_range: Tuple[float, float])
         fn = unifrnd
 
     # Generate ages
-    pop = fn(age_range[0], age_range[1])
+    pop = fn(age_range[0], age_range[1], size, rng)
     age = np.maximum(np.sqrt(np.finfo(float).eps), pop)
 
     return age
@@ -1,17 +1,29 @@
 import numpy as np
-from typing import cast
+from typing import Optional, Union, cast
 
 
-def assign_ethnicity(ethnicity_breaks: np.ndarray) -> int:
+def assign_ethnicity(
+    ethnicity_breaks: np.ndarray,
+    size: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None
+) -> Union[int, np.ndarray]:
     """
     Assigns an ethnicity based on the provided break points.
 
     Parameters:
     ethnicity_breaks (ndarray): A list of break points that determine the probability ranges for each ethnicity.
+    size (int, optional): Number of ethnicities to assign. If None, a single ethnicity is returned.
+    rng (np.random.Generator, optional): Source of random numbers. If None, the global NumPy random state is used.
 
     Returns:
-    int: The assigned ethnicity.
+    int or np.ndarray: The assigned ethnicity (or ethnicities).
     """
-    random_value = np.random.rand()
-    ethnicity = np.searchsorted(ethnicity_breaks, random_value) + 1
-    return cast(int, ethnicity)
+    source = np.random if rng is None else rng
+
+    if size is None:
+        random_value = source.random()
+        ethnicity = np.searchsorted(ethnicity_breaks, random_value) + 1
+        return cast(int, ethnicity)
+
+    random_values = source.random(size)
+    return np.searchsorted(ethnicity_breaks, random_values) + 1
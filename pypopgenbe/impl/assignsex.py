@@ -1,14 +1,26 @@
 import numpy as np
+from typing import Optional, Union
 
 
-def assign_sex(prob_of_male: float) -> int:
+def assign_sex(
+    prob_of_male: float,
+    size: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None
+) -> Union[int, np.ndarray]:
     """
     Assigns a sex based on the probability of being male.
 
     Parameters:
     prob_of_male (float): Probability of returning male.
+    size (int, optional): Number of sexes to assign. If None, a single sex is returned.
+    rng (np.random.Generator, optional): Source of random numbers. If None, the global NumPy random state is used.
 
     Returns:
-    int: Assigned sex (1=male, 2=female).
+    int or np.ndarray: Assigned sex(es) (1=male, 2=female).
     """
-    return 1 + (np.random.rand() > prob_of_male)
+    source = np.random if rng is None else rng
+
+    if size is None:
+        return 1 + int(source.random() > prob_of_male)
+
+    return 1 + (source.random(size) > prob_of_male).astype(int)
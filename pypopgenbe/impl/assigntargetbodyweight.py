@@ -1,4 +1,5 @@
-from typing import Tuple
+import numpy as np
+from typing import Optional, Tuple, Union
 from pypopgenbe.impl.truncatednormrnd import truncated_norm_rnd
 from pypopgenbe.impl.decreasingsquarelyrnd import decreasing_squarely_rnd
 from pypopgenbe.impl.enum import PopulationType
@@ -6,33 +7,38 @@ from pypopgenbe.impl.enum import PopulationType
 def assign_target_body_weight(
     population_type: PopulationType,
     range_vals: Tuple[float, float],
-    mean: float,
-    coeff_of_var: float
-) -> float:
+    mean: Union[float, np.ndarray],
+    coeff_of_var: Union[float, np.ndarray],
+    rng: Optional[np.random.Generator] = None
+) -> Union[float, np.ndarray]:
     """
     Assigns a random target body weight.
 
     Parameters:
     population_type (str): Either 'Realistic' or 'HighVariation'.
     range_vals (Tuple[float, float]): Numeric vector of length two, giving the lower and upper bounds of the target weight.
-    mean (float): The mean weight of the population to sample from.
-    coeff_of_var (float): The coefficient of variation of population weights.
+    mean (float or np.ndarray): The mean weight of the population to sample from.
+    coeff_of_var (float or np.ndarray): The coefficient of variation of population weights.
+    rng (np.random.Generator, optional): Source of random numbers. If None, the global NumPy random state is used.
 
     Returns:
-    float: Target body weight.
+    float or np.ndarray: Target body weight(s), one for each mean.
     """
 
     if population_type == PopulationType.Realistic:
         target = truncated_norm_rnd(
             mean,
-            mean * coeff_of_var,
+            np.multiply(mean, coeff_of_var),
             range_vals[0],
-            range_vals[1]
+            range_vals[1],
+            rng
         )
     elif population_type == PopulationType.HighVariation:
         target = decreasing_squarely_rnd(
             range_vals[0],
-            range_vals[1]
+            range_vals[1],
+            None if np.ndim(mean) == 0 else np.shape(mean),
+            rng
         )
 
     return target
@@ -1,35 +1,42 @@
 import numpy as np
-from typing import Tuple
+from typing import Optional, Tuple, Union
 from pypopgenbe.impl.enum import PopulationType
 
 def assign_target_height(
     population_type: PopulationType,
     range_vals: Tuple[float, float],
-    mean: float,
-    coeff_of_var: float
-) -> float:
+    mean: Union[float, np.ndarray],
+    coeff_of_var: Union[float, np.ndarray],
+    rng: Optional[np.random.Generator] = None
+) -> Union[float, np.ndarray]:
     """
     Assigns a random target height.
 
     Parameters:
     population_type (str): Either 'Realistic' or 'HighVariation'.
     range_vals (Tuple[float, float]): Numeric vector of length two, giving the lower and upper bounds of the target height.
-    mean (float): The mean height of the population to sample from.
-    coeff_of_var (float): The coefficient of variation of population heights.
+    mean (float or np.ndarray): The mean height of the population to sample from.
+    coeff_of_var (float or np.ndarray): The coefficient of variation of population heights.
+    rng (np.random.Generator, optional): Source of random numbers. If None, the global NumPy random state is used.
 
     Returns:
-    float: Assigned target height.
+    float or np.ndarray: Assigned target height(s), one for each mean.
     """
 
+    source = np.random if rng is None else rng
+    size = None if np.ndim(mean) == 0 else np.shape(mean)
+
     if population_type == PopulationType.Realistic:
-        target = np.random.normal(
+        target = source.normal(
             mean,
-            mean * coeff_of_var
+            np.multiply(mean, coeff_of_var),
+            size
         )
     elif population_type == PopulationType.HighVariation:
-        target = np.random.uniform(
+        target = source.uniform(
             range_vals[0],
-            range_vals[1]
+            range_vals[1],
+            size
         )
 
     return target
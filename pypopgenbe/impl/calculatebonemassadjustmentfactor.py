@@ -1,6 +1,5 @@
 import numpy as np
-from typing import cast
-from scipy.interpolate import interp1d
+from typing import Dict, Union
 
 CONSTS_decline_ages = np.array([25, 35, 45, 55, 65, 75, 85])
 CONSTS_male_bone_density = np.array(
@@ -16,96 +15,103 @@ CONSTS_female_bone_density_black = np.array(
 CONSTS_female_bone_density_non_black_hispanic = np.array(
     [1.104, 1.115, 1.104, 1.104, 0.989, 0.939, 0.884])
 
-male_bone_density = CONSTS_male_bone_density / CONSTS_male_bone_density[0]
-male_bone_density_black = CONSTS_male_bone_density_black / \
-    CONSTS_male_bone_density_black[0]
-male_bone_density_non_black_hispanic = CONSTS_male_bone_density_non_black_hispanic / \
-    CONSTS_male_bone_density_non_black_hispanic[0]
-female_bone_density = CONSTS_female_bone_density / \
-    CONSTS_female_bone_density[0]
-female_bone_density_black = CONSTS_female_bone_density_black / \
-    CONSTS_female_bone_density_black[0]
-female_bone_density_non_black_hispanic = CONSTS_female_bone_density_non_black_hispanic / \
-    CONSTS_female_bone_density_non_black_hispanic[0]
+# Rows of the bone density tables. Ethnicities other than Black and NonBlackHispanic use the first row.
+BONE_DENSITY_ETHNICITIES = ["Other", "Black", "NonBlackHispanic"]
 
+# Bone density by (sex, bone density ethnicity, decline age), relative to the density at the first decline age
+bone_density = np.array([
+    [
+        CONSTS_male_bone_density,
+        CONSTS_male_bone_density_black,
+        CONSTS_male_bone_density_non_black_hispanic
+    ],
+    [
+        CONSTS_female_bone_density,
+        CONSTS_female_bone_density_black,
+        CONSTS_female_bone_density_non_black_hispanic
+    ]
+])
+bone_density = bone_density / bone_density[:, :, :1]
 
-def calc_adjustment_factor(p: float) -> float:
+# Bone mineral changes by (sex, bone density ethnicity)
+ethnicity_bone_mineral_change = np.array([
+    [0., 0.08, -0.03],
+    [0., 0.055, -0.01]
+])
+
+# Ages (by sex) over which bone mass rises to its peak in young adults
+young_ages = np.array([
+    [20., 24.],
+    [18., 22.]
+])
+
+
+def calc_adjustment_factor(p: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
     bone_mineral_fraction = 0.44
     return 1 + p * bone_mineral_fraction
 
 
-def calculate_bone_mass_adjustment_factor(age_years: float, sex_name: str, ethnicity_name: str) -> float:
-
-    is_black = ethnicity_name.lower() == 'black'
-    is_non_black_hispanic = ethnicity_name.lower() == 'nonblackhispanic'
-
-    if sex_name.lower() == 'male':
-        if age_years >= 20 and age_years <= 24:
-            age_adjustment_factor_young = calc_adjustment_factor(
-                0.05 - 0.01 * (24 - age_years))
-        elif age_years >= 24:
-            age_adjustment_factor_young = calc_adjustment_factor(0.05)
-        else:
-            age_adjustment_factor_young = 1.
-
-        if is_black:
-            ethnicity_adjustment_factor = calc_adjustment_factor(0.08)
-        elif is_non_black_hispanic:
-            ethnicity_adjustment_factor = calc_adjustment_factor(-0.03)
-        else:
-            ethnicity_adjustment_factor = 1.
-
-        if is_black and age_years >= 25.:
-            age_adjustment_factor_old = calc_adjustment_factor(
-                interp1d(CONSTS_decline_ages, male_bone_density_black,
-                         fill_value=cast(float, "extrapolate"))(age_years) - 1.
-            )
-        elif is_non_black_hispanic and age_years >= 25.:
-            age_adjustment_factor_old = calc_adjustment_factor(
-                interp1d(CONSTS_decline_ages, male_bone_density_non_black_hispanic,
-                         fill_value=cast(float, "extrapolate"))(age_years) - 1.
-            )
-        elif age_years >= 25.:
-            age_adjustment_factor_old = calc_adjustment_factor(
-                interp1d(CONSTS_decline_ages, male_bone_density,
-                         fill_value=cast(float, "extrapolate"))(age_years) - 1.
-            )
-        else:
-            age_adjustment_factor_old = 1.
-
-    else:  # Female
-        if age_years >= 18 and age_years <= 22:
-            age_adjustment_factor_young = calc_adjustment_factor(
-                0.05 - 0.01 * (22 - age_years))
-        elif age_years >= 22:
-            age_adjustment_factor_young = calc_adjustment_factor(0.05)
-        else:
-            age_adjustment_factor_young = 1.
-
-        if is_black:
-            ethnicity_adjustment_factor = calc_adjustment_factor(0.055)
-        elif is_non_black_hispanic:
-            ethnicity_adjustment_factor = calc_adjustment_factor(-0.01)
-        else:
-            ethnicity_adjustment_factor = 1.
-
-        if is_black and age_years >= 25.:
-            age_adjustment_factor_old = calc_adjustment_factor(
-                interp1d(CONSTS_decline_ages, female_bone_density_black,
-                         fill_value=cast(float, "extrapolate"))(age_years) - 1.
-            )
-        elif is_non_black_hispanic and age_years >= 25.:
-            age_adjustment_factor_old = calc_adjustment_factor(
-                interp1d(CONSTS_decline_ages, female_bone_density_non_black_hispanic,
-                         fill_value=cast(float, "extrapolate"))(age_years) - 1.
-            )
-        elif age_years >= 25.:
-            age_adjustment_factor_old = calc_adjustment_factor(
-                interp1d(CONSTS_decline_ages, female_bone_density,
-                         fill_value=cast(float, "extrapolate"))(age_years) - 1.
-            )
-        else:
-            age_adjustment_factor_old = 1.
+def bone_density_ethnicities(ethnicities: np.ndarray, ethnicity_key: Dict[str, int]) -> np.ndarray:
+    """
+    Maps a dataset's ethnicity codes onto rows of the bone density tables.
+
+    Parameters:
+    ethnicities (np.ndarray): Ethnicity codes, as in CONSTS["KEY"]["Ethnicity"][dataset].
+    ethnicity_key (Dict[str, int]): Ethnicity names to codes for the dataset.
+
+    Returns:
+    np.ndarray: Indices into BONE_DENSITY_ETHNICITIES.
+    """
+    rows = [name.lower() for name in BONE_DENSITY_ETHNICITIES]
+    lookup = np.zeros(max(ethnicity_key.values()) + 1, dtype=int)
+    for name, code in ethnicity_key.items():
+        if name.lower() in rows:
+            lookup[code] = rows.index(name.lower())
+    return lookup[np.asarray(ethnicities, dtype=int)]
+
+
+def calculate_bone_mass_adjustment_factor(
+    age_years: Union[float, np.ndarray],
+    sex: Union[int, np.ndarray],
+    ethnicity: Union[int, np.ndarray],
+    ethnicity_key: Dict[str, int]
+) -> np.ndarray:
+    """
+    Adjusts bone mass by age, sex and ethnicity.
+
+    Parameters:
+        age_years (float or np.ndarray): Ages of individuals.
+        sex (int or np.ndarray): Sexes of individuals (1=male, 2=female).
+        ethnicity (int or np.ndarray): Ethnicity codes of individuals, as in CONSTS["KEY"]["Ethnicity"][dataset].
+        ethnicity_key (Dict[str, int]): Ethnicity names to codes for the dataset.
+
+    Returns:
+        np.ndarray: Adjustment factors for bone mass.
+    """
+    age_years = np.asarray(age_years, dtype=float)
+    s = np.asarray(sex, dtype=int) - 1
+    e = bone_density_ethnicities(ethnicity, ethnicity_key)
+
+    # Rise to peak bone mass
+    young_start = young_ages[s, 0]
+    young_end = young_ages[s, 1]
+    age_adjustment_factor_young = np.where(
+        age_years >= young_start,
+        calc_adjustment_factor(0.05 - 0.01 * np.maximum(young_end - age_years, 0.)),
+        1.
+    )
+
+    ethnicity_adjustment_factor = calc_adjustment_factor(ethnicity_bone_mineral_change[s, e])
+
+    # Decline after 25, interpolated linearly (and extrapolated beyond the last decline age)
+    i = np.clip(np.searchsorted(CONSTS_decline_ages, age_years, side='right') - 1, 0, len(CONSTS_decline_ages) - 2)
+    w = (age_years - CONSTS_decline_ages[i]) / (CONSTS_decline_ages[i + 1] - CONSTS_decline_ages[i])
+    density = (1. - w) * bone_density[s, e, i] + w * bone_density[s, e, i + 1]
+    age_adjustment_factor_old = np.where(
+        age_years >= 25.,
+        calc_adjustment_factor(density - 1.),
+        1.
+    )
 
     bone_mass_adjustment_factor = age_adjustment_factor_young * \
         age_adjustment_factor_old * ethnicity_adjustment_factor
@@ -1,23 +1,25 @@
 import numpy as np
+from typing import Union
 
+coeffs = np.array([0.405, 0.373])
 
-def calculate_brain_mass(age_years: float, sex_name: str) -> float:
+
+def calculate_brain_mass(
+    age_years: Union[float, np.ndarray],
+    sex: Union[int, np.ndarray]
+) -> np.ndarray:
     """
     Calculates average brain mass in humans.
 
     Parameters:
-    age_years (float): Age in years.
-    sex_name (str): Sex of the individual ('Male' or 'Female').
+    age_years (float or np.ndarray): Age in years.
+    sex (int or np.ndarray): Sex of the individual (1=male, 2=female).
 
     Returns:
-    float: Average brain mass.
+    np.ndarray: Average brain mass.
     """
     # Equations from Bosgra et al, 2012
-    if sex_name == 'Male':
-        brain = 0.405 * ((3.68 - 2.68 * np.exp(-age_years / 0.89))
-                         * np.exp(-age_years / 629))
-    else:  # Female
-        brain = 0.373 * ((3.68 - 2.68 * np.exp(-age_years / 0.89))
-                         * np.exp(-age_years / 629))
+    brain = coeffs[np.asarray(sex, dtype=int) - 1] * \
+        ((3.68 - 2.68 * np.exp(-np.asarray(age_years) / 0.89)) * np.exp(-np.asarray(age_years) / 629))
 
     return brain
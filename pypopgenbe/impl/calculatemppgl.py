@@ -1,7 +1,12 @@
 import numpy as np
+from typing import Optional
 
 
-def calculate_mppgl(age: np.ndarray, include_variation: bool = True) -> np.ndarray:
+def calculate_mppgl(
+    age: np.ndarray,
+    include_variation: bool = True,
+    rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
     """
     Calculates microsomal protein per gram of liver (MPPGL), dependent upon age.
 
@@ -16,13 +21,15 @@ def calculate_mppgl(age: np.ndarray, include_variation: bool = True) -> np.ndarr
     Parameters:
     age (np.ndarray): The age(s) to calculate MPPGL for.
     include_variation (bool): Whether to include variation in the calculation.
+    rng (np.random.Generator, optional): Source of random numbers. If None, the global NumPy random state is used.
 
     Returns:
     np.ndarray: The calculated MPPGL values.
     """
 
     if include_variation:
-        variation = np.random.randn(*age.shape) * 0.178
+        source = np.random if rng is None else rng
+        variation = source.standard_normal(age.shape) * 0.178
     else:
         variation = 0.
 
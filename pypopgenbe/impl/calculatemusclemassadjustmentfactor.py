@@ -1,8 +1,16 @@
+import numpy as np
+from typing import Union
+
 male_coeff = -0.006181912
 female_coeff = -0.005522342
 
+coeffs = np.array([male_coeff, female_coeff])
+
 
-def calculate_muscle_mass_adjustment_factor(age_years: float, sex: str) -> float:
+def calculate_muscle_mass_adjustment_factor(
+    age_years: Union[float, np.ndarray],
+    sex: Union[int, np.ndarray]
+) -> np.ndarray:
     """
     Adjusts muscle mass by age and sex.
 
@@ -11,21 +19,13 @@ def calculate_muscle_mass_adjustment_factor(age_years: float, sex: str) -> float
     81-88.
 
     Parameters:
-        age_years (float): Ages of individual.
-        sex (str): Sex of individual ('Male' or 'Female').
+        age_years (float or np.ndarray): Ages of individuals.
+        sex (int or np.ndarray): Sexes of individuals (1=male, 2=female).
 
     Returns:
-        float: Adjustment factor for muscle mass.
+        np.ndarray: Adjustment factors for muscle mass.
     """
+    age_years = np.asarray(age_years, dtype=float)
+    coeff = coeffs[np.asarray(sex, dtype=int) - 1]
 
-    old = age_years > 45
-
-    if not old:
-        return 1.
-
-    male = sex.lower() == 'male'
-
-    if male:
-        return 1. + (male_coeff * (age_years - 45))
-
-    return 1. + (female_coeff * (age_years - 45))
+    return 1. + coeff * np.maximum(age_years - 45, 0.)
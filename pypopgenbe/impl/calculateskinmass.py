@@ -1,4 +1,13 @@
-def calculate_surface_area_costeff(body_mass_kg: float) -> float:
+import numpy as np
+from typing import Union
+
+surface_thicknesses = np.array([
+    0.42 * 0.225 + 0.29 * 0.135 + 0.29 * 0.140,
+    0.42 * 0.180 + 0.29 * 0.110 + 0.29 * 0.115
+])
+
+
+def calculate_surface_area_costeff(body_mass_kg: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
     """
     Calculate the surface area using the Costeff (1966) formula.
 
@@ -8,7 +17,10 @@ def calculate_surface_area_costeff(body_mass_kg: float) -> float:
     return (4. * body_mass_kg + 7.) / (body_mass_kg + 90.)
 
 
-def calculate_skin_mass(body_mass_kg: float, sex_name: str) -> float:
+def calculate_skin_mass(
+    body_mass_kg: Union[float, np.ndarray],
+    sex: Union[int, np.ndarray]
+) -> np.ndarray:
     """
     Calculates the mass of skin for a person.
 
@@ -17,15 +29,12 @@ def calculate_skin_mass(body_mass_kg: float, sex_name: str) -> float:
     upper arms and legs and lower arms and legs is taken.
 
     :param body_mass_kg: Body mass in kilograms
-    :param sex_name: Sex of the person ('Male' or 'Female')
+    :param sex: Sex of the person (1=male, 2=female)
     :return: Mass of skin in kilograms
     """
-    if sex_name == 'Male':
-        surface_thickness = 0.42 * 0.225 + 0.29 * 0.135 + 0.29 * 0.140
-    else:
-        surface_thickness = 0.42 * 0.180 + 0.29 * 0.110 + 0.29 * 0.115
+    surface_thickness = surface_thicknesses[np.asarray(sex, dtype=int) - 1]
 
-    skin_surface_area_m2 = calculate_surface_area_costeff(body_mass_kg)
+    skin_surface_area_m2 = calculate_surface_area_costeff(np.asarray(body_mass_kg))
     skin_mass_kg = skin_surface_area_m2 * surface_thickness * 10.
 
     return skin_mass_kg
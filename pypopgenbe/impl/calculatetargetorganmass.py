@@ -7,36 +7,67 @@ from pypopgenbe.impl.calculatebonemassadjustmentfactor import calculate_bone_mas
 
 
 def calculate_target_organ_mass(
-    age: float,
-    sex_name: str,
-    ethnicity_name: str,
-    mean_body_weight: float,
-    mean_height: float,
-    target_body_weight: float,
-    target_height: float,
+    age: Union[float, np.ndarray],
+    sex: Union[int, np.ndarray],
+    ethnicity: Union[int, np.ndarray],
+    ethnicity_key: Dict[str, int],
+    mean_body_weight: Union[float, np.ndarray],
+    mean_height: Union[float, np.ndarray],
+    target_body_weight: Union[float, np.ndarray],
+    target_height: Union[float, np.ndarray],
     organ_masses: np.ndarray,
     index: Dict[str, Union[int, list]]
-) -> Tuple[float, np.ndarray]:
+) -> Tuple[Union[float, np.ndarray], np.ndarray]:
+    """
+    Calculates the mean organ masses of one or many individuals before stochastic variation.
+
+    Parameters:
+    age (float or np.ndarray): Ages in years.
+    sex (int or np.ndarray): Sexes (1=male, 2=female).
+    ethnicity (int or np.ndarray): Ethnicities, numbered as in ethnicity_key.
+    ethnicity_key (Dict[str, int]): Ethnicity names to codes for the dataset.
+    mean_body_weight (float or np.ndarray): Mean body weights at maturity (kg).
+    mean_height (float or np.ndarray): Mean heights (cm).
+    target_body_weight (float or np.ndarray): Target body weights (kg).
+    target_height (float or np.ndarray): Target heights (cm).
+    organ_masses (np.ndarray): Organ mass fractions, one row per individual or a single row shared by all.
+    index (Dict[str, Union[int, list]]): Tissue indices, as in CONSTS["INDEX"].
+
+    Returns:
+    Tuple[float or np.ndarray, np.ndarray]: Scaled heights and organ masses, one row per individual.
+    For scalar inputs, a float and a single row.
+    """
+    is_scalar = np.ndim(age) == 0
+
+    age = np.atleast_1d(np.asarray(age, dtype=float))
+    sex = np.atleast_1d(sex)
+    ethnicity = np.atleast_1d(ethnicity)
+    target_body_weight = np.atleast_1d(np.asarray(target_body_weight, dtype=float))
+
     # Calculate scaled height using the allometric scaling factor
-    scaled_height = (target_height / mean_height) ** 0.75
+    scaled_height = (np.atleast_1d(target_height) / np.atleast_1d(mean_height)) ** 0.75
 
     # Allometric scaling of all compartments
-    target_organ_mass = scaled_height * organ_masses * mean_body_weight
+    target_organ_mass = np.atleast_2d(organ_masses) * \
+        (scaled_height * np.atleast_1d(mean_body_weight))[:, np.newaxis]
 
     # Overwrite specific organ masses with calculated values
-    target_organ_mass[index["Brain"]] = calculate_brain_mass(age, sex_name)
+    target_organ_mass[:, index["Brain"]] = calculate_brain_mass(age, sex)
 
-    target_organ_mass[index["Muscle"]
-                      ] *= calculate_muscle_mass_adjustment_factor(age, sex_name)
+    target_organ_mass[:, index["Muscle"]
+                      ] *= calculate_muscle_mass_adjustment_factor(age, sex)
 
-    target_organ_mass[index["Bone"]
-                      ] *= calculate_bone_mass_adjustment_factor(age, sex_name, ethnicity_name)
+    target_organ_mass[:, index["Bone"]
+                      ] *= calculate_bone_mass_adjustment_factor(age, sex, ethnicity, ethnicity_key)
 
-    target_organ_mass[index["Skin"]] = calculate_skin_mass(
-        target_body_weight, sex_name)
+    target_organ_mass[:, index["Skin"]] = calculate_skin_mass(
+        target_body_weight, sex)
 
     # Calculate adipose mass as the remaining mass
-    target_organ_mass[index["Adipose"]] = target_body_weight - \
-        (np.sum(target_organ_mass) - target_organ_mass[index["Adipose"]])
+    target_organ_mass[:, index["Adipose"]] = target_body_weight - \
+        (np.sum(target_organ_mass, axis=1) - target_organ_mass[:, index["Adipose"]])
+
+    if is_scalar:
+        return float(scaled_height[0]), target_organ_mass[0]
 
     return scaled_height, target_organ_mass
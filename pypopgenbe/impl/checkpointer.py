@@ -0,0 +1,120 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Union
+import numpy as np
+
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+class Checkpointer:
+    """
+    Saves the state of sampling to a file at most once per interval, and restores it, so that a run that is
+    interrupted can carry on from where it was.
+
+    The state is the individuals accepted so far, the number of candidates rejected for each reason, and the
+    state of the random number generator. A checkpoint is written to a temporary file, flushed to disk and then
+    renamed over the last, so that the file always holds a whole checkpoint.
+    """
+
+    def __init__(self, path: Union[str, Path], interval: float = 60.):
+        """
+        Parameters:
+        path (str or Path): The file to keep the checkpoint in. Its directory is created if it does not exist.
+        interval (float): Least seconds between checkpoints taken by save_if_due.
+        """
+        if not interval >= 0:
+            raise ValueError(f"Checkpoint interval must be a non-negative number of seconds: {interval}")
+
+        self.path = Path(path)
+        self.interval = interval
+        self._last_time = time.monotonic()
+
+    def restore(
+        self,
+        personal_details: np.ndarray,
+        tissues: np.ndarray,
+        rejections: Dict[str, int],
+        rng: np.random.Generator
+    ) -> int:
+        """
+        Fills in the individuals, rejections and random state of the checkpoint, if there is one.
+
+        Parameters:
+        personal_details (np.ndarray): The personal details of the population being sampled, filled in place.
+        tissues (np.ndarray): The tissues of the population being sampled, filled in place.
+        rejections (dict): The number of candidates rejected for each reason, updated in place.
+        rng (np.random.Generator): The generator sampling the population, set to the state of the checkpoint.
+
+        Returns:
+        int: The number of individuals accepted by the checkpoint, or 0 if there is none.
+        """
+        if not self.path.exists():
+            return 0
+
+        with np.load(self.path, allow_pickle=False) as checkpoint:
+            state = json.loads(str(checkpoint['State']))
+            if state['Version'] != CHECKPOINT_FORMAT_VERSION:
+                raise ValueError(f"Unsupported checkpoint version: {state['Version']}")
+
+            number_accepted = checkpoint['PersonalDetails'].shape[0]
+            personal_details[:number_accepted] = checkpoint['PersonalDetails']
+            tissues[:number_accepted] = checkpoint['Tissues']
+
+        rejections.update(state['Rejections'])
+        rng.bit_generator.state = state['RngState']
+
+        return number_accepted
+
+    def save_if_due(
+        self,
+        personal_details: np.ndarray,
+        tissues: np.ndarray,
+        rejections: Dict[str, int],
+        rng: np.random.Generator
+    ):
+        """Saves a checkpoint if interval seconds have passed since the last. Takes the arguments of save."""
+        if time.monotonic() - self._last_time >= self.interval:
+            self.save(personal_details, tissues, rejections, rng)
+
+    def save(
+        self,
+        personal_details: np.ndarray,
+        tissues: np.ndarray,
+        rejections: Dict[str, int],
+        rng: np.random.Generator
+    ):
+        """
+        Saves a checkpoint.
+
+        Parameters:
+        personal_details (np.ndarray): The personal details of the individuals accepted so far.
+        tissues (np.ndarray): The tissues of the individuals accepted so far.
+        rejections (dict): The number of candidates rejected for each reason so far.
+        rng (np.random.Generator): The generator sampling the population.
+        """
+        state = {
+            'Version': CHECKPOINT_FORMAT_VERSION,
+            'Rejections': rejections,
+            'RngState': rng.bit_generator.state
+        }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(f'.{self.path.name}.{os.getpid()}.tmp')
+        with open(temp_path, 'wb') as f:
+            np.savez(
+                f,
+                PersonalDetails=personal_details,
+                Tissues=tissues,
+                State=np.array(json.dumps(state))
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+        self._last_time = time.monotonic()
+
+    def remove(self):
+        """Removes the checkpoint, once the population is complete."""
+        self.path.unlink(missing_ok=True)
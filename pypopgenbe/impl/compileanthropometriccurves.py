@@ -0,0 +1,86 @@
+import numpy as np
+from typing import Any, Dict
+from pypopgenbe.impl.enum import Dataset
+
+AGE_CLASSES = ["Child", "Adult"]
+QUANTITIES = ["Height", "BodyWeight"]
+
+
+def compile_anthropometric_curves(CONSTS: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compiles the mean height, body weight and cardiac output curves into arrays that can be evaluated for many individuals at once.
+
+    The polynomial coefficients read by read_coeffs_from_file for P3M, HSE and NDNS are stacked into a single tensor
+    indexed by (dataset, age class, sex, ethnicity, quantity, power), with powers in ascending order and padded with
+    zeros to a common degree. NDNS has no age classes, so its coefficients are repeated for both. ICRP curves are
+    tabulated rather than polynomial, so their ages and values are kept as piecewise-linear tables.
+
+    Parameters:
+    CONSTS (Dict[str, Any]): Constants loaded from popgenconsts.pkl.
+
+    Returns:
+    Dict[str, Any]: Compiled curves with fields:
+        - 'Coeffs': Polynomial coefficient tensor. Rows for tabulated datasets are zero.
+        - 'IsTabulated': Boolean per dataset, True where the curves are tabulated.
+        - 'TabulatedAges': Ages of the ICRP tables, per quantity.
+        - 'TabulatedValues': Values of the ICRP tables, per quantity, shaped (sex, age).
+        - 'CardiacOutputAges': Age groups of the ICRP cardiac output table.
+        - 'CardiacOutputValues': Cardiac outputs, shaped (sex, age group).
+    """
+    datasets = list(Dataset)
+    number_of_sexes = len(CONSTS["NAMES"]["Sex"])
+    number_of_ethnicities = max(len(key) for key in CONSTS["KEY"]["Ethnicity"].values())
+
+    def coeffs_for(dataset: Dataset, quantity: str, age_class: str) -> Dict[str, Dict[str, np.ndarray]]:
+        if dataset == Dataset.NDNS:
+            return CONSTS[quantity][dataset.name]
+        return CONSTS[quantity][dataset.name][age_class]
+
+    polynomial_datasets = [dataset for dataset in datasets if dataset != Dataset.ICRP]
+
+    degree = max(
+        len(c) - 1
+        for dataset in polynomial_datasets
+        for quantity in QUANTITIES
+        for age_class in AGE_CLASSES
+        for by_ethnicity in coeffs_for(dataset, quantity, age_class).values()
+        for c in by_ethnicity.values()
+    )
+
+    coeffs = np.zeros((
+        len(datasets),
+        len(AGE_CLASSES),
+        number_of_sexes,
+        number_of_ethnicities,
+        len(QUANTITIES),
+        degree + 1
+    ))
+
+    for d, dataset in enumerate(datasets):
+        if dataset not in polynomial_datasets:
+            continue
+        for a, age_class in enumerate(AGE_CLASSES):
+            for q, quantity in enumerate(QUANTITIES):
+                curves = coeffs_for(dataset, quantity, age_class)
+                for s, sex_name in enumerate(CONSTS["NAMES"]["Sex"]):
+                    for ethnicity_name, ethnicity in CONSTS["KEY"]["Ethnicity"][dataset.name].items():
+                        # Stored highest power first, as for np.polyval
+                        c = curves[sex_name.lower()][ethnicity_name.lower()][::-1]
+                        coeffs[d, a, s, ethnicity - 1, q, :len(c)] = c
+
+    tabulated_ages = []
+    tabulated_values = []
+    for quantity in QUANTITIES:
+        table = CONSTS[quantity][Dataset.ICRP.name]
+        order = np.argsort(table["Ages"])
+        tabulated_ages.append(np.asarray(table["Ages"], dtype=float)[order])
+        tabulated_values.append(np.asarray(table["Values"], dtype=float)[order].T)
+
+    return {
+        "Coeffs": coeffs,
+        "IsTabulated": np.array([dataset == Dataset.ICRP for dataset in datasets]),
+        "TabulatedAges": tabulated_ages,
+        "TabulatedValues": tabulated_values,
+        "CardiacOutputAges": np.asarray(CONSTS["AgeGroups"]["ICRP"], dtype=float),
+        "CardiacOutputValues": np.asarray(CONSTS["CardiacOutput"]["ICRP"], dtype=float).T
+    }
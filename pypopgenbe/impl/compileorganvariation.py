@@ -0,0 +1,33 @@
+import numpy as np
+from typing import Any, Dict
+
+
+def compile_organ_variation(CONSTS: Dict[str, Any], quantity: str) -> Dict[str, np.ndarray]:
+    """
+    Compiles the per-sex stochastic variation parameters of organ masses or flows into arrays indexed by (sex, tissue).
+
+    For lognormally distributed tissues the multiplicative spread is the Sigma precomputed by
+    define_consts_for_popgen, sqrt(log(cv^2 + 1)). For normally distributed tissues it is the coefficient
+    of variation, since the precomputed Sigma is scaled by the mean fraction rather than the individual's target.
+
+    Parameters:
+    CONSTS (Dict[str, Any]): Constants loaded from popgenconsts.pkl.
+    quantity (str): Either 'Mass' or 'Flow'.
+
+    Returns:
+    Dict[str, np.ndarray]: Compiled parameters with fields:
+        - 'Sigma': Spread of the variation, shaped (sex, tissue).
+        - 'IsLognormal': True where the tissue is lognormally distributed, shaped (sex, tissue).
+    """
+    organ = CONSTS["ORGAN"][quantity]
+    distribution = CONSTS["DISTRIBUTION"][quantity]
+    sexes = range(len(organ["CoeffOfVar"]))
+
+    is_lognormal = np.array([distribution[sex]["IsLognormal"] for sex in sexes], dtype=bool)
+    coeff_of_var = np.array([organ["CoeffOfVar"][sex] for sex in sexes], dtype=float)
+    lognormal_sigma = np.array([organ["Sigma"][sex] for sex in sexes], dtype=float)
+
+    return {
+        "Sigma": np.where(is_lognormal, lognormal_sigma, coeff_of_var),
+        "IsLognormal": is_lognormal
+    }
@@ -1,33 +1,38 @@
 import numpy as np
+from typing import Union
 
 
-def decreasing_squarely_inv(p: float, lower: float, upper: float) -> float:
+def decreasing_squarely_inv(
+    p: Union[float, np.ndarray],
+    lower: Union[float, np.ndarray],
+    upper: Union[float, np.ndarray]
+) -> Union[float, np.ndarray]:
     """
     Calculate the inverse cumulative distribution function for the "decreasing squarely" distribution.
 
+    The quantile x solves the cubic
+
+        x^3 - 3(l + u)x^2 + 3(l + u)^2 x - (l^3 + 3l^2 u + 3l u^2) - (u^3 - l^3)p = 0
+
+    where l and u are the bounds. Completing the cube gives (x - (l + u))^3 = (u^3 - l^3)p - u^3,
+    which has exactly one real root for any p, so the quantile is l + u plus a real cube root.
+
     :param p: Cumulative probability at which to evaluate the inverse CDF
     :param lower: Lower bound of the distribution
     :param upper: Upper bound of the distribution
     :return: Quantile corresponding to the given cumulative probability
     """
-    if p == 0.:
-        return lower
-    if p == 1.:
-        return upper
-
-    lower3 = lower ** 3.
-    const_of_integration = lower3 + 3. * \
-        lower ** 2. * upper + 3. * lower * upper ** 2.
-    sum_of_bounds = lower + upper
-    diff_cubes = upper ** 3. - lower3
-
-    coeff3 = 1.
-    coeff2 = -3. * sum_of_bounds
-    coeff1 = 3. * sum_of_bounds ** 2.
-    coeff0 = -const_of_integration - diff_cubes * p
-
-    cubic = [coeff3, coeff2, coeff1, coeff0]
-    roots = np.roots(cubic)
-    real_roots = roots[np.isreal(roots)].real
-
-    return real_roots[0]  # Assuming a single real root
+    p = np.asarray(p, dtype=float)
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+
+    upper3 = upper ** 3.
+    x = lower + upper + np.cbrt((upper3 - lower ** 3.) * p - upper3)
+
+    # Pin the end points, which are otherwise subject to rounding in the cube root
+    x = np.where(p <= 0., lower, np.where(p >= 1., upper, x))
+
+    if x.ndim == 0:
+        return float(x)
+
+    return x
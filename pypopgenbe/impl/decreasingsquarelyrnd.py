@@ -1,17 +1,26 @@
 import numpy as np
+from typing import Optional, Union
 from pypopgenbe.impl.decreasingsquarelyinv import decreasing_squarely_inv
 
 
-def decreasing_squarely_rnd(lower: float, upper: float) -> float:
+def decreasing_squarely_rnd(
+    lower: float,
+    upper: float,
+    size: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None
+) -> Union[float, np.ndarray]:
     """
     Generate random number sampled from the "decreasing squarely" distribution.
 
     :param lower: Lower bound of the distribution
     :param upper: Upper bound of the distribution
-    :return: Random sample from the distribution
+    :param size: Number of samples to generate. If None, a single sample is returned
+    :param rng: Source of random numbers. If None, the global NumPy random state is used
+    :return: Random sample(s) from the distribution
     """
 
-    quantile = np.random.random_sample()
+    source = np.random if rng is None else rng
+    quantile = source.random(size)
     r = decreasing_squarely_inv(quantile, lower, upper)
 
     return r
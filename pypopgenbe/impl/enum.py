@@ -98,3 +98,58 @@ class PopulationType(StrEnum):
             if member.value == value:
                 return member
         return None
+
+
+class Engine(StrEnum):
+    Loop = auto()
+    Vectorized = auto()
+
+    @classmethod
+    def _missing_(cls, value: str):
+        value = value.lower()
+        for member in cls:
+            if member.value == value:
+                return member
+        return None
+
+
+class Stage(StrEnum):
+    Sampling = auto()
+    Aggregation = auto()
+    Enzymes = auto()
+    Stats = auto()
+
+    @classmethod
+    def _missing_(cls, value: str):
+        value = value.lower()
+        for member in cls:
+            if member.value == value:
+                return member
+        return None
+
+
+class PoolType(StrEnum):
+    Thread = auto()
+    Process = auto()
+
+    @classmethod
+    def _missing_(cls, value: str):
+        value = value.lower()
+        for member in cls:
+            if member.value == value:
+                return member
+        return None
+
+
+class OutputFormat(StrEnum):
+    Csv = auto()
+    Npy = auto()
+    Jsonl = auto()
+
+    @classmethod
+    def _missing_(cls, value: str):
+        value = value.lower()
+        for member in cls:
+            if member.value == value:
+                return member
+        return None
@@ -0,0 +1,38 @@
+import numpy as np
+from pypopgenbe.impl.wilsoninterval import wilson_interval
+
+
+def estimate_batch_size(
+    number_remaining: int,
+    number_of_candidates: int,
+    number_accepted: int,
+    z: float = 2.
+) -> int:
+    """
+    Estimates the number of candidates to sample so that a batch yields the remaining individuals in one go.
+
+    The acceptance rate p is taken as the Wilson lower confidence bound, z standard deviations below the
+    estimate, of (accepted + 1) successes in (candidates + 2) trials, which is positive even before any
+    candidate has been accepted. The batch size n is then the smallest for which the expected number
+    accepted, less z standard deviations, covers the remainder: n p - z sqrt(n p (1 - p)) >= number_remaining.
+    With z = 2 a batch rarely falls short, however few candidates the estimate is based on.
+
+    Parameters:
+    number_remaining (int): Number of individuals still to be accepted.
+    number_of_candidates (int): Number of candidates sampled so far.
+    number_accepted (int): Number of those candidates accepted.
+    z (float): Safety margin, in standard deviations of the number accepted.
+
+    Returns:
+    int: Number of candidates to sample. Zero if none remain.
+    """
+    if number_remaining <= 0:
+        return 0
+
+    p, _ = wilson_interval(number_accepted + 1., number_of_candidates + 2., z)
+
+    # Solve p s^2 - z sqrt(p (1 - p)) s - number_remaining = 0 for s = sqrt(n)
+    b = z * np.sqrt(p * (1. - p))
+    s = (b + np.sqrt(b**2 + 4. * p * number_remaining)) / (2. * p)
+
+    return int(np.ceil(s**2))
@@ -0,0 +1,93 @@
+import numpy as np
+from typing import Any, Dict, Tuple
+from pypopgenbe.impl.enum import Dataset
+
+
+def evaluate_anthropometric_curves(
+    curves: Dict[str, Any],
+    dataset: Dataset,
+    ages: np.ndarray,
+    sexes: np.ndarray,
+    ethnicities: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Evaluates the compiled mean height, body weight and cardiac output curves for many individuals.
+
+    Individuals aged over 16 use the adult curves. Body weight at maturity is evaluated at the
+    individual's age capped at 20 for males and 16 for females, using the individual's own age class.
+    Tabulated (ICRP) curves are interpolated linearly and extrapolated beyond the ends of the table. Cardiac
+    output is only interpolated, so ages outside its table raise a ValueError.
+
+    Parameters:
+    curves (Dict[str, Any]): Curves created by compile_anthropometric_curves.
+    dataset (Dataset): The dataset to evaluate curves for.
+    ages (np.ndarray): Ages in years.
+    sexes (np.ndarray): Sexes (1=male, 2=female).
+    ethnicities (np.ndarray): Ethnicities, numbered as in CONSTS["KEY"]["Ethnicity"].
+
+    Returns:
+    Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Mean height (cm), mean body weight (kg),
+    mean body weight at maturity (kg) and mean cardiac output (mL/min).
+    """
+    ages = np.asarray(ages, dtype=float)
+    sex_index = np.asarray(sexes, dtype=int) - 1
+    is_male = sex_index == 0
+    maturity_ages = np.minimum(ages, np.where(is_male, 20., 16.))
+
+    d = list(Dataset).index(dataset)
+
+    if curves["IsTabulated"][d]:
+        mean_height = _interp_by_sex(
+            ages, is_male, curves["TabulatedAges"][0], curves["TabulatedValues"][0], extrapolate=True)
+        mean_body_weight = _interp_by_sex(
+            ages, is_male, curves["TabulatedAges"][1], curves["TabulatedValues"][1], extrapolate=True)
+        mean_body_weight_at_maturity = _interp_by_sex(
+            maturity_ages, is_male, curves["TabulatedAges"][1], curves["TabulatedValues"][1], extrapolate=True)
+    else:
+        age_class = (ages > 16).astype(int)
+        ethnicity_index = np.asarray(ethnicities, dtype=int) - 1
+        # (n, quantity, power)
+        coeffs = curves["Coeffs"][d, age_class, sex_index, ethnicity_index]
+        mean_height = _horner(coeffs[:, 0], ages)
+        mean_body_weight = _horner(coeffs[:, 1], ages)
+        mean_body_weight_at_maturity = _horner(coeffs[:, 1], maturity_ages)
+
+    # from ICRP Ref. Man. P139
+    mean_cardiac_output = _interp_by_sex(
+        ages, is_male, curves["CardiacOutputAges"], curves["CardiacOutputValues"], extrapolate=False)
+
+    return mean_height, mean_body_weight, mean_body_weight_at_maturity, mean_cardiac_output
+
+
+def _horner(coeffs: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """Evaluates one polynomial per element of x, with coefficients in ascending powers along the last axis."""
+    y = coeffs[:, -1].copy()
+    for j in range(coeffs.shape[1] - 2, -1, -1):
+        y *= x
+        y += coeffs[:, j]
+    return y
+
+
+def _interp_by_sex(x: np.ndarray, is_male: np.ndarray, xp: np.ndarray, fp: np.ndarray, extrapolate: bool) -> np.ndarray:
+    """Linearly interpolates the male (fp[0]) or female (fp[1]) table, optionally extrapolating from the end segments."""
+    return np.where(
+        is_male,
+        _interp(x, xp, fp[0], extrapolate),
+        _interp(x, xp, fp[1], extrapolate)
+    )
+
+
+def _interp(x: np.ndarray, xp: np.ndarray, fp: np.ndarray, extrapolate: bool) -> np.ndarray:
+    if not extrapolate:
+        if np.any(x < xp[0]):
+            raise ValueError(f"A value ({np.min(x)}) in x_new is below the interpolation range's minimum value ({xp[0]}).")
+        if np.any(x > xp[-1]):
+            raise ValueError(f"A value ({np.max(x)}) in x_new is above the interpolation range's maximum value ({xp[-1]}).")
+
+    y = np.interp(x, xp, fp)
+    if extrapolate:
+        below = x < xp[0]
+        above = x > xp[-1]
+        y = np.where(below, fp[0] + (x - xp[0]) * (fp[1] - fp[0]) / (xp[1] - xp[0]), y)
+        y = np.where(above, fp[-1] + (x - xp[-1]) * (fp[-1] - fp[-2]) / (xp[-1] - xp[-2]), y)
+    return y
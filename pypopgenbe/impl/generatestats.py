@@ -1,5 +1,4 @@
 import numpy as np
-from scipy.stats import gmean
 
 
 def generate_stats(x: np.ndarray) -> dict:
@@ -57,8 +56,11 @@ def generate_stats(x: np.ndarray) -> dict:
     else:
         mean = np.mean(x, axis=0)
         std_dev = np.std(x, axis=0, ddof=1)
-        geo_mean = gmean(x, axis=0)
-        geo_std_dev = np.exp(np.std(np.log(x), axis=0))
+        # A column with a zero has a GeoMean of zero, and with a negative value a GeoMean of nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_x = np.log(x)
+            geo_mean = np.exp(np.mean(log_x, axis=0))
+            geo_std_dev = np.exp(np.std(log_x, axis=0))
         prc = np.percentile(x, [2.5, 5, 50, 95, 97.5], axis=0)
 
         stats = {
@@ -0,0 +1,195 @@
+"""
+Loads the constants in popgenconsts.pkl once per process, and caches functions of them.
+
+The whole table is loaded on the first call, with the constants of every dataset, since the pickle holds them
+all in one file; nothing is loaded per dataset or on demand. In a source checkout, where defineconsts/data is
+present, the first call also hashes every file there to check that popgenconsts.pkl is up to date.
+"""
+import os
+import pickle
+import subprocess
+import sys
+import threading
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+import numpy as np
+
+PACKAGE_DIR = Path(__file__).parent.parent
+
+CONSTS_PATH = PACKAGE_DIR / 'popgenconsts.pkl'
+
+# The sources popgenconsts.pkl is built from. They are not installed with the package, in which case
+# the installed popgenconsts.pkl is used as is.
+SOURCES_DIR = PACKAGE_DIR / 'defineconsts' / 'data'
+
+# Held while popgenconsts.pkl is checked and rebuilt, so that processes starting together build it once
+LOCK_PATH = PACKAGE_DIR / '.popgenconsts.lock'
+
+# Run with the path to build to. The build scripts import each other as top-level defineconsts modules
+_BUILD_SCRIPT = (
+    "import sys; from pathlib import Path; "
+    "from defineconsts.defineconstsforpopgen import define_consts_for_popgen; "
+    "define_consts_for_popgen(Path(sys.argv[1]), None)"
+)
+
+_lock = threading.RLock()
+_consts: Optional[Dict[str, Any]] = None
+_compiled: Dict[Tuple[Callable[..., Any], Tuple[Any, ...]], Any] = {}
+
+
+def get_consts() -> Dict[str, Any]:
+    """
+    Returns the constants in popgenconsts.pkl, every dataset of them, loaded once per process.
+
+    The arrays in the constants are read-only, so the same constants can be shared by every caller. If the
+    sources in defineconsts/data are present and have changed since popgenconsts.pkl was built, it is rebuilt first,
+    as by build_consts. If that fails, for example because pandas is not installed, a warning is given and the
+    existing popgenconsts.pkl is used.
+
+    Returns:
+    Dict[str, Any]: The constants.
+    """
+    global _consts
+
+    with _lock:
+        if _consts is None:
+            source_hash = hash_consts_sources()
+            consts = _load_consts()
+
+            if source_hash is not None and consts.get("SOURCE_HASH") != source_hash:
+                try:
+                    consts = build_consts()
+                except Exception as e:
+                    if not consts:
+                        raise
+                    warnings.warn(
+                        f"popgenconsts.pkl is out of date with {SOURCES_DIR} and could not be rebuilt, "
+                        f"so it is used as it is: {e!r}",
+                        RuntimeWarning
+                    )
+
+            _consts = _freeze(consts)
+
+        return _consts
+
+
+def build_consts() -> Dict[str, Any]:
+    """
+    Builds popgenconsts.pkl from the sources in defineconsts/data, unless another process has just built it
+    from the same sources.
+
+    The build holds a lock file, so that processes starting together on a stale checkout build the constants
+    once, and writes to a temporary file that is then renamed over popgenconsts.pkl, so that a reader finds
+    either the old constants or the new. It does not write popgenconsts.json; run defineconstsforpopgen for that.
+    Also run as a build step by `python -m pypopgenbe.impl.getconsts`.
+
+    Returns:
+    Dict[str, Any]: The constants, tagged by define_consts_for_popgen with the hash of their sources as "SOURCE_HASH".
+    """
+    source_hash = hash_consts_sources()
+    if source_hash is None:
+        raise ValueError(f"The sources of the constants are not present: {SOURCES_DIR}")
+
+    with _file_lock(LOCK_PATH):
+        consts = _load_consts()
+        if consts.get("SOURCE_HASH") == source_hash:
+            return consts
+
+        temp_path = CONSTS_PATH.with_name(f'.{CONSTS_PATH.name}.{os.getpid()}.tmp')
+        try:
+            subprocess.run(
+                [sys.executable, '-c', _BUILD_SCRIPT, str(temp_path)],
+                cwd=PACKAGE_DIR,
+                check=True,
+                stdout=subprocess.DEVNULL
+            )
+            with open(temp_path, 'r+b') as f:
+                consts = pickle.load(f)
+                os.fsync(f.fileno())
+            os.replace(temp_path, CONSTS_PATH)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    return consts
+
+
+def get_compiled(compile: Callable[..., Any], *args: Any) -> Any:
+    """
+    Returns compile(get_consts(), *args), computed once per process and made read-only.
+
+    Parameters:
+    compile (Callable): A function of the constants, e.g. compile_anthropometric_curves.
+    args: Further hashable arguments to compile.
+
+    Returns:
+    Any: The result of compile.
+    """
+    key = (compile, args)
+
+    with _lock:
+        if key not in _compiled:
+            _compiled[key] = _freeze(compile(get_consts(), *args))
+
+        return _compiled[key]
+
+
+def hash_consts_sources() -> Optional[str]:
+    """
+    Returns a SHA-256 hash of the names and contents of the files popgenconsts.pkl is built from.
+
+    Returns:
+    str, optional: The hex digest, or None if the sources are not present.
+    """
+    if not SOURCES_DIR.is_dir():
+        return None
+
+    # Shared with define_consts_for_popgen, which stamps the hash into the pickle it builds
+    from pypopgenbe.defineconsts.hashsources import hash_sources
+    return hash_sources(SOURCES_DIR)
+
+
+def _load_consts() -> Dict[str, Any]:
+    if not CONSTS_PATH.exists():
+        return {}
+    with open(CONSTS_PATH, 'rb') as f:
+        return pickle.load(f)
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Holds an exclusive lock on a file, waiting for any other process that holds it."""
+    with open(path, 'a+b') as f:
+        if os.name == 'nt':
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _freeze(x: Any) -> Any:
+    if isinstance(x, np.ndarray):
+        x.setflags(write=False)
+    elif isinstance(x, dict):
+        for v in x.values():
+            _freeze(v)
+    elif isinstance(x, (list, tuple)):
+        for v in x:
+            _freeze(v)
+    return x
+
+
+if __name__ == '__main__':
+    build_consts()
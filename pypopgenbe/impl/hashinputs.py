@@ -0,0 +1,79 @@
+import hashlib
+import json
+from typing import Any, Dict, Optional
+from pypopgenbe.__version__ import __version__
+from pypopgenbe.impl.collateinputs import collate_inputs
+from pypopgenbe.impl.getconsts import CONSTS_PATH
+
+_consts_file_hash: Optional[str] = None
+
+
+def hash_inputs(inputs: Dict[str, Any], workers: int) -> str:
+    """
+    Returns a SHA-256 hash of everything that determines the population generate_pop returns for validated inputs.
+
+    The hash covers the inputs as collate_inputs records them, the tissues considered discretely, the enzyme
+    parameters, the engine and number of workers, which choose the random streams, the minimum acceptance
+    rate, and the versions of the library and the constants. Numbers are hashed as floats, so that e.g. an
+    age range of (18, 60) and one of (18.0, 60.0) have the same hash. The callbacks and budgets are not
+    hashed: they only decide whether the population is complete.
+
+    Parameters:
+    inputs (dict): The arguments of _generate_pop, as returned by _validate_inputs.
+    workers (int): The number of processes the population is sampled in.
+
+    Returns:
+    str: The hex digest.
+    """
+    def to_floats(x: Any) -> Any:
+        return None if x is None else tuple(float(v) for v in x)
+
+    enzyme_rate_units = inputs["enzyme_rate_units"]
+
+    canonical = {
+        "Inputs": collate_inputs(
+            inputs["population_size"],
+            inputs["dataset"],
+            inputs["population_type"],
+            inputs["seed"],
+            to_floats(inputs["age_range"]),
+            to_floats(inputs["bmi_range"]),
+            to_floats(inputs["height_range"]),
+            float(inputs["prob_of_male"]),
+            to_floats(inputs["probs_of_ethnicities"]),
+            inputs["flow_units"],
+            enzyme_rate_units
+        ),
+        "IsSlowlyPerfusedTissueDiscrete": [bool(v) for v in inputs["is_slowly_perfused_tissue_discrete"]],
+        "IsRichlyPerfusedTissueDiscrete": [bool(v) for v in inputs["is_richly_perfused_tissue_discrete"]],
+        "Enzymes": {
+            "Parameter": None if enzyme_rate_units is None else type(enzyme_rate_units).__name__,
+            "Names": list(inputs["enzyme_names"]),
+            "InVitroRates": to_floats(inputs["in_vitro_enzyme_rates"]),
+            "InVitroRateCoeffsOfVar": to_floats(inputs["in_vitro_enzyme_rate_coeffs_of_var"]),
+            "MolecularWeight": None if inputs["molecular_weight"] is None else float(inputs["molecular_weight"])
+        },
+        "Engine": inputs["engine"].value,
+        "Workers": workers,
+        "MinAcceptanceRate": inputs["min_acceptance_rate"],
+        "Version": __version__,
+        "Consts": _consts_version(inputs["CONSTS"])
+    }
+
+    # NaN, the default coefficient of variation, is written as NaN, so compares equal to itself
+    text = json.dumps(canonical, sort_keys=True, separators=(',', ':'))
+
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _consts_version(CONSTS: Dict[str, Any]) -> str:
+    """The hash of the sources the constants were built from, or of popgenconsts.pkl when it was installed prebuilt."""
+    global _consts_file_hash
+
+    if "SOURCE_HASH" in CONSTS:
+        return CONSTS["SOURCE_HASH"]
+
+    if _consts_file_hash is None:
+        _consts_file_hash = hashlib.sha256(CONSTS_PATH.read_bytes()).hexdigest()
+
+    return _consts_file_hash
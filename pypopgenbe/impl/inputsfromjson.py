@@ -0,0 +1,21 @@
+from typing import Any, Dict
+
+# Arguments of generate_pop that are tuples, which JSON holds as lists
+_TUPLE_KEYS = ['age_range', 'bmi_range', 'height_range', 'probs_of_ethnicities']
+
+
+def inputs_from_json(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converts arguments of generate_pop read from JSON to the types generate_pop takes.
+
+    Parameters:
+    inputs (dict): The arguments, as decoded by json.load. Converted in place.
+
+    Returns:
+    dict: The same dict.
+    """
+    for k in _TUPLE_KEYS:
+        if k in inputs and inputs[k] is not None:
+            inputs[k] = tuple(inputs[k])
+
+    return inputs
@@ -0,0 +1,22 @@
+import time
+from typing import Dict, Optional
+
+
+def is_budget_exhausted(budget: Dict[str, Optional[float]], number_of_candidates: int) -> bool:
+    """
+    Checks whether sampling has used up its budget of candidates or time.
+
+    Parameters:
+    budget (Dict[str, Optional[float]]): 'MaxAttempts', the most candidates to sample, and 'Deadline', the
+    time.time() by which to stop. Either may be None for no limit.
+    number_of_candidates (int): Number of candidates sampled so far.
+
+    Returns:
+    bool: True if either limit has been reached.
+    """
+    max_attempts = budget["MaxAttempts"]
+    if max_attempts is not None and number_of_candidates >= max_attempts:
+        return True
+
+    deadline = budget["Deadline"]
+    return deadline is not None and time.time() >= deadline
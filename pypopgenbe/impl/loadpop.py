@@ -0,0 +1,57 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Union
+import numpy as np
+from pypopgenbe.impl.savepop import ARRAY_FILES, MANIFEST_FILE, POP_FORMAT_VERSION
+
+
+def load_pop(directory: Union[str, Path], mmap: bool = True) -> Dict[str, Any]:
+    """
+    Loads a population saved by save_pop.
+
+    Parameters:
+    directory (str or Path): The directory the population was saved to.
+    mmap (bool): If True, the arrays are memory-mapped read-only rather than read, so loading takes the same
+    time whatever the size of the population and only the parts of the arrays that are used are read from disk.
+
+    Returns:
+    dict: The population, in the form returned by generate_pop.
+    """
+    directory = Path(directory)
+
+    manifest_path = directory / MANIFEST_FILE
+    if not manifest_path.exists():
+        raise ValueError(f"No saved population in {directory}")
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    if manifest.get('Version') != POP_FORMAT_VERSION:
+        raise ValueError(f"Unsupported saved population version: {manifest.get('Version')}")
+
+    pop: Dict[str, Any] = {group: manifest[group] for group in ['Roots', 'Tissues', 'Enzymes']}
+
+    mmap_mode = 'r' if mmap else None
+    for (group, key), file_name in ARRAY_FILES.items():
+        pop[group][key] = np.load(directory / file_name, mmap_mode=mmap_mode)
+
+    pop['Inputs'] = {
+        section: {k: tuple(v) if isinstance(v, list) else v for k, v in values.items()}
+        for section, values in manifest['Inputs'].items()
+    }
+
+    pop['Summary'] = {
+        sex: {
+            quantity: {
+                stat: np.array(value) if isinstance(value, list) else np.float64(value)
+                for stat, value in stats.items()
+            }
+            for quantity, stats in summary.items()
+        }
+        for sex, summary in manifest['Summary'].items()
+    }
+
+    if 'Diagnostics' in manifest:
+        pop['Diagnostics'] = manifest['Diagnostics']
+
+    return pop
@@ -1,9 +1,10 @@
 import numpy as np
-from typing import Union
+from typing import Optional, Union
 
 
 def lognrnd0(mean: Union[float, np.ndarray],
-             coeffOfVar: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+             coeffOfVar: Union[float, np.ndarray],
+             rng: Optional[np.random.Generator] = None) -> Union[float, np.ndarray]:
     """
     Generates lognormally distributed random numbers based on the mean
     and coefficient of variation.
@@ -11,14 +12,16 @@ def lognrnd0(mean: Union[float, np.ndarray],
     Parameters:
     mean (float or np.ndarray): The mean of the distribution.
     coeffOfVar (float or np.ndarray): The coefficient of variation.
-    sizeOut (tuple): The shape of the output array. Default is (1, 1).
+    rng (np.random.Generator, optional): Source of random numbers. If None, the global NumPy random state is used.
 
     Returns:
     float or np.ndarray: Lognormally distributed random number(s).
     """
+    source = np.random if rng is None else rng
+
     sigma = np.sqrt(np.log(coeffOfVar**2. + 1.))
     mu = np.log(mean) - sigma**2. / 2.
-    samples = np.exp(np.random.randn(*mu.shape) * sigma + mu)
+    samples = np.exp(source.standard_normal(np.shape(mu)) * sigma + mu)
 
     if isinstance(samples, float):
         return samples
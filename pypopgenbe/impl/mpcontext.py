@@ -0,0 +1,43 @@
+import multiprocessing
+import threading
+from multiprocessing.context import BaseContext
+from typing import Optional
+
+# The module the forkserver imports once, so that each worker starts without importing it again
+_PRELOAD_MODULE = 'pypopgenbe.generatepop'
+
+_lock = threading.Lock()
+_context: Optional[BaseContext] = None
+
+
+def mp_context() -> BaseContext:
+    """
+    Returns the context that worker processes are started in: forkserver where the platform has it, and spawn
+    otherwise.
+
+    Pools are created from threads, such as those of an asyncio executor or a server, and forking a process
+    that has threads can leave a lock held forever in the child. The forkserver imports the generator once, so
+    each worker starts without importing it again. The forkserver is shared by the whole process, so the
+    generator is added to the modules it preloads, once, leaving any the application has set in place.
+
+    As with spawn, each worker imports the caller's main module, so a script that starts workers must do so
+    under `if __name__ == '__main__':`.
+
+    Returns:
+    BaseContext: The context to pass as the mp_context of a ProcessPoolExecutor, or to create a Manager from.
+    """
+    global _context
+
+    with _lock:
+        if _context is None:
+            if 'forkserver' in multiprocessing.get_all_start_methods():
+                from multiprocessing import forkserver
+                _context = multiprocessing.get_context('forkserver')
+                # Preloads are only set, not read, by the public API, and start as ['__main__']
+                preload = list(getattr(getattr(forkserver, '_forkserver', None), '_preload_modules', ['__main__']))
+                if _PRELOAD_MODULE not in preload:
+                    _context.set_forkserver_preload(preload + [_PRELOAD_MODULE])
+            else:
+                _context = multiprocessing.get_context('spawn')
+
+        return _context
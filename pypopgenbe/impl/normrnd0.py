@@ -1,9 +1,10 @@
 import numpy as np
-from typing import Union, cast
+from typing import Optional, Union, cast
 
 
 def normrnd0(mean: Union[float, np.ndarray],
-             coeffOfVar: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+             coeffOfVar: Union[float, np.ndarray],
+             rng: Optional[np.random.Generator] = None) -> Union[float, np.ndarray]:
     """
     Generates normally distributed random numbers based on the mean
     and coefficient of variation.
@@ -11,13 +12,15 @@ def normrnd0(mean: Union[float, np.ndarray],
     Parameters:
     mean (float or np.ndarray): The mean of the distribution.
     coeffOfVar (float or np.ndarray): The coefficient of variation.
-    sizeOut (tuple): The shape of the output array. Default is (1, 1).
+    rng (np.random.Generator, optional): Source of random numbers. If None, the global NumPy random state is used.
 
     Returns:
     np.ndarray: Array of normally distributed random numbers.
     """
+    source = np.random if rng is None else rng
+
     if isinstance(mean, float):
-        return (np.random.randn() * coeffOfVar + 1.) * mean
+        return (source.standard_normal() * coeffOfVar + 1.) * mean
 
     mean = cast(np.ndarray, mean)
-    return (np.random.randn(*mean.shape) * coeffOfVar + 1.) * mean
+    return (source.standard_normal(mean.shape) * coeffOfVar + 1.) * mean
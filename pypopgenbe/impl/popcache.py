@@ -0,0 +1,139 @@
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+import numpy as np
+from pypopgenbe.impl.loadpop import load_pop
+from pypopgenbe.impl.savepop import ARRAY_FILES, MANIFEST_FILE, save_pop
+
+# Seconds after which a directory left by an interrupted put or eviction is removed
+_STALE_SECONDS = 3600.
+
+
+class PopCache:
+    """
+    A directory of populations, each saved by save_pop under the hash of its inputs, whose total size is kept
+    under max_bytes by removing the least recently used.
+
+    Populations are memory-mapped when read, so a hit takes the same time whatever the size of the population.
+    Any number of threads and processes can share a cache: a population is saved to a temporary directory
+    and renamed into place, and removed by being renamed out of place first, so a reader either finds a whole
+    population or none. The last use of a population is the modification time of its manifest.
+
+    Example:
+    >>> cache = PopCache("./popcache", max_bytes=10 * 2**30)
+    >>> population, number_discarded = generate_pop(..., seed=42, cache=cache)
+    """
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int = 2**30):
+        """
+        Parameters:
+        directory (str or Path): The directory to keep the populations in. It is created if it does not exist.
+        max_bytes (int): The most bytes of populations to keep.
+        """
+        if max_bytes < 0:
+            raise ValueError(f"Maximum cache size must be non-negative: {max_bytes}")
+
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], int]]:
+        """
+        Loads a cached population and marks it as just used.
+
+        Parameters:
+        key (str): The hash of the inputs, from hash_inputs.
+
+        Returns:
+        Tuple[dict, int], optional: The population, with read-only memory-mapped arrays, and the number of
+        individuals discarded generating it, or None if it is not in the cache.
+        """
+        entry = self.directory / key
+        try:
+            pop = load_pop(entry, mmap=True)
+            os.utime(entry / MANIFEST_FILE)
+        except (OSError, ValueError):
+            # Not cached, or removed while being read
+            return None
+
+        return pop, sum(pop['Diagnostics']['Rejections'].values())
+
+    def put(self, key: str, pop: Dict[str, Any]):
+        """
+        Saves a population to the cache, then removes the least recently used populations until the cache fits in
+        max_bytes. A population larger than max_bytes is not saved.
+
+        Parameters:
+        key (str): The hash of the inputs, from hash_inputs.
+        pop (dict): A complete population created by generate_pop.
+        """
+        size = sum(np.asarray(pop[group][k]).size * 8 for group, k in ARRAY_FILES)
+        if size > self.max_bytes:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp_dir = tempfile.mkdtemp(prefix=f'.{key}.', suffix='.tmp', dir=self.directory)
+        try:
+            save_pop(pop, temp_dir)
+            os.rename(temp_dir, self.directory / key)
+        except OSError:
+            # Another thread or process cached the same population first
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        self._evict()
+
+    def clear(self):
+        """Removes every population from the cache."""
+        for entry in self._entries():
+            _remove(entry)
+
+    def _entries(self) -> List[Path]:
+        if not self.directory.is_dir():
+            return []
+
+        entries = []
+        for path in self.directory.iterdir():
+            if not path.name.startswith('.'):
+                entries.append(path)
+            elif _age(path) > _STALE_SECONDS:
+                shutil.rmtree(path, ignore_errors=True)
+        return entries
+
+    def _evict(self):
+        used = []
+        for entry in self._entries():
+            try:
+                last_used = (entry / MANIFEST_FILE).stat().st_mtime
+                size = sum(f.stat().st_size for f in entry.iterdir())
+            except OSError:
+                # Removed by another process
+                continue
+            used.append((last_used, size, entry))
+
+        total = sum(size for _, size, _ in used)
+        for _, size, entry in sorted(used):
+            if total <= self.max_bytes:
+                break
+            _remove(entry)
+            total -= size
+
+
+def _age(path: Path) -> float:
+    try:
+        return time.time() - path.stat().st_mtime
+    except OSError:
+        return 0.
+
+
+def _remove(entry: Path):
+    """Renames an entry out of place, so that no reader finds it half removed, then deletes it."""
+    doomed = entry.with_name(f'.{entry.name}.{uuid.uuid4().hex}.tmp')
+    try:
+        os.rename(entry, doomed)
+    except OSError:
+        # Already removed by another thread or process
+        return
+    shutil.rmtree(doomed, ignore_errors=True)
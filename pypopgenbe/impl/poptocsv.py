@@ -1,6 +1,6 @@
 import csv
 import io
-from typing import List
+from typing import List, Tuple
 import numpy as np
 
 
@@ -20,12 +20,19 @@ def interlace(list1, list2):
     return np.array([val for pair in zip(list1, list2) for val in pair])
 
 
-def pop_to_csv(pop: dict, delim=',') -> List[str]:
+def check_delim(delim: str):
+    """Raise if the delimiter cannot be used to separate fields."""
     if any(c in delim for c in ['"', "'", '`']):
         raise ValueError('DELIM cannot be a quote character')
 
-    lines = []
 
+def organ_columns(pop: dict) -> Tuple[List[str], List[int]]:
+    """
+    Names the interlaced tissue mass and flow columns, leaving out the liver total and lung bronchial masses.
+
+    Returns:
+    Tuple[List[str], List[int]]: Column names, and the indices of those columns among all interlaced columns.
+    """
     organ_names = pop['Tissues']['Names']
     organ_col_names = interlace(
         [f"{name} mass" for name in organ_names],
@@ -36,41 +43,22 @@ def pop_to_csv(pop: dict, delim=',') -> List[str]:
         organ_col_names) if name not in ['Liver Total mass', 'Lung Bronchial mass']]
     organ_col_names = [organ_col_names[i] for i in not_ltm_or_lbm_index]
 
-    headers = create_csv_string(['Individual No.'] + pop['Roots']['Names'] +
-                                organ_col_names + ['MPPGL'] + pop['Enzymes']['Names'], delim)
-    lines.append(headers)
+    return organ_col_names, not_ltm_or_lbm_index
 
-    n_people = pop['Tissues']['Values'].shape[0]
-    n_tissues = pop['Tissues']['Values'].shape[1]
-    temp = np.transpose(pop['Tissues']['Values'], (0, 2, 1))
-    tissues = temp.reshape((n_people, 2 * n_tissues))
-    tissues = tissues[:, interlace(
-        range(0, n_tissues), range(n_tissues, 2*n_tissues))]
-    tissues = tissues[:, not_ltm_or_lbm_index]
 
-    sex_names = [pop['Roots']['Sexes'][int(i)-1]
-                 for i in pop['Roots']['Values'][:, 1]]
-    ethnicity_names = [pop['Roots']['Ethnicities']
-                       [int(i)-1] for i in pop['Roots']['Values'][:, 2]]
+def column_names(pop: dict, organ_col_names: List[str]) -> List[str]:
+    """The name of each column of individuals."""
+    return ['Individual No.'] + list(pop['Roots']['Names']) + list(organ_col_names) + ['MPPGL'] + list(pop['Enzymes']['Names'])
 
-    contents = np.column_stack((
-        np.arange(1, n_people + 1),
-        pop['Roots']['Values'][:, 0],
-        sex_names,
-        ethnicity_names,
-        pop['Roots']['Values'][:, 3],
-        pop['Roots']['Values'][:, 4],
-        pop['Roots']['Values'][:, 5],
-        tissues,
-        pop['Enzymes']['MPPGLs'],
-        pop['Enzymes']['InVivoEnzymeRates']
-    ))
 
-    output = io.StringIO()
-    writer = csv.writer(output, delimiter=delim)
-    writer.writerows(contents)
-    output.seek(0)
-    lines = lines + [line.strip() for line in output]
+def header_line(pop: dict, organ_col_names: List[str], delim: str) -> str:
+    """The column headings line."""
+    return create_csv_string(column_names(pop, organ_col_names), delim)
+
+
+def summary_lines(pop: dict, not_ltm_or_lbm_index: List[int], delim: str) -> List[str]:
+    """One line per sex and summary stat."""
+    lines = []
 
     for sex in ['Male', 'Female']:
         for stat in ['Mean', 'StdDev', 'GeoMean', 'GeoStdDev', 'P2pt5', 'P5', 'Median', 'P95', 'P97pt5']:
@@ -86,6 +74,13 @@ def pop_to_csv(pop: dict, delim=',') -> List[str]:
                 ['', '', '', '', '', sex, stat] + [str(x) for x in all_stats], delim)
             lines.append(stat_string)
 
+    return lines
+
+
+def inputs_lines(pop: dict) -> List[str]:
+    """The lines recording the inputs the population was generated from."""
+    lines = []
+
     population = pop['Inputs']['Population']
     filter_ = pop['Inputs']['Filter']
     probability = pop['Inputs']['Probability']
@@ -116,3 +111,50 @@ def pop_to_csv(pop: dict, delim=',') -> List[str]:
     lines.append(f',Enzyme Rate,{units["EnzymeRate"]}')
 
     return lines
+
+
+def pop_to_csv(pop: dict, delim=',') -> List[str]:
+    check_delim(delim)
+
+    lines = []
+
+    organ_col_names, not_ltm_or_lbm_index = organ_columns(pop)
+
+    lines.append(header_line(pop, organ_col_names, delim))
+
+    n_people = pop['Tissues']['Values'].shape[0]
+    n_tissues = pop['Tissues']['Values'].shape[1]
+    temp = np.transpose(pop['Tissues']['Values'], (0, 2, 1))
+    tissues = temp.reshape((n_people, 2 * n_tissues))
+    tissues = tissues[:, interlace(
+        range(0, n_tissues), range(n_tissues, 2*n_tissues))]
+    tissues = tissues[:, not_ltm_or_lbm_index]
+
+    sex_names = [pop['Roots']['Sexes'][int(i)-1]
+                 for i in pop['Roots']['Values'][:, 1]]
+    ethnicity_names = [pop['Roots']['Ethnicities']
+                       [int(i)-1] for i in pop['Roots']['Values'][:, 2]]
+
+    contents = np.column_stack((
+        np.arange(1, n_people + 1),
+        pop['Roots']['Values'][:, 0],
+        sex_names,
+        ethnicity_names,
+        pop['Roots']['Values'][:, 3],
+        pop['Roots']['Values'][:, 4],
+        pop['Roots']['Values'][:, 5],
+        tissues,
+        pop['Enzymes']['MPPGLs'],
+        pop['Enzymes']['InVivoEnzymeRates']
+    ))
+
+    output = io.StringIO()
+    writer = csv.writer(output, delimiter=delim)
+    writer.writerows(contents)
+    output.seek(0)
+    lines = lines + [line.strip() for line in output]
+
+    lines += summary_lines(pop, not_ltm_or_lbm_index, delim)
+    lines += inputs_lines(pop)
+
+    return lines
@@ -0,0 +1,187 @@
+import json
+from typing import IO, Any, Dict, List, Optional, Union
+import numpy as np
+from pypopgenbe.impl.enum import OutputFormat
+from pypopgenbe.impl.poptocsv import check_delim, column_names, header_line, inputs_lines, interlace, organ_columns, summary_lines
+from pypopgenbe.impl.summaryaccumulator import SummaryAccumulator
+from pypopgenbe.impl.writepopcsv import format_csv_rows
+
+# Columns of the summary lines of the CSV layout, before the stats: five blanks, the sex and the stat
+_SUMMARY_LABEL_COLUMNS = 7
+
+_STAT_NAMES = ['Mean', 'StdDev', 'GeoMean', 'GeoStdDev', 'P2pt5', 'P5', 'Median', 'P95', 'P97pt5']
+
+
+class PopWriter:
+    """
+    Writes a population to a binary file handle chunk by chunk, such as the chunks yielded by iter_pop, with the
+    summary of the whole population at the end.
+
+    Only the chunk being written is held in memory. The summary is that of the population when it is written in
+    one chunk, and is otherwise accumulated by a SummaryAccumulator, so its percentiles are estimates once a sex
+    has more than `capacity` individuals.
+
+    The formats are:
+    - 'csv': The layout of write_pop_csv. Written in one chunk, the bytes are those of write_pop_csv.
+    - 'jsonl': One JSON object per individual, keyed by the CSV column names, then one object holding the
+      'Summary' and 'Inputs' of the population.
+    - 'npy': A sequence of .npy arrays, each read by calling np.load on the open file in turn: the column
+      names, a float array of each chunk's rows in those columns (with the sex and ethnicity as numbers, as in
+      population['Roots']), then the labels of the summary rows, a float array of the summary rows (the
+      first columns, which hold no stats, are nan), and a JSON string of the inputs.
+
+    Example:
+    >>> with gzip.open("pop.csv.gz", "wb") as f:
+    ...     writer = PopWriter(f)
+    ...     for chunk, _ in iter_pop(chunk_size=100000, **inputs):
+    ...         writer.write(chunk)
+    ...     writer.close()
+    """
+
+    def __init__(
+        self,
+        fh: IO[bytes],
+        output_format: Union[OutputFormat, str] = OutputFormat.Csv,
+        delim: str = ',',
+        float_format: Optional[str] = None,
+        capacity: int = 4096
+    ):
+        """
+        Parameters:
+        fh (IO[bytes]): A binary handle open for writing, such as a file, a gzip file or sys.stdout.buffer.
+        output_format (OutputFormat or str): 'csv', 'jsonl' or 'npy'.
+        delim (str): The single character separating CSV fields.
+        float_format (str, optional): A printf-style format for the CSV floating point fields, as for write_pop_csv.
+        capacity (int): Capacity of the percentile sketch of the summary accumulator.
+        """
+        check_delim(delim)
+        if len(delim) != 1:
+            raise TypeError('DELIM must be a 1-character string')
+
+        self.fh = fh
+        self.output_format = OutputFormat(output_format)
+        self.delim = delim
+        self.float_format = float_format
+        self.number_written = 0
+
+        self._accumulator = SummaryAccumulator(capacity)
+        self._number_of_chunks = 0
+        self._first_summary: Optional[Dict[str, Any]] = None
+        self._inputs: Optional[Dict[str, Any]] = None
+        self._not_ltm_or_lbm_index: List[int] = []
+        self._names: List[str] = []
+
+    def write(self, pop: Dict[str, Any]):
+        """
+        Writes the individuals of a population, or the next chunk of one.
+
+        Parameters:
+        pop (dict): A population created by generate_pop or a chunk yielded by iter_pop.
+        """
+        if self._number_of_chunks == 0:
+            organ_col_names, self._not_ltm_or_lbm_index = organ_columns(pop)
+            self._names = column_names(pop, organ_col_names)
+            self._first_summary = pop['Summary']
+            self._inputs = pop['Inputs']
+
+            if self.output_format == OutputFormat.Csv:
+                self._write_lines([header_line(pop, organ_col_names, self.delim)])
+            elif self.output_format == OutputFormat.Npy:
+                np.save(self.fh, np.array(self._names, dtype=str), allow_pickle=False)
+
+        first_individual = self.number_written + 1
+
+        if self.output_format == OutputFormat.Csv:
+            for lines in format_csv_rows(pop, self.delim, self.float_format, first_individual=first_individual):
+                self._write_lines(lines)
+        elif self.output_format == OutputFormat.Npy:
+            np.save(self.fh, self._row_values(pop, first_individual), allow_pickle=False)
+        else:
+            self._write_json_rows(pop, first_individual)
+
+        # As in generate_pop, columns of zeros, e.g. the liver total mass, have no geometric stats
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self._accumulator.update(pop)
+        self._number_of_chunks += 1
+        self.number_written += pop['Roots']['Values'].shape[0]
+
+    def close(self):
+        """Writes the summary and inputs of everything written. The file handle is left open."""
+        if self._number_of_chunks == 0:
+            return
+
+        # A population written in one chunk already has its exact summary
+        if self._number_of_chunks == 1:
+            summary = self._first_summary
+        else:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                summary = self._accumulator.summary()
+        footer_pop = {'Summary': summary, 'Inputs': self._inputs}
+
+        if self.output_format == OutputFormat.Csv:
+            self._write_lines(summary_lines(footer_pop, self._not_ltm_or_lbm_index, self.delim))
+            self._write_lines(inputs_lines(footer_pop))
+        elif self.output_format == OutputFormat.Npy:
+            labels = [f"{sex} {stat}" for sex in ['Male', 'Female'] for stat in _STAT_NAMES]
+            np.save(self.fh, np.array(labels, dtype=str), allow_pickle=False)
+            np.save(self.fh, self._summary_values(summary), allow_pickle=False)
+            np.save(self.fh, np.array(json.dumps(self._inputs, default=_to_json)), allow_pickle=False)
+        else:
+            text = json.dumps({'Summary': summary, 'Inputs': self._inputs}, default=_to_json)
+            self.fh.write((text + '\n').encode('utf-8'))
+
+    def _write_lines(self, lines: List[str]):
+        self.fh.write(''.join(line + '\n' for line in lines).encode('utf-8'))
+
+    def _row_values(self, pop: Dict[str, Any], first_individual: int) -> np.ndarray:
+        """The rows of individuals in the columns of the CSV layout, with the sex and ethnicity as numbers."""
+        tissues = pop['Tissues']['Values']
+        n_people = tissues.shape[0]
+        n_tissues = tissues.shape[1]
+        tissues = np.transpose(tissues, (0, 2, 1)).reshape((n_people, 2 * n_tissues))
+        tissue_columns = interlace(range(0, n_tissues), range(n_tissues, 2*n_tissues))[self._not_ltm_or_lbm_index]
+
+        return np.column_stack((
+            np.arange(first_individual, first_individual + n_people),
+            pop['Roots']['Values'],
+            tissues[:, tissue_columns],
+            pop['Enzymes']['MPPGLs'],
+            np.asarray(pop['Enzymes']['InVivoEnzymeRates']).reshape((n_people, -1))
+        )).astype(float)
+
+    def _write_json_rows(self, pop: Dict[str, Any], first_individual: int):
+        values = self._row_values(pop, first_individual).tolist()
+        sex_names = pop['Roots']['Sexes']
+        ethnicity_names = pop['Roots']['Ethnicities']
+
+        lines = []
+        for row in values:
+            record = dict(zip(self._names, row))
+            record['Individual No.'] = int(row[0])
+            record[self._names[2]] = sex_names[int(row[2]) - 1]
+            record[self._names[3]] = ethnicity_names[int(row[3]) - 1]
+            lines.append(json.dumps(record))
+        self._write_lines(lines)
+
+    def _summary_values(self, summary: Dict[str, Any]) -> np.ndarray:
+        """The stats of the summary lines of the CSV layout, in the columns of the rows."""
+        rows = []
+        for sex in ['Male', 'Female']:
+            for stat in _STAT_NAMES:
+                stats = summary[sex]
+                all_stats = interlace(np.ravel(stats['Mass'][stat]), np.ravel(stats['Flow'][stat]))
+                rows.append(np.concatenate((
+                    np.full(_SUMMARY_LABEL_COLUMNS, np.nan),
+                    all_stats[self._not_ltm_or_lbm_index],
+                    np.ravel(stats['MPPGL'][stat]),
+                    np.ravel(stats['InVivoEnzymeRate'][stat])
+                )))
+        return np.array(rows, dtype=float)
+
+
+def _to_json(x: Any) -> Any:
+    if isinstance(x, np.ndarray):
+        return x.tolist()
+    if isinstance(x, np.generic):
+        return x.item()
+    raise TypeError(f"Cannot write {type(x).__name__} as JSON")
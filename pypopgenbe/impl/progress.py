@@ -0,0 +1,32 @@
+from typing import NamedTuple
+from pypopgenbe.impl.enum import Stage
+
+
+class Progress(NamedTuple):
+    """
+    A report of how far the generation of a population has got, passed to the progress callback of generate_pop.
+
+    Attributes:
+    stage (Stage): What is being done: Sampling, Aggregation, Enzymes or Stats.
+    generated (int): Number of individuals accepted so far.
+    discarded (int): Number of candidates discarded so far.
+    population_size (int): Number of individuals requested.
+    acceptance_rate (float): Fraction of the candidates sampled so far that were accepted. nan before any are sampled.
+    individuals_per_second (float): Individuals accepted per second since generation started.
+    eta_seconds (float): Estimated seconds until the requested individuals have been accepted, at the rate so far.
+    Zero once they have or generation is cancelled, and nan before any individual is accepted.
+    elapsed_seconds (float): Seconds since generation started.
+    """
+    stage: Stage
+    generated: int
+    discarded: int
+    population_size: int
+    acceptance_rate: float
+    individuals_per_second: float
+    eta_seconds: float
+    elapsed_seconds: float
+
+    @property
+    def fraction_complete(self) -> float:
+        """Fraction of the requested individuals that have been accepted."""
+        return self.generated / self.population_size if self.population_size > 0 else 1.
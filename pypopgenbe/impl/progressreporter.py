@@ -0,0 +1,142 @@
+import math
+import time
+from typing import Any, Callable, Optional
+from pypopgenbe.impl.enum import Stage
+from pypopgenbe.impl.progress import Progress
+
+# Most seconds between checks of the cancel event, which may be a proxy to another process
+_CANCEL_CHECK_INTERVAL = 0.01
+
+
+class ProgressReporter:
+    """
+    Passes the progress of generate_pop to its callbacks, at most once per interval of time or fraction of the population.
+
+    Sampling calls update as often as it likes, after every candidate if need be: a report is only made when
+    `interval` seconds have passed since the last, or when another `fraction` of the population has been accepted,
+    so that a run reports regularly whether it is accepting candidates quickly, slowly or not at all. A change
+    of stage is always reported.
+
+    The structured `progress` callback receives a Progress, and the `callback` of two ints receives the numbers
+    generated and discarded, during sampling only. If either returns True during sampling, the reporter
+    remembers that generation was cancelled and update returns True from then on. The same happens once
+    `cancel_event` is set, which update checks every few milliseconds regardless of the reporting schedule.
+    """
+
+    def __init__(
+        self,
+        population_size: int,
+        callback: Optional[Callable[[int, int], bool]] = None,
+        progress: Optional[Callable[[Progress], bool]] = None,
+        interval: float = 0.5,
+        fraction: float = 0.05,
+        cancel_event: Optional[Any] = None
+    ):
+        """
+        Parameters:
+        population_size (int): Number of individuals requested.
+        callback (Callable[[int, int], bool], optional): Called with the numbers generated and discarded.
+        progress (Callable[[Progress], bool], optional): Called with a Progress.
+        interval (float): Most seconds between reports.
+        fraction (float): Most fraction of the population accepted between reports.
+        cancel_event (optional): An object with an is_set method, such as a threading.Event, that cancels generation once set.
+        """
+        self.population_size = population_size
+        self.callback = callback
+        self.progress = progress
+        self.interval = interval
+        self.cancel_event = cancel_event
+        self.is_cancelled = False
+
+        self._min_step = max(1, math.ceil(fraction * population_size))
+        self._stage = Stage.Sampling
+        self._generated = 0
+        self._discarded = 0
+        self._start_time = time.monotonic()
+        self._last_time = self._start_time
+        self._last_generated = 0
+        self._last_cancel_check = -math.inf
+
+    def update(self, generated: int, discarded: int) -> bool:
+        """
+        Records the numbers generated and discarded while sampling, and reports them if one is due.
+
+        Parameters:
+        generated (int): Number of individuals accepted so far.
+        discarded (int): Number of candidates discarded so far.
+
+        Returns:
+        bool: True if generation has been cancelled.
+        """
+        self._generated = generated
+        self._discarded = discarded
+
+        if self.is_cancelled:
+            return True
+
+        now = time.monotonic()
+        if self.cancel_event is not None and now - self._last_cancel_check >= _CANCEL_CHECK_INTERVAL:
+            self._last_cancel_check = now
+            if self.cancel_event.is_set():
+                self.is_cancelled = True
+                return True
+
+        if now - self._last_time < self.interval and generated - self._last_generated < self._min_step:
+            return False
+
+        return self._report(now)
+
+    def set_stage(self, stage: Stage) -> bool:
+        """
+        Moves on to the given stage and reports it.
+
+        Parameters:
+        stage (Stage): The stage starting.
+
+        Returns:
+        bool: True if generation has been cancelled.
+        """
+        self._stage = stage
+        return self._report(time.monotonic())
+
+    def _report(self, now: float) -> bool:
+        self._last_time = now
+        self._last_generated = self._generated
+
+        is_sampling = self._stage == Stage.Sampling
+        is_cancelled = False
+
+        if self.progress is not None:
+            is_cancelled = bool(self.progress(self._make_progress(now)))
+        if self.callback is not None and is_sampling:
+            is_cancelled = bool(self.callback(self._generated, self._discarded)) or is_cancelled
+
+        # Only sampling can be cancelled; the later stages finish whatever was sampled
+        if is_sampling and is_cancelled:
+            self.is_cancelled = True
+
+        return self.is_cancelled
+
+    def _make_progress(self, now: float) -> Progress:
+        generated = self._generated
+        number_of_candidates = generated + self._discarded
+        elapsed_seconds = now - self._start_time
+        individuals_per_second = generated / elapsed_seconds if elapsed_seconds > 0 else math.nan
+
+        if self.is_cancelled or generated >= self.population_size:
+            eta_seconds = 0.
+        elif generated > 0:
+            eta_seconds = (self.population_size - generated) / individuals_per_second
+        else:
+            eta_seconds = math.nan
+
+        return Progress(
+            stage=self._stage,
+            generated=generated,
+            discarded=self._discarded,
+            population_size=self.population_size,
+            acceptance_rate=generated / number_of_candidates if number_of_candidates > 0 else math.nan,
+            individuals_per_second=individuals_per_second,
+            eta_seconds=eta_seconds,
+            elapsed_seconds=elapsed_seconds
+        )
@@ -0,0 +1,146 @@
+import numpy as np
+from typing import Any, Dict, Optional, Tuple
+
+from pypopgenbe.impl.assignsex import assign_sex
+from pypopgenbe.impl.assignage import assign_age
+from pypopgenbe.impl.assignethnicity import assign_ethnicity
+from pypopgenbe.impl.assigntargetheight import assign_target_height
+from pypopgenbe.impl.assigntargetbodyweight import assign_target_body_weight
+from pypopgenbe.impl.calculatemass import calculate_mass
+from pypopgenbe.impl.calculatetargetorganmass import calculate_target_organ_mass
+from pypopgenbe.impl.varyorgans import vary_organs, vary_lognormal
+from pypopgenbe.impl.evaluateanthropometriccurves import evaluate_anthropometric_curves
+from pypopgenbe.impl.enum import Dataset, PopulationType
+
+
+def sample_candidates(
+    number_of_candidates: int,
+    dataset: Dataset,
+    population_type: PopulationType,
+    age_range: Tuple[float, float],
+    bmi_range: Tuple[float, float],
+    height_range: Tuple[float, float],
+    prob_of_male: float,
+    ethnicity_breaks: Optional[np.ndarray],
+    curves: Dict[str, Any],
+    variation: Dict[str, np.ndarray],
+    CONSTS: Dict[str, Any],
+    rng: np.random.Generator
+) -> Dict[str, np.ndarray]:
+    """
+    Samples a batch of candidate individuals and tests whether each lies within the target population.
+
+    This is the array counterpart of the body of the per-individual loop in generatepop: every
+    candidate is drawn, scaled and varied in the same way, then the negative mass, minimum adipose
+    fraction and BMI tests are applied as boolean masks.
+
+    Parameters:
+    number_of_candidates (int): Number of candidates to sample.
+    dataset (Dataset): The dataset to take height and body weight curves from.
+    population_type (PopulationType): Either 'Realistic' or 'HighVariation'.
+    age_range (Tuple[float, float]): Lower and upper age limits in years.
+    bmi_range (Tuple[float, float]): Lower and upper BMI limits in kg/m^2.
+    height_range (Tuple[float, float]): Lower and upper height limits in cm.
+    prob_of_male (float): Probability of a candidate being male.
+    ethnicity_breaks (np.ndarray, optional): Break points created by create_ethnicity_breaks. None for NDNS.
+    curves (Dict[str, Any]): Curves created by compile_anthropometric_curves.
+    variation (Dict[str, np.ndarray]): Organ mass variation created by compile_organ_variation.
+    CONSTS (Dict[str, Any]): Constants loaded from popgenconsts.pkl.
+    rng (np.random.Generator): Source of random numbers.
+
+    Returns:
+    Dict[str, np.ndarray]: Per-candidate arrays 'Age', 'Sex', 'Ethnicity', 'BodyWeight', 'Height',
+    'ScaledHeight', 'MeanCardiacOutput', 'OrganMass' (n x base tissues), the boolean results of each test,
+    'IsPositive', 'IsAdiposeOk' and 'IsBmiOk', and 'IsAccepted', which is True where all three pass.
+    """
+    n = number_of_candidates
+    index = CONSTS["INDEX"]
+
+    # Assign personal details
+    sexes = assign_sex(prob_of_male, n, rng)
+    ages = assign_age(population_type, age_range, n, rng)
+
+    if dataset == Dataset.NDNS:
+        ethnicities = np.ones(n, dtype=int)
+    else:
+        ethnicities = assign_ethnicity(ethnicity_breaks, n, rng)  # type: ignore
+
+    # Assign mean BodyWeight, Height and BMI
+    (
+        mean_heights,
+        mean_body_weights,
+        mean_body_weights_at_maturity,
+        mean_cardiac_outputs
+    ) = evaluate_anthropometric_curves(curves, dataset, ages, sexes, ethnicities)
+
+    # Scaling of individual Mass
+    body_weight_range = (
+        calculate_mass(bmi_range[0], height_range[0]),
+        calculate_mass(bmi_range[1], height_range[1])
+    )
+    coeffs_of_var_height = np.take(CONSTS["COEFF_OF_VAR"]["Height"], sexes - 1)
+    coeffs_of_var_body_weight = np.take(CONSTS["COEFF_OF_VAR"]["BodyWeight"], sexes - 1)
+    target_heights = assign_target_height(
+        population_type,
+        height_range,
+        mean_heights,
+        coeffs_of_var_height,
+        rng
+    )
+    target_body_weights = assign_target_body_weight(
+        population_type,
+        body_weight_range,
+        mean_body_weights,
+        coeffs_of_var_body_weight,
+        rng
+    )
+
+    scaled_heights, organ_masses = calculate_target_organ_mass(
+        ages,
+        sexes,
+        ethnicities,
+        CONSTS["KEY"]["Ethnicity"][dataset.name],
+        mean_body_weights_at_maturity,
+        mean_heights,
+        target_body_weights,
+        target_heights,
+        np.take(CONSTS["ORGAN"]["Mass"]["Mean"], sexes - 1, axis=0),
+        index
+    )
+
+    # Add stochastic variation
+    organ_masses = vary_organs(organ_masses, sexes, variation, rng)
+
+    # The mean adipose is wrong after adding stocastic variation. Recalculate.
+    # Ensure mean adipose is greater than zero
+    adipose_means = target_body_weights - \
+        (np.sum(organ_masses, axis=1) - organ_masses[:, index["Adipose"]])
+    adipose_means = np.maximum(adipose_means, 0.01)
+
+    # Get stochastic variation of the adipose and overwrite it
+    organ_masses[:, index["Adipose"]] = vary_lognormal(adipose_means, 0.42, rng)
+
+    # Check whether candidates lie within target pop
+    is_positive = np.all(organ_masses > 0, axis=1)
+
+    body_weights = np.sum(organ_masses, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        is_adipose_ok = organ_masses[:, index["Adipose"]] / body_weights > CONSTS["MIN_ADIPOSE_FRACTION"]
+        body_mass_indices = body_weights / (0.01 * target_heights) ** 2.
+    is_bmi_ok = (target_heights > 0) & \
+        (bmi_range[0] <= body_mass_indices) & (body_mass_indices <= bmi_range[1])
+
+    return {
+        "Age": ages,
+        "Sex": sexes,
+        "Ethnicity": ethnicities,
+        "BodyWeight": body_weights,
+        "Height": target_heights,
+        "ScaledHeight": scaled_heights,
+        "MeanCardiacOutput": mean_cardiac_outputs,
+        "OrganMass": organ_masses,
+        "IsPositive": is_positive,
+        "IsAdiposeOk": is_adipose_ok,
+        "IsBmiOk": is_bmi_ok,
+        "IsAccepted": is_positive & is_adipose_ok & is_bmi_ok
+    }
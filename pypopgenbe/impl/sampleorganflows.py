@@ -0,0 +1,40 @@
+import numpy as np
+from typing import Any, Dict, Tuple
+from pypopgenbe.impl.varyorgans import vary_organs
+
+
+def sample_organ_flows(
+    sexes: np.ndarray,
+    scaled_heights: np.ndarray,
+    mean_cardiac_outputs: np.ndarray,
+    variation: Dict[str, np.ndarray],
+    CONSTS: Dict[str, Any],
+    rng: np.random.Generator
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Scales and varies the organ flows for a batch of accepted individuals.
+
+    Parameters:
+    sexes (np.ndarray): Sex of each individual (1=male, 2=female).
+    scaled_heights (np.ndarray): Allometrically scaled heights from the organ mass calculation.
+    mean_cardiac_outputs (np.ndarray): Mean cardiac output for each individual's age and sex.
+    variation (Dict[str, np.ndarray]): Organ flow variation created by compile_organ_variation.
+    CONSTS (Dict[str, Any]): Constants loaded from popgenconsts.pkl.
+    rng (np.random.Generator): Source of random numbers.
+
+    Returns:
+    Tuple[np.ndarray, np.ndarray]: Organ flows (n x base tissues) and the cardiac outputs consistent with them.
+    """
+    target_cardiac_outputs = scaled_heights * mean_cardiac_outputs
+    organ_flows = np.take(CONSTS["ORGAN"]["Flow"]["Mean"], sexes - 1, axis=0) * \
+        target_cardiac_outputs[:, np.newaxis]
+
+    organ_flows = vary_organs(organ_flows, sexes, variation, rng)
+
+    lung = CONSTS["INDEX"]["Lung"]
+    target_cardiac_outputs = np.sum(organ_flows, axis=1) - organ_flows[:, lung]
+
+    # Ensure Lung Flow and CO are consistent
+    organ_flows[:, lung] = target_cardiac_outputs
+
+    return organ_flows, target_cardiac_outputs
@@ -0,0 +1,63 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Union
+import numpy as np
+
+POP_FORMAT_VERSION = 1
+
+MANIFEST_FILE = 'manifest.json'
+
+# The .npy file holding each array of the population
+ARRAY_FILES = {
+    ('Roots', 'Values'): 'RootsValues.npy',
+    ('Tissues', 'Values'): 'TissuesValues.npy',
+    ('Enzymes', 'MPPGLs'): 'EnzymesMPPGLs.npy',
+    ('Enzymes', 'InVivoEnzymeRates'): 'EnzymesInVivoEnzymeRates.npy'
+}
+
+
+def save_pop(pop: Dict[str, Any], directory: Union[str, Path]):
+    """
+    Saves a population to a directory, to be read back with load_pop.
+
+    Each array is written to its own .npy file in Fortran order, so that any one column of it, e.g. the liver
+    masses, is a contiguous run of the file. Everything else (names, units, Inputs, Summary and Diagnostics) is written to
+    manifest.json. Any existing manifest is removed before the arrays are written, and the new one is renamed into
+    place after them, so that an interrupted save, or an interrupted overwrite, is not mistaken for a complete one.
+
+    Parameters:
+    pop (dict): A population created by generate_pop.
+    directory (str or Path): The directory to save to. It is created if it does not exist; existing files are overwritten.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    manifest: Dict[str, Any] = {'Version': POP_FORMAT_VERSION}
+    for group in ['Roots', 'Tissues', 'Enzymes']:
+        manifest[group] = {
+            k: v for k, v in pop[group].items() if (group, k) not in ARRAY_FILES
+        }
+    manifest['Inputs'] = pop['Inputs']
+    manifest['Summary'] = pop['Summary']
+    if 'Diagnostics' in pop:
+        manifest['Diagnostics'] = pop['Diagnostics']
+
+    manifest_path = directory / MANIFEST_FILE
+    manifest_path.unlink(missing_ok=True)
+
+    for (group, key), file_name in ARRAY_FILES.items():
+        np.save(directory / file_name, np.asfortranarray(pop[group][key], dtype=float))
+
+    temp_path = manifest_path.with_name(f'.{MANIFEST_FILE}.tmp')
+    with open(temp_path, 'w') as f:
+        json.dump(manifest, f, indent=1, default=_to_json)
+    os.replace(temp_path, manifest_path)
+
+
+def _to_json(x: Any) -> Any:
+    if isinstance(x, np.ndarray):
+        return x.tolist()
+    if isinstance(x, np.generic):
+        return x.item()
+    raise TypeError(f"Cannot save {type(x).__name__} to the manifest")
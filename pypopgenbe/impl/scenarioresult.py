@@ -0,0 +1,17 @@
+from typing import Any, Dict, NamedTuple, Optional
+
+
+class ScenarioResult(NamedTuple):
+    """
+    The outcome of one scenario run by generate_pops.
+
+    Attributes:
+    scenario_index (int): Position of the scenario in the list given to generate_pops.
+    population (dict, optional): The population, as returned by generate_pop. None if the scenario failed.
+    number_of_individuals_discarded (int, optional): As returned by generate_pop. None if the scenario failed.
+    error (BaseException, optional): The exception raised by the scenario, or None if it succeeded.
+    """
+    scenario_index: int
+    population: Optional[Dict[str, Any]]
+    number_of_individuals_discarded: Optional[int]
+    error: Optional[BaseException]
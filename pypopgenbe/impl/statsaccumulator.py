@@ -0,0 +1,257 @@
+import numpy as np
+from typing import Dict, List, Optional, Tuple, cast
+from pypopgenbe.impl.generatestats import generate_stats
+
+PERCENTILES = (2.5, 5., 50., 95., 97.5)
+PERCENTILE_NAMES = ('P2pt5', 'P5', 'Median', 'P95', 'P97pt5')
+
+
+class StatsAccumulator:
+    """
+    Accumulates the summary stats of generate_stats chunk by chunk, in memory that does not grow with the number of rows.
+
+    Mean and StdDev are accumulated with Welford's (Chan's) update, and GeoMean and GeoStdDev with the same update
+    applied to the logs of the positive values; as for generate_stats, a column containing zeros has a GeoMean of
+    zero and any negative value makes both geometric stats nan.
+
+    Percentiles come from a mergeable compactor sketch. Rows are kept exactly until `capacity` of them have been
+    seen, and until then the stats are exactly those of generate_stats. Beyond that, each full level of the sketch
+    is sorted and every other value promoted to the next level with double the weight. A compaction at level h
+    moves the rank of any value by at most 2^h, so each reported percentile has a rank within
+    rank_error_bound() * count of the requested one. This bound is at most L / capacity, where L is the number
+    of levels, i.e. roughly log2(count / capacity) + 1.
+
+    Accumulators that have seen different rows of the same columns can be combined with merge, for example
+    when chunks are summarised by parallel workers. The result depends only on the rows seen and the order
+    of updates and merges, so it is reproducible.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        """
+        Parameters:
+        capacity (int): Number of values per column held by each level of the percentile sketch. Must be even and at least 2.
+        """
+        if capacity < 2 or capacity % 2 != 0:
+            raise ValueError(f"Capacity must be an even number of at least 2: {capacity}")
+
+        self.capacity = capacity
+        self.count = 0
+
+        self._ndim: Optional[int] = None
+        self._n_cols: Optional[int] = None
+
+        self._mean = np.zeros(0)
+        self._m2 = np.zeros(0)
+
+        self._log_count = np.zeros(0)
+        self._log_mean = np.zeros(0)
+        self._log_m2 = np.zeros(0)
+        self._zero_count = np.zeros(0)
+        self._invalid_count = np.zeros(0)
+
+        self._levels: List[np.ndarray] = []
+        self._compactions: List[int] = []
+
+    def update(self, x: np.ndarray) -> 'StatsAccumulator':
+        """
+        Adds rows to the accumulator.
+
+        Parameters:
+        x (np.ndarray): Values of shape (n_rows, n_cols), or (n_rows,) for a single column.
+
+        Returns:
+        StatsAccumulator: This accumulator.
+        """
+        x = np.asarray(x, dtype=float)
+        n_cols = x.shape[1] if x.ndim == 2 else 1
+        self._initialise(x.ndim, n_cols)
+        x = x.reshape(x.shape[0], n_cols)
+
+        n = x.shape[0]
+        if n == 0:
+            return self
+
+        mean = np.mean(x, axis=0)
+        m2 = np.sum((x - mean)**2, axis=0)
+        self._mean, self._m2 = _combine(self.count, self._mean, self._m2, n, mean, m2)
+
+        is_positive = x > 0
+        log_count = np.sum(is_positive, axis=0)
+        logs = np.log(np.where(is_positive, x, 1.))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            log_mean = np.where(log_count > 0, np.sum(logs, axis=0) / log_count, 0.)
+        log_m2 = np.sum(np.where(is_positive, logs - log_mean, 0.)**2, axis=0)
+        self._log_mean, self._log_m2 = _combine(
+            self._log_count, self._log_mean, self._log_m2, log_count, log_mean, log_m2)
+        self._log_count = self._log_count + log_count
+
+        self._zero_count = self._zero_count + np.sum(x == 0, axis=0)
+        self._invalid_count = self._invalid_count + np.sum(~(x >= 0), axis=0)
+
+        self.count += n
+
+        self._levels[0] = np.concatenate((self._levels[0], x))
+        self._compact()
+
+        return self
+
+    def merge(self, other: 'StatsAccumulator') -> 'StatsAccumulator':
+        """
+        Adds the rows seen by another accumulator of the same columns.
+
+        Parameters:
+        other (StatsAccumulator): The accumulator to merge. It is left unchanged.
+
+        Returns:
+        StatsAccumulator: This accumulator.
+        """
+        if other._ndim is None:
+            return self
+        self._initialise(other._ndim, cast(int, other._n_cols))
+        if other.count == 0:
+            return self
+
+        self._mean, self._m2 = _combine(self.count, self._mean, self._m2, other.count, other._mean, other._m2)
+        self._log_mean, self._log_m2 = _combine(
+            self._log_count, self._log_mean, self._log_m2, other._log_count, other._log_mean, other._log_m2)
+        self._log_count = self._log_count + other._log_count
+        self._zero_count = self._zero_count + other._zero_count
+        self._invalid_count = self._invalid_count + other._invalid_count
+        self.count += other.count
+
+        for h, level in enumerate(other._levels):
+            if h == len(self._levels):
+                self._levels.append(np.empty((0, level.shape[1])))
+                self._compactions.append(0)
+            self._levels[h] = np.concatenate((self._levels[h], level))
+            self._compactions[h] += other._compactions[h]
+        self._compact()
+
+        return self
+
+    def is_exact(self) -> bool:
+        """Returns True while every row is still held, so that the stats are exactly those of generate_stats."""
+        return sum(self._compactions) == 0
+
+    def rank_error_bound(self) -> float:
+        """
+        Returns the largest possible error in the rank of any reported percentile, as a fraction of the count.
+
+        Returns:
+        float: Zero while the accumulator is exact.
+        """
+        if self.count == 0:
+            return 0.
+        return sum(c * 2**h for h, c in enumerate(self._compactions)) / self.count
+
+    def stats(self) -> Dict[str, np.ndarray]:
+        """
+        Returns the summary stats of all rows seen, in the form returned by generate_stats.
+
+        Returns:
+        dict: Mean, StdDev, GeoMean, GeoStdDev, P2pt5, P5, Median, P95 and P97pt5 of each column.
+        """
+        if self._ndim is None:
+            raise ValueError("No values have been added to the accumulator")
+
+        if self.is_exact():
+            values = self._levels[0]
+            return generate_stats(values[:, 0] if self._ndim == 1 else values)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std_dev = np.sqrt(self._m2 / (self.count - 1))
+            geo_mean = np.exp(self._log_mean)
+            geo_std_dev = np.exp(np.sqrt(self._log_m2 / self._log_count))
+        geo_mean = np.where(self._zero_count > 0, 0., geo_mean)
+        geo_std_dev = np.where(self._zero_count > 0, np.nan, geo_std_dev)
+        is_invalid = self._invalid_count > 0
+        geo_mean = np.where(is_invalid, np.nan, geo_mean)
+        geo_std_dev = np.where(is_invalid, np.nan, geo_std_dev)
+
+        stats = {
+            'Mean': self._mean,
+            'StdDev': std_dev,
+            'GeoMean': geo_mean,
+            'GeoStdDev': geo_std_dev
+        }
+        for name, prc in zip(PERCENTILE_NAMES, self._percentiles(PERCENTILES)):
+            stats[name] = prc
+
+        if self._ndim == 1:
+            return {name: value[0] for name, value in stats.items()}
+
+        return stats
+
+    def _initialise(self, ndim: int, n_cols: int):
+        if ndim not in (1, 2):
+            raise ValueError(f"Expecting a 1 or 2 dimensional array, not {ndim} dimensions")
+
+        if self._ndim is None:
+            self._ndim = ndim
+            self._n_cols = n_cols
+            zeros = np.zeros(n_cols)
+            self._mean = zeros
+            self._m2 = zeros
+            self._log_count = zeros
+            self._log_mean = zeros
+            self._log_m2 = zeros
+            self._zero_count = zeros
+            self._invalid_count = zeros
+            self._levels = [np.empty((0, n_cols))]
+            self._compactions = [0]
+        elif ndim != self._ndim or n_cols != self._n_cols:
+            raise ValueError(f"Expecting {self._n_cols} columns in {self._ndim} dimensions")
+
+    def _compact(self):
+        h = 0
+        while h < len(self._levels):
+            level = self._levels[h]
+            if level.shape[0] >= self.capacity:
+                level = np.sort(level, axis=0)
+                m = level.shape[0] - level.shape[0] % 2
+                # Alternate which half is promoted so that repeated compactions do not bias the sketch
+                offset = self._compactions[h] % 2
+                promoted = level[offset:m:2]
+                self._levels[h] = level[m:]
+                self._compactions[h] += 1
+                if h + 1 == len(self._levels):
+                    self._levels.append(np.empty((0, level.shape[1])))
+                    self._compactions.append(0)
+                self._levels[h + 1] = np.concatenate((self._levels[h + 1], promoted))
+            h += 1
+
+    def _percentiles(self, percentiles: Tuple[float, ...]) -> np.ndarray:
+        values = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(level.shape[0], 2.**h) for h, level in enumerate(self._levels)])
+
+        order = np.argsort(values, axis=0)
+        values = np.take_along_axis(values, order, axis=0)
+        weights = weights[order]
+
+        # Each retained value stands for `weight` rows; place it at the middle of the ranks it covers
+        cumulative_weights = np.cumsum(weights, axis=0)
+        ranks = cumulative_weights - 0.5 * weights
+        targets = np.asarray(percentiles) / 100. * self.count
+
+        return np.stack([
+            np.interp(targets, ranks[:, j], values[:, j])
+            for j in range(values.shape[1])
+        ], axis=1)
+
+
+def _combine(
+    n_a: np.ndarray,
+    mean_a: np.ndarray,
+    m2_a: np.ndarray,
+    n_b: np.ndarray,
+    mean_b: np.ndarray,
+    m2_b: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Combines the means and sums of squared deviations of two sets of rows (Chan et al., 1979)."""
+    n = np.asarray(n_a + n_b, dtype=float)
+    delta = mean_b - mean_a
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fraction_b = np.where(n > 0, n_b / n, 0.)
+    mean = mean_a + delta * fraction_b
+    m2 = m2_a + m2_b + delta**2 * n_a * fraction_b
+    return mean, m2
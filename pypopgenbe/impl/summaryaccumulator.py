@@ -0,0 +1,88 @@
+import numpy as np
+from typing import Any, Dict
+from pypopgenbe.impl.statsaccumulator import StatsAccumulator
+
+SUMMARY_FIELDS = ("Mass", "Flow", "MPPGL", "InVivoEnzymeRate")
+
+
+class SummaryAccumulator:
+    """
+    Accumulates the Summary block of a population from chunks, such as those yielded by iter_pop.
+
+    One StatsAccumulator is kept for each sex and each of the tissue masses, tissue flows, MPPGLs and in-vivo
+    enzyme rates, so memory does not grow with the number of individuals. While fewer than `capacity`
+    individuals of a sex have been seen, their summary is exactly that of generate_pop.
+
+    Example:
+    >>> accumulator = SummaryAccumulator()
+    >>> for chunk, _ in iter_pop(chunk_size=100000, **inputs):
+    ...     accumulator.update(chunk)
+    >>> summary = accumulator.summary()
+    """
+
+    def __init__(self, capacity: int = 4096):
+        """
+        Parameters:
+        capacity (int): Capacity of the percentile sketch of each StatsAccumulator.
+        """
+        self.capacity = capacity
+        self._accumulators: Dict[str, Dict[str, StatsAccumulator]] = {}
+
+    def update(self, population: Dict[str, Any]) -> 'SummaryAccumulator':
+        """
+        Adds the individuals of a population, or a chunk of one.
+
+        Parameters:
+        population (Dict[str, Any]): Population returned by generate_pop or yielded by iter_pop.
+
+        Returns:
+        SummaryAccumulator: This accumulator.
+        """
+        sexes = population["Roots"]["Values"][:, population["Roots"]["Names"].index("Sex")]
+        tissues = population["Tissues"]["Values"]
+        properties = population["Tissues"]["Properties"]
+
+        for code, sex_name in enumerate(population["Roots"]["Sexes"], start=1):
+            is_sex = sexes == code
+            values = {
+                "Mass": tissues[is_sex, :, properties.index("Mass")],
+                "Flow": tissues[is_sex, :, properties.index("Flow")],
+                "MPPGL": population["Enzymes"]["MPPGLs"][is_sex],
+                "InVivoEnzymeRate": population["Enzymes"]["InVivoEnzymeRates"][is_sex, :]
+            }
+            accumulators = self._accumulators.setdefault(
+                sex_name, {field: StatsAccumulator(self.capacity) for field in SUMMARY_FIELDS})
+            for field in SUMMARY_FIELDS:
+                accumulators[field].update(values[field])
+
+        return self
+
+    def merge(self, other: 'SummaryAccumulator') -> 'SummaryAccumulator':
+        """
+        Adds the individuals seen by another accumulator, for example one filled by a parallel worker.
+
+        Parameters:
+        other (SummaryAccumulator): The accumulator to merge. It is left unchanged.
+
+        Returns:
+        SummaryAccumulator: This accumulator.
+        """
+        for sex_name, others in other._accumulators.items():
+            accumulators = self._accumulators.setdefault(
+                sex_name, {field: StatsAccumulator(self.capacity) for field in SUMMARY_FIELDS})
+            for field in SUMMARY_FIELDS:
+                accumulators[field].merge(others[field])
+
+        return self
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, np.ndarray]]]:
+        """
+        Returns the summary stats of every individual seen, structured as population["Summary"].
+
+        Returns:
+        dict: Stats by sex name, then by 'Mass', 'Flow', 'MPPGL' and 'InVivoEnzymeRate'.
+        """
+        return {
+            sex_name: {field: accumulators[field].stats() for field in SUMMARY_FIELDS}
+            for sex_name, accumulators in self._accumulators.items()
+        }
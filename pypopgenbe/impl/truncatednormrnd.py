@@ -1,27 +1,67 @@
-from typing import cast
-from scipy.stats import norm, uniform
+import numpy as np
+from typing import Optional, Union
 
 
-def truncated_norm_rnd(mu: float, sigma: float,
-                       lower: float, upper: float) -> float:
+def truncated_norm_rnd(
+    mu: Union[float, np.ndarray],
+    sigma: Union[float, np.ndarray],
+    lower: Union[float, np.ndarray],
+    upper: Union[float, np.ndarray],
+    rng: Optional[np.random.Generator] = None
+) -> Union[float, np.ndarray]:
     """
     Generate random numbers from a truncated normal distribution.
 
+    Samples by inverting the normal CDF between the CDF values of the bounds. The inversion is
+    done in log space with the scipy.special ufuncs, and intervals lying above the mean are
+    reflected into the lower tail first, so that bounds many standard deviations from the mean
+    do not lose precision or collapse onto a single value.
+
     Parameters:
-    mu (float): Mean of the normal distribution.
-    sigma (float): Standard deviation of the normal distribution.
-    lower (float): Lower truncation bound.
-    upper (float): Upper truncation bound.
+    mu (float or np.ndarray): Mean of the normal distribution.
+    sigma (float or np.ndarray): Standard deviation of the normal distribution.
+    lower (float or np.ndarray): Lower truncation bound.
+    upper (float or np.ndarray): Upper truncation bound.
+    rng (np.random.Generator, optional): Source of random numbers. If None, the global NumPy random state is used.
 
     Returns:
-    float: Random number from the truncated normal distribution.
+    float or np.ndarray: Random number(s) from the truncated normal distribution, broadcast over the inputs.
     """
+    # Imported on first use, as scipy.special takes longer to import than the rest of the package
+    from scipy.special import log_ndtr, ndtri_exp
+
+    mu, sigma, lower, upper = np.broadcast_arrays(
+        np.asarray(mu, dtype=float),
+        np.asarray(sigma, dtype=float),
+        np.asarray(lower, dtype=float),
+        np.asarray(upper, dtype=float)
+    )
+
+    source = np.random if rng is None else rng
+    u = np.asarray(source.random(mu.shape if mu.ndim > 0 else None))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        a = (lower - mu) / sigma
+        b = (upper - mu) / sigma
+
+        # Work in whichever tail keeps the interval below zero, where the CDF has full relative precision
+        is_reflected = a > 0.
+        a, b = np.where(is_reflected, -b, a), np.where(is_reflected, -a, b)
+
+        # log(Phi(a) + u * (Phi(b) - Phi(a))) = log Phi(b) + log(u + (1 - u) * Phi(a) / Phi(b))
+        log_pa = log_ndtr(a)
+        log_pb = log_ndtr(b)
+        log_q = log_pb + np.log(u + (1. - u) * np.exp(log_pa - log_pb))
+        z = ndtri_exp(np.minimum(log_q, 0.))
+
+    z = np.where(is_reflected, -z, z)
+    r = mu + sigma * z
 
-    # Calculate the CDF bounds
-    bounds = norm.cdf([lower, upper], mu, sigma)
+    # Degenerate cases (zero sigma or zero-width intervals) fall back onto the clipped mean
+    r = np.where(np.isfinite(r), r, np.clip(mu, lower, upper))
+    r = np.clip(r, lower, upper)
 
-    # Sample uniformly within the CDF bounds and transform back to normal
-    quantile = uniform.rvs(bounds[0], bounds[1] - bounds[0])
-    r = norm.ppf(quantile, mu, sigma)
+    if r.ndim == 0:
+        return float(r)
 
-    return cast(float, r)
+    return r
@@ -1,14 +1,20 @@
 import numpy as np
+from typing import Optional
 from pypopgenbe.impl.normrnd0 import normrnd0
 
 
-def vary_in_vitro_enzyme_rates(in_vitro_enzyme_rates: np.ndarray, in_vitro_enzyme_rate_coeffs_of_var: np.ndarray):
+def vary_in_vitro_enzyme_rates(
+    in_vitro_enzyme_rates: np.ndarray,
+    in_vitro_enzyme_rate_coeffs_of_var: np.ndarray,
+    rng: Optional[np.random.Generator] = None
+):
     """
     Adds normally distributed variation to the in-vitro enzyme rates.
 
     Parameters:
     in_vitro_enzyme_rates (np.ndarray): The in-vitro enzyme rates.
     in_vitro_enzyme_rate_coeffs_of_var (np.ndarray): The coefficients of variation for the in-vitro enzyme rates.
+    rng (np.random.Generator, optional): Source of random numbers. If None, the global NumPy random state is used.
 
     Returns:
     None.
@@ -21,5 +27,6 @@ def vary_in_vitro_enzyme_rates(in_vitro_enzyme_rates: np.ndarray, in_vitro_enzym
 
     in_vitro_enzyme_rates[to_vary] = normrnd0(
         in_vitro_enzyme_rates[to_vary],
-        in_vitro_enzyme_rate_coeffs_of_var[to_vary]
+        in_vitro_enzyme_rate_coeffs_of_var[to_vary],
+        rng
     )
@@ -0,0 +1,65 @@
+import numpy as np
+from typing import Dict, Optional
+
+
+def vary_organs(
+    targets: np.ndarray,
+    sexes: np.ndarray,
+    variation: Dict[str, np.ndarray],
+    rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """
+    Adds stochastic variation to the organ masses or flows of many individuals with a single random draw.
+
+    Normally distributed tissues become target * (1 + cv * z); lognormally distributed tissues become
+    exp(log(target) - sigma^2 / 2 + sigma * z), so that their mean is the target. As for lognrnd0,
+    a lognormal tissue with a negative target becomes nan.
+
+    Parameters:
+    targets (np.ndarray): Target organ masses or flows, shaped (individual, tissue).
+    sexes (np.ndarray): Sex of each individual (1=male, 2=female).
+    variation (Dict[str, np.ndarray]): Parameters created by compile_organ_variation.
+    rng (np.random.Generator, optional): Source of random numbers. If None, the global NumPy random state is used.
+
+    Returns:
+    np.ndarray: Varied organ masses or flows, shaped as targets.
+    """
+    source = np.random if rng is None else rng
+    z = source.standard_normal(targets.shape)
+
+    s = np.asarray(sexes, dtype=int) - 1
+    sigma = variation["Sigma"][s]
+
+    normal = targets * (1. + sigma * z)
+    if not np.any(variation["IsLognormal"]):
+        return normal
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lognormal = np.exp(np.log(targets) - 0.5 * sigma**2 + sigma * z)
+
+    return np.where(variation["IsLognormal"][s], lognormal, normal)
+
+
+def vary_lognormal(
+    means: np.ndarray,
+    coeff_of_var: float,
+    rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """
+    Draws one lognormal variate per mean with a shared coefficient of variation.
+
+    This is the array form of lognrnd0 used to re-draw adipose once the other organs have been varied.
+
+    Parameters:
+    means (np.ndarray): Means of the distributions.
+    coeff_of_var (float): Coefficient of variation shared by all distributions.
+    rng (np.random.Generator, optional): Source of random numbers. If None, the global NumPy random state is used.
+
+    Returns:
+    np.ndarray: Lognormally distributed random numbers, shaped as means.
+    """
+    source = np.random if rng is None else rng
+    sigma = np.sqrt(np.log(coeff_of_var**2. + 1.))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.exp(np.log(means) - 0.5 * sigma**2 + sigma * source.standard_normal(np.shape(means)))
@@ -0,0 +1,11 @@
+from pypopgenbe.impl.compileanthropometriccurves import compile_anthropometric_curves
+from pypopgenbe.impl.getconsts import get_consts, get_compiled
+
+
+def warm_up():
+    """
+    Loads the constants and compiles the anthropometric curves, so that the first population generated in
+    this process does not wait for them. Used as the initializer of worker processes.
+    """
+    get_consts()
+    get_compiled(compile_anthropometric_curves)
@@ -0,0 +1,21 @@
+import numpy as np
+from typing import Tuple
+
+
+def wilson_interval(successes: float, trials: float, z: float = 2.) -> Tuple[float, float]:
+    """
+    Calculates the Wilson score interval of a binomial proportion.
+
+    Parameters:
+    successes (float): Number of successes.
+    trials (float): Number of trials. Must be positive.
+    z (float): Half-width of the interval, in standard deviations.
+
+    Returns:
+    Tuple[float, float]: Lower and upper bounds of the proportion.
+    """
+    p_hat = successes / trials
+    centre = p_hat + z**2 / (2. * trials)
+    half_width = z * np.sqrt(p_hat * (1. - p_hat) / trials + z**2 / (4. * trials**2))
+    scale = 1. + z**2 / trials
+    return float((centre - half_width) / scale), float((centre + half_width) / scale)
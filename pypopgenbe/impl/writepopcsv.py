@@ -0,0 +1,131 @@
+import io
+from typing import IO, Iterator, List, Optional, Union
+import numpy as np
+from pypopgenbe.impl.poptocsv import check_delim, header_line, inputs_lines, interlace, organ_columns, summary_lines
+
+# Characters that can appear in the shortest round-trip form of an int or float, including nan and inf
+_NUMERIC_CHARS = '0123456789.+-einfa'
+
+
+def write_pop_csv(
+    pop: dict,
+    fh: Union[IO[str], IO[bytes]],
+    delim: str = ',',
+    float_format: Optional[str] = None,
+    block_size: int = 10000
+):
+    """
+    Writes a population to a file handle in the CSV layout of pop_to_csv, one block of individuals at a time.
+
+    With the default float_format the bytes written are those of pop_to_csv's lines, each followed by a newline,
+    but the rows are formatted column by column over whole blocks and only one block of text is held at a time.
+
+    Parameters:
+    pop (dict): A population created by generate_pop.
+    fh (IO[str] or IO[bytes]): A handle open for writing. Handles that are not text are written UTF-8 encoded.
+    delim (str): The single character separating fields.
+    float_format (str, optional): A printf-style format for the floating point fields, e.g. '%.6g'. If None,
+    floats are written in their shortest round-trip form, as pop_to_csv does.
+    block_size (int): The number of individuals formatted at a time.
+    """
+    check_delim(delim)
+    if len(delim) != 1:
+        raise TypeError('DELIM must be a 1-character string')
+    if block_size < 1:
+        raise ValueError(f"Block size must be at least 1: {block_size}")
+
+    is_text = isinstance(fh, io.TextIOBase)
+
+    def write(lines: List[str]):
+        text = ''.join(line + '\n' for line in lines)
+        fh.write(text if is_text else text.encode('utf-8'))  # type: ignore
+
+    organ_col_names, not_ltm_or_lbm_index = organ_columns(pop)
+
+    write([header_line(pop, organ_col_names, delim)])
+
+    for lines in format_csv_rows(pop, delim, float_format, block_size):
+        write(lines)
+
+    write(summary_lines(pop, not_ltm_or_lbm_index, delim))
+    write(inputs_lines(pop))
+
+
+def format_csv_rows(
+    pop: dict,
+    delim: str = ',',
+    float_format: Optional[str] = None,
+    block_size: int = 10000,
+    first_individual: int = 1
+) -> Iterator[List[str]]:
+    """
+    Formats the rows of individuals in the CSV layout of pop_to_csv, a block at a time.
+
+    Parameters:
+    pop (dict): A population created by generate_pop, or a chunk of one.
+    delim (str): The single character separating fields.
+    float_format (str, optional): As for write_pop_csv.
+    block_size (int): The number of individuals formatted at a time.
+    first_individual (int): The Individual No. of the first individual, e.g. one more than the number in earlier chunks.
+
+    Returns:
+    Iterator[List[str]]: The lines of each block, without line endings.
+    """
+    is_numeric_safe = float_format is None and delim not in _NUMERIC_CHARS
+
+    _, not_ltm_or_lbm_index = organ_columns(pop)
+
+    roots = pop['Roots']['Values']
+    tissues = pop['Tissues']['Values']
+    n_people = tissues.shape[0]
+    n_tissues = tissues.shape[1]
+    tissue_columns = interlace(range(0, n_tissues), range(n_tissues, 2*n_tissues))[not_ltm_or_lbm_index]
+
+    sex_names = np.array(pop['Roots']['Sexes'], dtype=str)
+    ethnicity_names = np.array(pop['Roots']['Ethnicities'], dtype=str)
+
+    def format_floats(x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        return x.astype(str) if float_format is None else np.char.mod(float_format, x)
+
+    for start in range(0, n_people, block_size):
+        stop = min(start + block_size, n_people)
+        block = slice(start, stop)
+
+        # Same column order as pop_to_csv: the flattened (mass, flow) pairs are interlaced
+        block_tissues = np.transpose(tissues[block], (0, 2, 1)).reshape((stop - start, 2 * n_tissues))
+
+        columns = [
+            np.arange(start + first_individual, stop + first_individual).astype(str),
+            format_floats(roots[block, 0]),
+            sex_names[roots[block, 1].astype(int) - 1],
+            ethnicity_names[roots[block, 2].astype(int) - 1],
+            format_floats(roots[block, 3]),
+            format_floats(roots[block, 4]),
+            format_floats(roots[block, 5]),
+            *(format_floats(block_tissues[:, j]) for j in tissue_columns),
+            format_floats(pop['Enzymes']['MPPGLs'][block]),
+            *(format_floats(column) for column in np.asarray(pop['Enzymes']['InVivoEnzymeRates'])[block].T)
+        ]
+
+        # The names may need quoting; the numbers only if the delimiter can occur in them
+        quoted_columns = [2, 3] if is_numeric_safe else range(len(columns))
+        for j in quoted_columns:
+            columns[j] = _quote(columns[j], delim)
+
+        rows = columns[0]
+        for column in columns[1:]:
+            rows = np.char.add(np.char.add(rows, delim), column)
+
+        yield np.char.strip(rows).tolist()
+
+
+def _quote(fields: np.ndarray, delim: str) -> np.ndarray:
+    """Quotes the fields that csv.writer would quote: those containing the delimiter, a double quote or a line break."""
+    needs_quotes = np.zeros(fields.shape, dtype=bool)
+    for c in (delim, '"', '\r', '\n'):
+        needs_quotes |= np.char.find(fields, c) >= 0
+    if not np.any(needs_quotes):
+        return fields
+    quoted = np.char.add(np.char.add('"', np.char.replace(fields, '"', '""')), '"')
+    return np.where(needs_quotes, quoted, fields)
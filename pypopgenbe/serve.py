@@ -0,0 +1,487 @@
+import argparse
+import json
+import os
+import queue
+import select
+import socket
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from pypopgenbe.generatepop import iter_pop
+from pypopgenbe.impl.enum import OutputFormat
+from pypopgenbe.impl.inputsfromjson import inputs_from_json
+from pypopgenbe.impl.mpcontext import mp_context
+from pypopgenbe.impl.popwriter import PopWriter
+from pypopgenbe.impl.warmup import warm_up
+
+_CONTENT_TYPES = {
+    OutputFormat.Csv: 'text/csv; charset=utf-8',
+    OutputFormat.Jsonl: 'application/x-ndjson',
+    OutputFormat.Npy: 'application/octet-stream',
+}
+
+# Arguments of generate_pop that the server sets itself
+_SERVER_ARGUMENTS = ['workers', 'callback', 'progress', 'cancel_event', 'deadline_seconds']
+
+# Seconds between checks for a timed out or disconnected request while a worker generates
+_POLL_INTERVAL = 0.05
+
+# Number of chunks a worker may get ahead of the client
+_CHUNK_QUEUE_SIZE = 1
+
+# Most chunks a request is split into, so that a small chunk_size cannot tie up a worker with per-chunk overhead
+_MAX_CHUNKS_PER_REQUEST = 10**4
+
+
+class PopGenServer(ThreadingHTTPServer):
+    """
+    A local HTTP server that generates populations in a pool of worker processes, each of which loads the
+    constants when it starts.
+
+    POST /generate takes a JSON object of the arguments of generate_pop, as gp.json_to_inputs reads them, and
+    streams the population back with chunked transfer encoding, in the layout PopWriter writes. The query
+    parameters are 'format' ('csv', 'jsonl' or 'npy'), 'chunk_size', the number of individuals generated and
+    sent at a time, which is raised if need be so that no population is sent in more than 10000 chunks, and
+    'time_limit', in seconds, which can lower the server's time limit. GET /health reports the number of workers.
+
+    Each request is generated by one worker, and waits for a free worker when all are busy. The status is sent
+    with the first chunk, so invalid inputs get a 400 and a request that runs out of time before its first chunk
+    gets a 504, each with a JSON body holding the error. The worker is given the time left as its deadline, so a
+    request that runs out of time later, or whose client disconnects, stops sampling within a few milliseconds; a response cut short ends without the last chunk
+    of the chunked encoding, so the client sees it is incomplete.
+
+    If a worker process dies, its request gets a 503, or is cut short if it is streaming, and the pool is
+    replaced with a new one. GET /health answers 503 while the pool is broken.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        server_address: Tuple[str, int],
+        workers: Optional[int] = None,
+        max_population_size: int = 10**6,
+        max_body_bytes: int = 2**20,
+        time_limit: float = 300.,
+        chunk_size: int = 10000,
+        verbose: bool = True
+    ):
+        """
+        Parameters:
+        server_address (Tuple[str, int]): The host and port to listen on. Port 0 picks a free port.
+        workers (int, optional): The number of worker processes. Default is None, for the number of processors.
+        max_population_size (int): Largest population a request may ask for.
+        max_body_bytes (int): Largest request body, in bytes.
+        time_limit (float): Most seconds a request may take, including any wait for a free worker.
+        chunk_size (int): Number of individuals generated and sent at a time, unless the request says otherwise.
+        verbose (bool): Whether to log each request to stderr.
+        """
+        if workers is not None and workers < 1:
+            raise ValueError(f"Number of workers must be at least 1: {workers}")
+
+        if max_population_size < 1:
+            raise ValueError(f"Maximum population size must be at least 1: {max_population_size}")
+
+        if time_limit <= 0:
+            raise ValueError(f"Time limit must be positive: {time_limit}")
+
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size must be at least 1: {chunk_size}")
+
+        self.workers = workers or os.cpu_count() or 1
+        self.max_population_size = max_population_size
+        self.max_body_bytes = max_body_bytes
+        self.time_limit = time_limit
+        self.chunk_size = chunk_size
+        self.verbose = verbose
+
+        self.manager = mp_context().Manager()
+        self._executor_lock = threading.Lock()
+        self.executor = self._start_executor()
+
+        super().__init__(server_address, _PopGenRequestHandler)
+
+    def is_broken(self) -> bool:
+        """Whether a worker process has died, so that the pool can take no more requests until it is replaced."""
+        # ProcessPoolExecutor marks itself broken as soon as it sees a worker die, but only says so privately
+        return bool(getattr(self.executor, '_broken', False))
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        """Returns the pool of workers, waiting for it if it is being replaced."""
+        with self._executor_lock:
+            return self.executor
+
+    def replace_executor(self, executor: ProcessPoolExecutor):
+        """
+        Replaces a broken pool of workers with a new one, unless another request has replaced it already.
+
+        Parameters:
+        executor (ProcessPoolExecutor): The pool that was found broken.
+        """
+        with self._executor_lock:
+            if self.executor is executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = self._start_executor()
+
+    def _start_executor(self) -> ProcessPoolExecutor:
+        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=warm_up, mp_context=mp_context())
+        for future in [executor.submit(warm_up) for _ in range(self.workers)]:
+            future.result()
+        return executor
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(cancel_futures=True)
+        self.manager.shutdown()
+
+
+class _PopGenRequestHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    server: PopGenServer
+
+    def do_GET(self):
+        if urlsplit(self.path).path != '/health':
+            self._send_error(404, f"Not found: {self.path}")
+            return
+
+        if self.server.is_broken():
+            self._send_json(503, {'status': 'broken', 'workers': self.server.workers})
+            return
+
+        self._send_json(200, {'status': 'ok', 'workers': self.server.workers})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != '/generate':
+            self._send_error(404, f"Not found: {self.path}")
+            return
+
+        start = time.monotonic()
+
+        try:
+            output_format, chunk_size, time_limit = self._parse_query(parse_qs(url.query))
+            inputs = self._read_inputs()
+        except _RequestError as e:
+            self._send_error(e.status, str(e))
+            return
+
+        population_size = inputs.get('population_size')
+        if isinstance(population_size, int):
+            chunk_size = max(chunk_size, -(-population_size // _MAX_CHUNKS_PER_REQUEST))
+
+        # Sampling stops at the time limit even while chunks keep coming
+        inputs['deadline_seconds'] = time_limit - (time.monotonic() - start)
+        if not inputs['deadline_seconds'] > 0:
+            self._send_error(504, f"Time limit of {time_limit} s reached")
+            return
+
+        cancel_event = self.server.manager.Event()
+        chunks = self.server.manager.Queue(maxsize=_CHUNK_QUEUE_SIZE)
+        executor = self.server.get_executor()
+        try:
+            future = executor.submit(_write_pop, chunks, inputs, output_format, chunk_size, cancel_event)
+        except BrokenProcessPool:
+            self.server.replace_executor(executor)
+            self._send_error(503, "A worker process died; try again")
+            return
+
+        is_streaming = False
+        kind = 'bytes'
+        try:
+            while kind == 'bytes':
+                if time.monotonic() - start > time_limit:
+                    self._time_out(time_limit, is_streaming)
+                    return
+                if self._is_disconnected():
+                    return
+
+                try:
+                    kind, item = chunks.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    # A worker that returns normally puts its last message first, so only a dead one ends here
+                    if future.done() and future.exception() is not None:
+                        kind = 'error'
+                        if is_streaming:
+                            self.close_connection = True
+                        else:
+                            self._send_error(503, "A worker process died; try again")
+                        return
+                    continue
+
+                if kind == 'timeout':
+                    self._time_out(time_limit, is_streaming)
+                    return
+
+                if kind == 'error':
+                    status = 400 if isinstance(item, (ValueError, TypeError)) else 500
+                    if is_streaming:
+                        self.close_connection = True
+                    else:
+                        self._send_error(status, str(item))
+                    return
+
+                if not is_streaming:
+                    self.send_response(200)
+                    self.send_header('Content-Type', _CONTENT_TYPES[output_format])
+                    self.send_header('Transfer-Encoding', 'chunked')
+                    self.end_headers()
+                    is_streaming = True
+
+                if kind == 'bytes':
+                    self._write_chunk(item)
+                else:
+                    self._write_chunk(b'')
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            if kind == 'bytes':
+                # Cut short: stop the worker, unless it has yet to start, and let it finish its current chunk
+                self.close_connection = True
+                cancel_event.set()
+                if not future.cancel():
+                    _drain(chunks, future)
+            wait([future])
+            if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+                self.server.replace_executor(executor)
+
+    def log_message(self, format: str, *args: Any):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _parse_query(self, query: Dict[str, List[str]]) -> Tuple[OutputFormat, int, float]:
+        try:
+            output_format = OutputFormat(query.get('format', [OutputFormat.Csv.value])[-1])
+            chunk_size = int(query.get('chunk_size', [self.server.chunk_size])[-1])
+            time_limit = float(query.get('time_limit', [self.server.time_limit])[-1])
+        except ValueError as e:
+            raise _RequestError(400, str(e))
+
+        if chunk_size < 1:
+            raise _RequestError(400, f"Chunk size must be at least 1: {chunk_size}")
+
+        if not time_limit > 0:
+            raise _RequestError(400, f"Time limit must be positive: {time_limit}")
+
+        return output_format, chunk_size, min(time_limit, self.server.time_limit)
+
+    def _read_inputs(self) -> Dict[str, Any]:
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            raise _RequestError(411, "Content-Length is required")
+
+        if length > self.server.max_body_bytes:
+            # The body is not read, so the connection cannot be reused
+            self.close_connection = True
+            raise _RequestError(413, f"Request body is larger than {self.server.max_body_bytes} bytes")
+
+        try:
+            inputs = json.loads(self.rfile.read(length))
+        except ValueError as e:
+            raise _RequestError(400, f"Request body is not valid JSON: {e}")
+
+        if not isinstance(inputs, dict):
+            raise _RequestError(400, "Request body must be a JSON object of the arguments of generate_pop")
+
+        for k in _SERVER_ARGUMENTS:
+            if k in inputs:
+                raise _RequestError(400, f"{k} is set by the server")
+
+        population_size = inputs.get('population_size')
+        if isinstance(population_size, (int, float)) and population_size > self.server.max_population_size:
+            raise _RequestError(
+                413, f"Population size {population_size} is larger than {self.server.max_population_size}")
+
+        return inputs_from_json(inputs)
+
+    def _is_disconnected(self) -> bool:
+        """Whether the client has closed its end of the connection, without consuming anything it has sent."""
+        try:
+            readable, _, _ = select.select([self.connection], [], [], 0)
+            return bool(readable) and self.connection.recv(1, socket.MSG_PEEK) == b''
+        except OSError:
+            return True
+
+    def _time_out(self, time_limit: float, is_streaming: bool):
+        if is_streaming:
+            self.close_connection = True
+        else:
+            self._send_error(504, f"Time limit of {time_limit} s reached")
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+
+    def _send_json(self, status: int, body: Dict[str, Any]):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status: int, message: str):
+        self._send_json(status, {'error': message})
+
+
+class _RequestError(Exception):
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class _QueueWriter:
+    """A binary file handle that collects what is written and puts it on a queue when flushed."""
+
+    def __init__(self, chunks: Any):
+        self.chunks = chunks
+        self._parts: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        if self._parts:
+            self.chunks.put(('bytes', b''.join(self._parts)))
+            self._parts = []
+
+
+def _drain(chunks: Any, future: Future):
+    """Discards what a worker puts on the queue until it puts its last message, or its process dies."""
+    while True:
+        try:
+            kind, _ = chunks.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            if future.done():
+                return
+            continue
+        if kind != 'bytes':
+            return
+
+
+def _write_pop(chunks: Any, inputs: Dict[str, Any], output_format: OutputFormat, chunk_size: int, cancel_event: Any):
+    """
+    Generates a population in a worker and puts it on the queue as the bytes PopWriter writes, one message per
+    chunk, then ('done', number of individuals discarded), ('timeout', None) if the deadline in the inputs is
+    reached, or ('error', exception) if generation fails.
+    """
+    try:
+        fh = _QueueWriter(chunks)
+        writer = PopWriter(fh, output_format)
+        number_of_individuals_discarded = 0
+        for chunk, discarded in iter_pop(chunk_size, cancel_event=cancel_event, **inputs):
+            if chunk["Diagnostics"]["StoppedBy"] == "Deadline":
+                chunks.put(('timeout', None))
+                return
+            writer.write(chunk)
+            fh.flush()
+            number_of_individuals_discarded += discarded
+            if cancel_event.is_set():
+                break
+        writer.close()
+        fh.flush()
+    except Exception as e:
+        chunks.put(('error', e))
+    else:
+        chunks.put(('done', number_of_individuals_discarded))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog='python -m pypopgenbe.serve',
+        description="Serve generate_pop over HTTP from a pool of warm worker processes",
+        epilog='''
+            Example:
+            > curl -X POST --data @./pypopgenbe/test/fromXNET/in01.json "http://127.0.0.1:8000/generate?format=csv&chunk_size=1000"
+        '''
+    )
+
+    parser.add_argument(
+        '--host',
+        default='127.0.0.1',
+        help="address to listen on"
+    )
+
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8000,
+        help="port to listen on"
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help="number of worker processes. Default is the number of processors"
+    )
+
+    parser.add_argument(
+        '--max-population-size',
+        type=int,
+        default=10**6,
+        help="largest population a request may ask for"
+    )
+
+    parser.add_argument(
+        '--max-body-bytes',
+        type=int,
+        default=2**20,
+        help="largest request body, in bytes"
+    )
+
+    parser.add_argument(
+        '--time-limit',
+        type=float,
+        default=300.,
+        help="most seconds a request may take"
+    )
+
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=10000,
+        help="number of individuals generated and sent at a time, unless the request says otherwise"
+    )
+
+    parser.add_argument(
+        '--quiet',
+        action='store_true',
+        help="do not log requests"
+    )
+
+    args = parser.parse_args(argv)
+
+    try:
+        server = PopGenServer(
+            (args.host, args.port),
+            args.workers,
+            args.max_population_size,
+            args.max_body_bytes,
+            args.time_limit,
+            args.chunk_size,
+            not args.quiet
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    with server:
+        host, port = server.server_address[:2]
+        print(f"Serving on http://{host}:{port} with {server.workers} workers")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
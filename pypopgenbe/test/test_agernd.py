@@ -0,0 +1,32 @@
+import unittest
+import numpy as np
+from scipy.stats import kstest
+from pypopgenbe.impl.agecdf import age_cdf
+from pypopgenbe.impl.ageinv import age_inv
+from pypopgenbe.impl.agernd import age_rnd
+
+
+class TestAgeRnd(unittest.TestCase):
+
+    def test_age_inv_inverts_age_cdf(self):
+        x = np.linspace(0., 100., 1001)
+        np.testing.assert_allclose(age_inv(age_cdf(x)), x, atol=1e-8)
+
+    def test_age_inv_scalar_matches_array(self):
+        p = np.array([0., 0.3, 45. / 72.5, 0.7, 0.999, 1.])
+        expected = [age_inv(float(q)) for q in p]
+        np.testing.assert_allclose(age_inv(p), expected)
+        self.assertIsInstance(age_inv(0.5), float)
+        self.assertEqual(age_inv(0.), 0.)
+        self.assertEqual(age_inv(1.), 100.)
+
+    def test_age_rnd_array(self):
+        lower, upper = 18., 80.
+        ages = age_rnd(lower, upper, size=100000, rng=np.random.default_rng(7))
+        assert isinstance(ages, np.ndarray)
+        self.assertEqual(ages.shape, (100000,))
+        self.assertTrue(np.all((ages >= lower) & (ages <= upper)))
+
+        bounds = age_cdf(np.array([lower, upper]))
+        _, p = kstest(ages, lambda t: (age_cdf(t) - bounds[0]) / (bounds[1] - bounds[0]))
+        self.assertGreater(p, 0.001)
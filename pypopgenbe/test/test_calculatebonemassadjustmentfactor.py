@@ -0,0 +1,36 @@
+import unittest
+import numpy as np
+from pypopgenbe.impl.calculatebonemassadjustmentfactor import calculate_bone_mass_adjustment_factor
+
+
+class TestCalculateBoneMassAdjustmentFactor(unittest.TestCase):
+
+    ethnicity_key = {"White": 1, "Black": 2, "NonBlackHispanic": 3, "Other": 4}
+
+    def test_matches_reference_values(self):
+        # (age, sex, ethnicity, factor)
+        cases = [
+            (10., 1, 1, 1.0),
+            (19., 2, 2, 1.03321296),
+            (21., 1, 2, 1.04430976),
+            (22., 2, 4, 1.022),
+            (30., 1, 3, 1.00585472),
+            (50., 2, 2, 1.03551804),
+            (80., 2, 3, 0.93943932),
+            (90., 1, 1, 0.98611531),
+        ]
+        ages, sexes, ethnicities, expected = (np.array(x) for x in zip(*cases))
+
+        factors = calculate_bone_mass_adjustment_factor(ages, sexes, ethnicities, self.ethnicity_key)
+
+        np.testing.assert_allclose(factors, expected, rtol=1e-7)
+
+    def test_unlisted_ethnicities_use_reference_density(self):
+        hse_key = {"White": 1, "Black": 2, "Asian": 3, "Other": 4}
+        ages = np.array([30., 60.])
+        sexes = np.array([1, 2])
+
+        asian = calculate_bone_mass_adjustment_factor(ages, sexes, np.array([3, 3]), hse_key)
+        white = calculate_bone_mass_adjustment_factor(ages, sexes, np.array([1, 1]), hse_key)
+
+        np.testing.assert_array_equal(asian, white)
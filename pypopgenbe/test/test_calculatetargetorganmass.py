@@ -7,8 +7,9 @@ class TestCalculateTargetOrganMass(unittest.TestCase):
     def test_calculate_target_organ_mass(self):
         # Example values for testing
         age = 30
-        sex_name = "Male"
-        ethnicity_name = "Caucasian"
+        sex = 1
+        ethnicity = 1
+        ethnicity_key = {"White": 1, "Black": 2, "NonBlackHispanic": 3, "Other": 4}
         mean_body_weight = 70.0
         mean_height = 1.75
         target_body_weight = 75.0
@@ -38,7 +39,7 @@ class TestCalculateTargetOrganMass(unittest.TestCase):
         }
 
         scaled_height, target_organ_mass = calculate_target_organ_mass(
-            age, sex_name, ethnicity_name, mean_body_weight,
+            age, sex, ethnicity, ethnicity_key, mean_body_weight,
             mean_height, target_body_weight, target_height,
             organ_masses, index
         )
@@ -46,3 +47,33 @@ class TestCalculateTargetOrganMass(unittest.TestCase):
         self.assertIsInstance(scaled_height, float)
         self.assertIsInstance(target_organ_mass, np.ndarray)
         self.assertEqual(len(target_organ_mass), len(organ_masses))
+
+    def test_batch_matches_individuals(self):
+        index = {"Brain": 1, "Muscle": 9, "Adipose": 11, "Bone": 12, "Skin": 13}
+        ethnicity_key = {"White": 1, "Black": 2, "Asian": 3, "Other": 4}
+        rng = np.random.default_rng(6)
+        n = 20
+        ages = rng.uniform(0, 90, n)
+        sexes = rng.integers(1, 3, n)
+        ethnicities = rng.integers(1, 5, n)
+        mean_body_weights = rng.uniform(50, 80, n)
+        mean_heights = rng.uniform(150, 190, n)
+        target_body_weights = rng.uniform(50, 80, n)
+        target_heights = rng.uniform(150, 190, n)
+        organ_masses = rng.uniform(0, 0.1, (n, 15))
+
+        scaled_heights, target_organ_masses = calculate_target_organ_mass(
+            ages, sexes, ethnicities, ethnicity_key, mean_body_weights,
+            mean_heights, target_body_weights, target_heights,
+            organ_masses, index
+        )
+
+        self.assertEqual(target_organ_masses.shape, (n, 15))
+        for i in range(n):
+            scaled_height, target_organ_mass = calculate_target_organ_mass(
+                ages[i], sexes[i], ethnicities[i], ethnicity_key, mean_body_weights[i],
+                mean_heights[i], target_body_weights[i], target_heights[i],
+                organ_masses[i], index
+            )
+            self.assertAlmostEqual(scaled_heights[i], scaled_height)
+            np.testing.assert_allclose(target_organ_masses[i], target_organ_mass)
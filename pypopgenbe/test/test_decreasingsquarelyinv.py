@@ -0,0 +1,51 @@
+import unittest
+import numpy as np
+from pypopgenbe.impl.decreasingsquarelyinv import decreasing_squarely_inv
+from pypopgenbe.impl.decreasingsquarelyrnd import decreasing_squarely_rnd
+
+
+def decreasing_squarely_inv_roots(p: float, lower: float, upper: float) -> float:
+    # Previous implementation, solving the cubic with np.roots
+    if p == 0.:
+        return lower
+    if p == 1.:
+        return upper
+
+    lower3 = lower ** 3.
+    const_of_integration = lower3 + 3. * \
+        lower ** 2. * upper + 3. * lower * upper ** 2.
+    sum_of_bounds = lower + upper
+    diff_cubes = upper ** 3. - lower3
+
+    cubic = [1., -3. * sum_of_bounds, 3. * sum_of_bounds ** 2., -const_of_integration - diff_cubes * p]
+    roots = np.roots(cubic)
+    real_roots = roots[np.isreal(roots)].real
+
+    return real_roots[0]
+
+
+class TestDecreasingSquarelyInv(unittest.TestCase):
+
+    def test_matches_cubic_roots(self):
+        p = np.linspace(0., 1., 101)
+        for lower, upper in [(20., 120.), (1., 2.), (0., 50.), (35.5, 36.)]:
+            with self.subTest(lower=lower, upper=upper):
+                expected = [decreasing_squarely_inv_roots(q, lower, upper) for q in p]
+                np.testing.assert_allclose(decreasing_squarely_inv(p, lower, upper), expected, rtol=1e-9)
+
+    def test_monotonic_and_bounded(self):
+        p = np.linspace(0., 1., 10001)
+        x = decreasing_squarely_inv(p, 20., 120.)
+        assert isinstance(x, np.ndarray)
+        self.assertTrue(np.all(np.diff(x) > 0))
+        self.assertEqual(x[0], 20.)
+        self.assertEqual(x[-1], 120.)
+        self.assertIsInstance(decreasing_squarely_inv(0.5, 20., 120.), float)
+
+    def test_rnd_density_decreases(self):
+        lower, upper = 20., 120.
+        r = decreasing_squarely_rnd(lower, upper, 100000, np.random.default_rng(11))
+        assert isinstance(r, np.ndarray)
+        self.assertTrue(np.all((r >= lower) & (r <= upper)))
+        counts, _ = np.histogram(r, bins=5, range=(lower, upper))
+        self.assertTrue(np.all(np.diff(counts) < 0))
@@ -0,0 +1,31 @@
+import unittest
+import numpy as np
+from pypopgenbe.impl.estimatebatchsize import estimate_batch_size
+
+
+class TestEstimateBatchSize(unittest.TestCase):
+
+    def test_reaches_target_in_one_round(self):
+        rng = np.random.default_rng(8)
+        for p in [0.9, 0.3, 0.05, 0.005]:
+            with self.subTest(p=p):
+                # A pilot batch, then one batch sized from it
+                number_remaining = 1000
+                pilot = 2000
+                accepted = rng.binomial(pilot, p)
+                batch_size = estimate_batch_size(number_remaining, pilot, accepted)
+                is_short = rng.binomial(batch_size, p, size=1000) < number_remaining
+                self.assertLess(np.mean(is_short), 0.2)
+                # Without overshooting by much
+                self.assertLess(batch_size * p, 2. * number_remaining)
+
+    def test_nothing_accepted_yet(self):
+        self.assertGreater(estimate_batch_size(100, 1000, 0), 1000 * 100)
+        self.assertGreaterEqual(estimate_batch_size(100, 0, 0), 200)
+
+    def test_none_remaining(self):
+        self.assertEqual(estimate_batch_size(0, 100, 100), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import pickle
+import unittest
+from pathlib import Path
+from typing import cast
+import numpy as np
+from numpy.polynomial.polynomial import Polynomial
+from scipy.interpolate import interp1d
+from pypopgenbe.impl.compileanthropometriccurves import compile_anthropometric_curves
+from pypopgenbe.impl.evaluateanthropometriccurves import evaluate_anthropometric_curves
+from pypopgenbe.impl.enum import Dataset
+
+THIS_DIR = Path(__file__).parent
+CONSTS_PATH = THIS_DIR.parent / 'popgenconsts.pkl'
+
+
+def reference_curves(CONSTS: dict, dataset: Dataset, age: float, sex: int, ethnicity: int):
+    # Per-individual construction, as previously done in generatepop
+    sex_name = CONSTS["NAMES"]["Sex"][sex-1]
+    maturity_age = min(age, 20 if sex_name == 'Male' else 16)
+    if dataset == Dataset.ICRP:
+        bw = CONSTS["BodyWeight"][dataset.name]
+        h = CONSTS["Height"][dataset.name]
+        bw_curve = interp1d(bw["Ages"], bw["Values"][:, sex-1], fill_value=cast(float, "extrapolate"))
+        h_curve = interp1d(h["Ages"], h["Values"][:, sex-1], fill_value=cast(float, "extrapolate"))
+    else:
+        ethnicity_name = {v: k for k, v in CONSTS["KEY"]["Ethnicity"][dataset.name].items()}[ethnicity]
+        age_class = 'Adult' if age > 16 else 'Child'
+        if dataset == Dataset.NDNS:
+            bw = CONSTS["BodyWeight"][dataset.name]
+            h = CONSTS["Height"][dataset.name]
+        else:
+            bw = CONSTS["BodyWeight"][dataset.name][age_class]
+            h = CONSTS["Height"][dataset.name][age_class]
+        bw_curve = Polynomial(bw[sex_name.lower()][ethnicity_name.lower()][::-1])
+        h_curve = Polynomial(h[sex_name.lower()][ethnicity_name.lower()][::-1])
+    cardiac_output = interp1d(CONSTS["AgeGroups"]["ICRP"], CONSTS["CardiacOutput"]["ICRP"][:, sex-1])
+    return h_curve(age), bw_curve(age), bw_curve(maturity_age), cardiac_output(age)
+
+
+@unittest.skipUnless(CONSTS_PATH.exists(), "popgenconsts.pkl has not been built")
+class TestEvaluateAnthropometricCurves(unittest.TestCase):
+
+    def test_matches_per_individual_curves(self):
+        with open(CONSTS_PATH, 'rb') as f:
+            CONSTS = pickle.load(f)
+        curves = compile_anthropometric_curves(CONSTS)
+        rng = np.random.default_rng(1)
+
+        for dataset in Dataset:
+            with self.subTest(dataset=dataset):
+                lower, upper = CONSTS["AcceptableAgeRanges"][dataset.name]
+                n = 200
+                ages = np.concatenate(([lower, 16., 16.0001, 20., upper], rng.uniform(lower, upper, n)))
+                sexes = rng.integers(1, 3, ages.size)
+                number_of_ethnicities = len(CONSTS["KEY"]["Ethnicity"][dataset.name])
+                ethnicities = rng.integers(1, number_of_ethnicities + 1, ages.size)
+
+                actual = evaluate_anthropometric_curves(curves, dataset, ages, sexes, ethnicities)
+                expected = np.array([
+                    reference_curves(CONSTS, dataset, a, s, e)
+                    for a, s, e in zip(ages, sexes, ethnicities)
+                ]).T
+
+                for a, e in zip(actual, expected):
+                    np.testing.assert_allclose(a, e, rtol=1e-10)
+
+    def test_cardiac_output_out_of_range(self):
+        with open(CONSTS_PATH, 'rb') as f:
+            CONSTS = pickle.load(f)
+        curves = compile_anthropometric_curves(CONSTS)
+        cardiac_output_ages = CONSTS["AgeGroups"]["ICRP"]
+
+        for age in [cardiac_output_ages[0] - 1, cardiac_output_ages[-1] + 1]:
+            with self.subTest(age=age):
+                with self.assertRaises(ValueError):
+                    interp1d(cardiac_output_ages, CONSTS["CardiacOutput"]["ICRP"][:, 0])(age)
+                with self.assertRaises(ValueError):
+                    evaluate_anthropometric_curves(curves, Dataset.P3M, np.array([30., age]), np.array([1, 2]), np.array([1, 1]))
@@ -0,0 +1,459 @@
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import numpy as np
+from pypopgenbe.generatepop import generate_pop, iter_pop, extend_pop
+from pypopgenbe.impl.enum import Dataset, Engine, Stage
+from pypopgenbe.impl.savepop import save_pop
+from pypopgenbe.impl.loadpop import load_pop
+
+THIS_DIR = Path(__file__).parent
+
+INPUTS = {
+    "population_size": 2000,
+    "dataset_name": Dataset.P3M,
+    "age_range": (18, 60),
+    "bmi_range": (20, 25),
+    "height_range": (120, 170),
+    "prob_of_male": 0.5,
+    "probs_of_ethnicities": (0.3, 0.4, 0.3),
+    "seed": 42
+}
+
+
+@unittest.skipUnless((THIS_DIR.parent / 'popgenconsts.pkl').exists(), "popgenconsts.pkl has not been built")
+class TestGeneratePop(unittest.TestCase):
+
+    def test_vectorized_engine_matches_loop(self):
+        loop_pop, loop_discarded = generate_pop(**INPUTS, engine=Engine.Loop)
+        vec_pop, vec_discarded = generate_pop(**INPUTS, engine="vectorized")
+        assert loop_pop is not None and vec_pop is not None
+        assert loop_discarded is not None and vec_discarded is not None
+
+        loop_roots = loop_pop["Roots"]["Values"]
+        vec_roots = vec_pop["Roots"]["Values"]
+        self.assertEqual(loop_roots.shape, vec_roots.shape)
+        self.assertEqual(loop_pop["Tissues"]["Values"].shape, vec_pop["Tissues"]["Values"].shape)
+        self.assertEqual(loop_pop["Tissues"]["Names"], vec_pop["Tissues"]["Names"])
+
+        # Age, body mass, height and cardiac output
+        for column in [0, 3, 4, 5]:
+            with self.subTest(column=loop_pop["Roots"]["Names"][column]):
+                np.testing.assert_allclose(
+                    np.mean(vec_roots[:, column]), np.mean(loop_roots[:, column]), rtol=0.02)
+                np.testing.assert_allclose(
+                    np.std(vec_roots[:, column]), np.std(loop_roots[:, column]), rtol=0.1)
+
+        for sex in ["Male", "Female"]:
+            for prop in ["Mass", "Flow"]:
+                with self.subTest(sex=sex, prop=prop):
+                    np.testing.assert_allclose(
+                        vec_pop["Summary"][sex][prop]["Mean"],
+                        loop_pop["Summary"][sex][prop]["Mean"],
+                        rtol=0.05
+                    )
+
+        np.testing.assert_allclose(vec_discarded, loop_discarded, rtol=0.1)
+
+    def test_vectorized_engine_respects_filters(self):
+        pop, _ = generate_pop(**INPUTS, engine=Engine.Vectorized)
+        assert pop is not None
+        roots = pop["Roots"]["Values"]
+        bmis = roots[:, 3] / (0.01 * roots[:, 4]) ** 2
+        self.assertTrue(np.all((bmis >= 20) & (bmis <= 25)))
+        self.assertTrue(np.all((roots[:, 0] >= 18) & (roots[:, 0] <= 60)))
+
+    def test_vectorized_engine_callback_cancels(self):
+        pop, _ = generate_pop(
+            **{**INPUTS, "population_size": 100000},
+            engine=Engine.Vectorized,
+            callback=lambda generated, _: generated > 0
+        )
+        assert pop is not None
+        self.assertLess(pop["Roots"]["Values"].shape[0], 100000)
+        self.assertEqual(pop["Roots"]["Values"].shape[0], pop["Tissues"]["Values"].shape[0])
+
+    def test_diagnostics(self):
+        for engine, workers in [(Engine.Loop, 1), (Engine.Vectorized, 1), (Engine.Vectorized, 2)]:
+            with self.subTest(engine=engine, workers=workers):
+                pop, discarded = generate_pop(**{**INPUTS, "bmi_range": (21, 22)}, engine=engine, workers=workers)
+                assert pop is not None
+                diagnostics = pop["Diagnostics"]
+                self.assertEqual(diagnostics["Accepted"], INPUTS["population_size"])
+                self.assertEqual(sum(diagnostics["Rejections"].values()), discarded)
+                self.assertEqual(diagnostics["Candidates"], diagnostics["Accepted"] + discarded)
+                self.assertAlmostEqual(diagnostics["AcceptanceRate"], diagnostics["Accepted"] / diagnostics["Candidates"])
+                # A narrow BMI window is the main reason for rejection
+                self.assertEqual(max(diagnostics["Rejections"], key=diagnostics["Rejections"].get), "BMI")
+
+    def test_infeasible_filters_fail_fast(self):
+        inputs = {**INPUTS, "dataset_name": Dataset.NDNS, "age_range": (2, 4), "bmi_range": (60, 70),
+                  "height_range": (50, 60), "probs_of_ethnicities": None}
+        for engine in [Engine.Loop, Engine.Vectorized]:
+            with self.subTest(engine=engine):
+                with self.assertRaisesRegex(ValueError, "acceptance rate"):
+                    generate_pop(**inputs, engine=engine, min_acceptance_rate=1e-3)
+                with self.assertRaisesRegex(ValueError, "acceptance rate"):
+                    iter_pop(chunk_size=100, **inputs, engine=engine, min_acceptance_rate=1e-3).__next__()
+
+    def test_pilot_does_not_change_population(self):
+        for engine in [Engine.Loop, Engine.Vectorized]:
+            with self.subTest(engine=engine):
+                pop, _ = generate_pop(**{**INPUTS, "population_size": 200}, engine=engine)
+                piloted_pop, _ = generate_pop(
+                    **{**INPUTS, "population_size": 200}, engine=engine, min_acceptance_rate=0.01)
+                assert pop is not None and piloted_pop is not None
+                np.testing.assert_array_equal(piloted_pop["Roots"]["Values"], pop["Roots"]["Values"])
+
+    def test_max_attempts(self):
+        for engine, workers in [(Engine.Loop, 1), (Engine.Vectorized, 1), (Engine.Vectorized, 2)]:
+            with self.subTest(engine=engine, workers=workers):
+                pop, discarded = generate_pop(**INPUTS, engine=engine, workers=workers, max_attempts=500)
+                assert pop is not None and discarded is not None
+                number_generated = pop["Roots"]["Values"].shape[0]
+                self.assertLess(number_generated, INPUTS["population_size"])
+                self.assertLessEqual(number_generated + discarded, 500)
+                self.assertEqual(pop["Diagnostics"]["StoppedBy"], "MaxAttempts")
+
+        chunks = list(iter_pop(chunk_size=200, **INPUTS, engine=Engine.Vectorized, max_attempts=500))
+        self.assertLessEqual(sum(chunk["Diagnostics"]["Candidates"] for chunk, _ in chunks), 500)
+        self.assertEqual(chunks[-1][0]["Diagnostics"]["StoppedBy"], "MaxAttempts")
+
+    def test_deadline(self):
+        pop, _ = generate_pop(**{**INPUTS, "population_size": 100000}, engine=Engine.Loop, deadline_seconds=0.2)
+        assert pop is not None
+        self.assertLess(pop["Roots"]["Values"].shape[0], 100000)
+        self.assertEqual(pop["Diagnostics"]["StoppedBy"], "Deadline")
+
+    def test_callback_cancel_is_reported(self):
+        pop, _ = generate_pop(
+            **{**INPUTS, "population_size": 100000},
+            engine=Engine.Vectorized,
+            max_attempts=10**9,
+            callback=lambda generated, _: generated > 0
+        )
+        assert pop is not None
+        self.assertEqual(pop["Diagnostics"]["StoppedBy"], "Callback")
+
+    def test_progress(self):
+        for engine, workers in [(Engine.Loop, 1), (Engine.Vectorized, 1), (Engine.Vectorized, 2)]:
+            with self.subTest(engine=engine, workers=workers):
+                reports = []
+                pop, discarded = generate_pop(
+                    **INPUTS,
+                    engine=engine,
+                    workers=workers,
+                    progress=lambda p: reports.append(p) or False,
+                    progress_interval=3600.
+                )
+                assert pop is not None
+
+                stages = [p.stage for p in reports]
+                self.assertEqual(stages[-3:], [Stage.Aggregation, Stage.Enzymes, Stage.Stats])
+                self.assertTrue(all(stage == Stage.Sampling for stage in stages[:-3]))
+                # At the start, at most once per 5% of the population, and at the end of sampling
+                self.assertLessEqual(len(stages) - 3, 22)
+
+                generated = [p.generated for p in reports]
+                self.assertEqual(generated, sorted(generated))
+                self.assertEqual(reports[-1].generated, INPUTS["population_size"])
+                self.assertEqual(reports[-1].discarded, discarded)
+                self.assertEqual(reports[-1].eta_seconds, 0.)
+
+    def test_progress_cancels(self):
+        pop, _ = generate_pop(**INPUTS, progress=lambda p: p.generated >= 100)
+        assert pop is not None
+        # Reports are due every 5% of the population or half a second, so sampling stops soon after 100
+        self.assertGreaterEqual(pop["Roots"]["Values"].shape[0], 100)
+        self.assertLess(pop["Roots"]["Values"].shape[0], 200)
+        self.assertEqual(pop["Diagnostics"]["StoppedBy"], "Callback")
+
+        stages = []
+        chunks = list(iter_pop(
+            chunk_size=500,
+            **INPUTS,
+            progress=lambda p: stages.append(p.stage) or p.generated >= 600
+        ))
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(chunks[-1][0]["Diagnostics"]["StoppedBy"], "Callback")
+        self.assertEqual(stages.count(Stage.Stats), 2)
+
+    def test_invalid_budgets(self):
+        for kwargs in [{"max_attempts": 0}, {"deadline_seconds": 0}, {"min_acceptance_rate": 0}, {"min_acceptance_rate": 2},
+                       {"progress_interval": -1}, {"progress_fraction": 0}]:
+            with self.subTest(**kwargs):
+                with self.assertRaises(ValueError):
+                    generate_pop(**INPUTS, **kwargs)
+
+    def test_workers_are_reproducible(self):
+        inputs = {**INPUTS, "population_size": 300}
+        pop, discarded = generate_pop(**inputs, engine=Engine.Vectorized, workers=3)
+        again, discarded_again = generate_pop(**inputs, engine=Engine.Vectorized, workers=3)
+        assert pop is not None and again is not None
+
+        self.assertEqual(pop["Roots"]["Values"].shape[0], 300)
+        np.testing.assert_array_equal(pop["Roots"]["Values"], again["Roots"]["Values"])
+        np.testing.assert_array_equal(pop["Tissues"]["Values"], again["Tissues"]["Values"])
+        np.testing.assert_array_equal(pop["Enzymes"]["MPPGLs"], again["Enzymes"]["MPPGLs"])
+        self.assertEqual(discarded, discarded_again)
+
+        # Summary describes the merged population
+        is_male = pop["Roots"]["Values"][:, 1] == 1
+        np.testing.assert_allclose(
+            pop["Summary"]["Male"]["Mass"]["Mean"],
+            np.mean(pop["Tissues"]["Values"][is_male, :, 0], axis=0)
+        )
+
+    def test_workers_use_independent_streams(self):
+        pop, _ = generate_pop(**{**INPUTS, "population_size": 200}, workers=2)
+        assert pop is not None
+        roots = pop["Roots"]["Values"]
+        self.assertEqual(roots.shape[0], 200)
+        self.assertFalse(np.array_equal(roots[:100], roots[100:]))
+
+    def test_workers_cancel_promptly(self):
+        cancel_event = threading.Event()
+        timer = threading.Timer(1., cancel_event.set)
+        timer.start()
+        try:
+            start = time.monotonic()
+            pop, _ = generate_pop(
+                **{**INPUTS, "population_size": 10**6}, engine=Engine.Loop, workers=2, cancel_event=cancel_event)
+            elapsed = time.monotonic() - start
+        finally:
+            timer.cancel()
+        assert pop is not None
+
+        # Workers stop within their sampling loops rather than after finishing their chunks
+        self.assertLess(elapsed, 5.)
+        self.assertLess(pop["Roots"]["Values"].shape[0], 10**6)
+        self.assertEqual(pop["Diagnostics"]["StoppedBy"], "Callback")
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            generate_pop(**INPUTS, workers=0)
+
+    def test_concurrent_threads_match_serial(self):
+        inputs = {**INPUTS, "population_size": 200}
+        seeds = [1, 2, 3, 4]
+        serial = [generate_pop(**{**inputs, "seed": seed})[0] for seed in seeds]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            concurrent = list(executor.map(lambda seed: generate_pop(**{**inputs, "seed": seed})[0], seeds))
+
+        for expected, actual in zip(serial, concurrent):
+            assert expected is not None and actual is not None
+            np.testing.assert_array_equal(expected["Roots"]["Values"], actual["Roots"]["Values"])
+            np.testing.assert_array_equal(expected["Tissues"]["Values"], actual["Tissues"]["Values"])
+
+    def test_global_random_state_is_untouched(self):
+        state = np.random.get_state()
+        error_state = np.geterr()
+
+        generate_pop(**{**INPUTS, "population_size": 50})
+
+        self.assertEqual(np.geterr(), error_state)
+        np.testing.assert_array_equal(np.random.get_state()[1], state[1])
+
+    def test_iter_pop_chunks_match_workers(self):
+        inputs = {**INPUTS, "population_size": 300, "engine": Engine.Vectorized}
+        # Three workers sample four chunks each
+        chunks = list(iter_pop(chunk_size=25, **inputs))
+        pop, discarded = generate_pop(**inputs, workers=3)
+        assert pop is not None
+
+        self.assertEqual([chunk["Roots"]["Values"].shape[0] for chunk, _ in chunks], [25] * 12)
+        np.testing.assert_array_equal(
+            np.concatenate([chunk["Roots"]["Values"] for chunk, _ in chunks]), pop["Roots"]["Values"])
+        np.testing.assert_array_equal(
+            np.concatenate([chunk["Tissues"]["Values"] for chunk, _ in chunks]), pop["Tissues"]["Values"])
+        self.assertEqual(sum(d for _, d in chunks), discarded)
+
+    def test_iter_pop_last_chunk_and_enzymes(self):
+        inputs = {
+            **INPUTS,
+            "population_size": 250,
+            "enzyme_rate_parameter": "CLint",
+            "enzyme_names": ["CYP3A4"],
+            "in_vitro_enzyme_rates": [10.],
+            "in_vitro_enzyme_rate_coeffs_of_var": [0.3],
+            "enzyme_rate_units": "MicroLitresPerMinute",
+            "is_richly_perfused_tissue_discrete": True
+        }
+        chunks = [chunk for chunk, _ in iter_pop(chunk_size=100, **inputs)]
+
+        self.assertEqual([chunk["Roots"]["Values"].shape[0] for chunk in chunks], [100, 100, 50])
+        for chunk in chunks:
+            self.assertEqual(chunk["Enzymes"]["InVivoEnzymeRates"].shape, (chunk["Roots"]["Values"].shape[0], 1))
+
+        # The varied in-vitro rate is shared, so the in-vivo rate per MPPGL per liver mass is the same in every chunk
+        liver = chunks[0]["Tissues"]["Names"].index("Liver")
+        ratios = [
+            chunk["Enzymes"]["InVivoEnzymeRates"][:, 0] / chunk["Enzymes"]["MPPGLs"] / chunk["Tissues"]["Values"][:, liver, 0]
+            for chunk in chunks
+        ]
+        np.testing.assert_allclose(np.concatenate(ratios), ratios[0][0])
+
+    def test_iter_pop_first_chunk_is_prompt(self):
+        # The streams of the later chunks are not made up front, so the first chunk of a vast population is quick
+        start = time.monotonic()
+        chunks = iter_pop(chunk_size=10, **{**INPUTS, "population_size": 10**8}, engine=Engine.Vectorized)
+        chunk, _ = next(chunks)
+        elapsed = time.monotonic() - start
+        chunks.close()
+
+        self.assertEqual(chunk["Roots"]["Values"].shape[0], 10)
+        self.assertLess(elapsed, 5.)
+
+    def test_iter_pop_validates_eagerly(self):
+        with self.assertRaises(ValueError):
+            iter_pop(chunk_size=100, **{**INPUTS, "age_range": (60, 18)})
+        with self.assertRaises(ValueError):
+            iter_pop(chunk_size=100, **INPUTS, workers=0)
+
+    def test_iter_pop_workers(self):
+        inputs = {**INPUTS, "enzyme_rate_parameter": "Vmax", "enzyme_names": ["CYP3A4"],
+                  "in_vitro_enzyme_rate_coeffs_of_var": [0.3], "enzyme_rate_units": "PicoMolsPerMinute"}
+        for engine in [Engine.Loop, Engine.Vectorized]:
+            with self.subTest(engine=engine):
+                expected = list(iter_pop(chunk_size=300, **inputs, engine=engine))
+                parallel_chunks = list(iter_pop(chunk_size=300, **inputs, engine=engine, workers=3))
+                self.assertEqual(len(parallel_chunks), len(expected))
+                for (chunk, discarded), (expected_chunk, expected_discarded) in zip(parallel_chunks, expected):
+                    np.testing.assert_array_equal(chunk["Roots"]["Values"], expected_chunk["Roots"]["Values"])
+                    np.testing.assert_array_equal(
+                        chunk["Enzymes"]["InVivoEnzymeRates"], expected_chunk["Enzymes"]["InVivoEnzymeRates"])
+                    self.assertEqual(discarded, expected_discarded)
+
+        # Stopping early shuts the workers down
+        chunks = iter_pop(chunk_size=100, **inputs, workers=2)
+        next(chunks)
+        chunks.close()
+
+    def test_extend_pop(self):
+        enzymes = {
+            "enzyme_rate_parameter": "Vmax",
+            "enzyme_names": ["CYP3A4", "CYP2D6"],
+            "in_vitro_enzyme_rates": [1., 2.],
+            "in_vitro_enzyme_rate_coeffs_of_var": [0.3, 0.3],
+            "enzyme_rate_units": "MicroMolsPerHour",
+            "flow_units": "LitresPerHour"
+        }
+        for is_liver_discrete in [True, False]:
+            with self.subTest(is_liver_discrete=is_liver_discrete):
+                inputs = {**INPUTS, **enzymes, "population_size": 300,
+                          "is_richly_perfused_tissue_discrete": is_liver_discrete}
+                expected, expected_discarded = generate_pop(**{**inputs, "population_size": 500})
+                pop, _ = generate_pop(**inputs)
+                assert expected is not None and pop is not None
+
+                extended, discarded = extend_pop(pop, 150)
+                extended, discarded = extend_pop(extended, 50)
+
+                self.assertEqual(pop["Roots"]["Values"].shape[0], 300)
+                self.assertEqual(discarded, expected_discarded)
+                self.assertEqual(extended["Diagnostics"], expected["Diagnostics"])
+                self.assertEqual(extended["Inputs"], expected["Inputs"])
+                np.testing.assert_array_equal(extended["Roots"]["Values"], expected["Roots"]["Values"])
+                np.testing.assert_array_equal(extended["Tissues"]["Values"], expected["Tissues"]["Values"])
+                np.testing.assert_array_equal(extended["Enzymes"]["MPPGLs"], expected["Enzymes"]["MPPGLs"])
+                np.testing.assert_array_equal(
+                    extended["Enzymes"]["InVivoEnzymeRates"], expected["Enzymes"]["InVivoEnzymeRates"])
+                np.testing.assert_equal(extended["Summary"], expected["Summary"])
+
+    def test_extend_pop_after_save_and_cut_short(self):
+        # With the liver aggregated, so that its masses are saved with the inputs
+        inputs = {**INPUTS, "population_size": 300, "enzyme_rate_parameter": "CLint", "enzyme_names": ["CYP3A4"],
+                  "in_vitro_enzyme_rates": [1.], "in_vitro_enzyme_rate_coeffs_of_var": [0.3],
+                  "enzyme_rate_units": "MicroLitresPerMinute"}
+        expected, _ = generate_pop(**inputs)
+        assert expected is not None
+
+        # Stopped part way, saved, then extended to the full size
+        pop, _ = generate_pop(**inputs, max_attempts=120)
+        assert pop is not None and pop["Diagnostics"]["StoppedBy"] == "MaxAttempts"
+        with tempfile.TemporaryDirectory() as directory:
+            save_pop(pop, directory)
+            loaded = load_pop(directory, mmap=False)
+            extended, _ = extend_pop(loaded, 300 - loaded["Roots"]["Values"].shape[0])
+
+        self.assertIsNone(extended["Diagnostics"]["StoppedBy"])
+        np.testing.assert_array_equal(extended["Roots"]["Values"], expected["Roots"]["Values"])
+        np.testing.assert_array_equal(extended["Enzymes"]["MPPGLs"], expected["Enzymes"]["MPPGLs"])
+        np.testing.assert_array_equal(
+            extended["Enzymes"]["InVivoEnzymeRates"], expected["Enzymes"]["InVivoEnzymeRates"])
+
+    def test_extend_pop_needs_loop_engine(self):
+        for options in [{"engine": Engine.Vectorized}, {"workers": 2}]:
+            with self.subTest(options=options):
+                pop, _ = generate_pop(**{**INPUTS, "population_size": 100}, **options)
+                assert pop is not None
+                self.assertNotIn("Resume", pop["Inputs"])
+                with self.assertRaises(ValueError):
+                    extend_pop(pop, 10)
+
+    def test_checkpoint_resumes(self):
+        for engine in [Engine.Loop, Engine.Vectorized]:
+            with self.subTest(engine=engine):
+                inputs = {**INPUTS, "population_size": 3000 if engine == Engine.Vectorized else 300, "engine": engine}
+                expected, expected_discarded = generate_pop(**inputs)
+                assert expected is not None
+
+                with tempfile.TemporaryDirectory() as directory:
+                    # A run that dies part way, after taking a checkpoint at every opportunity
+                    def die(generated: int, _: int) -> bool:
+                        if generated >= inputs["population_size"] // 2:
+                            raise RuntimeError("Evicted")
+                        return False
+
+                    with self.assertRaises(RuntimeError):
+                        generate_pop(**inputs, callback=die, progress_interval=0, checkpoint_dir=directory, checkpoint_every=0)
+                    self.assertEqual(len(list(Path(directory).glob('*.npz'))), 1)
+
+                    # The restarted run starts from the checkpoint
+                    generated = []
+
+                    def record(number_generated: int, _: int) -> bool:
+                        generated.append(number_generated)
+                        return False
+
+                    pop, discarded = generate_pop(**inputs, callback=record, progress_interval=0, checkpoint_dir=directory)
+                    assert pop is not None
+                    # The first report is of the start of sampling
+                    self.assertGreaterEqual(generated[1], inputs["population_size"] // 2 - 1)
+                    self.assertEqual(list(Path(directory).iterdir()), [])
+
+                self.assertEqual(discarded, expected_discarded)
+                self.assertEqual(pop["Diagnostics"], expected["Diagnostics"])
+                np.testing.assert_array_equal(pop["Roots"]["Values"], expected["Roots"]["Values"])
+                np.testing.assert_array_equal(pop["Tissues"]["Values"], expected["Tissues"]["Values"])
+                np.testing.assert_array_equal(pop["Enzymes"]["MPPGLs"], expected["Enzymes"]["MPPGLs"])
+
+    def test_checkpoint_when_stopped_early(self):
+        # The vectorized engine's last batch is cut short by max_attempts
+        for engine, population_size, max_attempts in [(Engine.Loop, 300, 100), (Engine.Vectorized, 3000, 1500)]:
+            with self.subTest(engine=engine):
+                inputs = {**INPUTS, "population_size": population_size, "engine": engine}
+                expected, expected_discarded = generate_pop(**inputs)
+                assert expected is not None
+
+                with tempfile.TemporaryDirectory() as directory:
+                    pop, _ = generate_pop(**inputs, max_attempts=max_attempts, checkpoint_dir=directory, checkpoint_every=0.)
+                    assert pop is not None and pop["Diagnostics"]["StoppedBy"] == "MaxAttempts"
+
+                    pop, discarded = generate_pop(**inputs, checkpoint_dir=directory)
+                    assert pop is not None
+                    self.assertIsNone(pop["Diagnostics"]["StoppedBy"])
+                    self.assertEqual(discarded, expected_discarded)
+                    np.testing.assert_array_equal(pop["Roots"]["Values"], expected["Roots"]["Values"])
+                    np.testing.assert_array_equal(pop["Tissues"]["Values"], expected["Tissues"]["Values"])
+
+    def test_checkpoint_needs_seed_and_one_worker(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for options in [{"seed": None}, {"workers": 2}]:
+                with self.subTest(options=options):
+                    with self.assertRaises(ValueError):
+                        generate_pop(**{**INPUTS, **options}, checkpoint_dir=directory)
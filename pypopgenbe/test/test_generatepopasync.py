@@ -0,0 +1,122 @@
+import asyncio
+import contextlib
+import multiprocessing
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+import numpy as np
+from pypopgenbe.generatepop import generate_pop, iter_pop
+from pypopgenbe.generatepopasync import generate_pop_async, iter_pop_async
+from pypopgenbe.impl.enum import Dataset, Engine, PoolType
+
+THIS_DIR = Path(__file__).parent
+
+INPUTS = {
+    "population_size": 500,
+    "dataset_name": Dataset.P3M,
+    "age_range": (18, 60),
+    "bmi_range": (20, 25),
+    "height_range": (120, 170),
+    "prob_of_male": 0.5,
+    "probs_of_ethnicities": (0.3, 0.4, 0.3),
+    "seed": 42
+}
+
+# Large enough that the loop engine would take minutes to finish
+SLOW_INPUTS = {**INPUTS, "population_size": 10**6, "engine": Engine.Loop}
+
+
+@unittest.skipUnless((THIS_DIR.parent / 'popgenconsts.pkl').exists(), "popgenconsts.pkl has not been built")
+class TestGeneratePopAsync(unittest.IsolatedAsyncioTestCase):
+
+    async def test_matches_generate_pop(self):
+        expected, expected_discarded = generate_pop(**INPUTS)
+        assert expected is not None
+
+        for executor in [None, PoolType.Thread, "process"]:
+            with self.subTest(executor=executor):
+                results = await asyncio.gather(*[generate_pop_async(**INPUTS, executor=executor) for _ in range(3)])
+                for pop, discarded in results:
+                    assert pop is not None
+                    np.testing.assert_array_equal(pop["Roots"]["Values"], expected["Roots"]["Values"])
+                    self.assertEqual(discarded, expected_discarded)
+
+    async def test_cancellation_stops_sampling(self):
+        for executor, workers in [(None, 1), ("process", 1), (None, 2), ("process", 2)]:
+            with self.subTest(executor=executor, workers=workers):
+                task = asyncio.create_task(generate_pop_async(**SLOW_INPUTS, executor=executor, workers=workers))
+                await asyncio.sleep(0.5)
+
+                start = time.monotonic()
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+                # The task only ends once the executor has stopped sampling
+                self.assertLess(time.monotonic() - start, 5.)
+
+    async def test_own_executor_is_free_after_cancellation(self):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            task = asyncio.create_task(generate_pop_async(**SLOW_INPUTS, executor=executor))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+            pop, _ = await asyncio.wait_for(generate_pop_async(**INPUTS, executor=executor), timeout=30.)
+            assert pop is not None
+
+    async def test_errors_are_raised(self):
+        with self.assertRaises(ValueError):
+            await generate_pop_async(**{**INPUTS, "prob_of_male": 2.})
+
+    async def test_iter_pop_async_matches_iter_pop(self):
+        expected = list(iter_pop(chunk_size=200, **INPUTS))
+
+        for executor in [PoolType.Thread, PoolType.Process]:
+            with self.subTest(executor=executor):
+                chunks = [chunk async for chunk in iter_pop_async(200, executor=executor, **INPUTS)]
+                self.assertEqual(len(chunks), len(expected))
+                for (chunk, discarded), (expected_chunk, expected_discarded) in zip(chunks, expected):
+                    np.testing.assert_array_equal(chunk["Roots"]["Values"], expected_chunk["Roots"]["Values"])
+                    self.assertEqual(discarded, expected_discarded)
+
+    async def test_iter_pop_async_stops_early(self):
+        for executor in [PoolType.Thread, PoolType.Process]:
+            with self.subTest(executor=executor):
+                start = time.monotonic()
+                async with contextlib.aclosing(iter_pop_async(1000, executor=executor, **SLOW_INPUTS)) as chunks:
+                    async for chunk, _ in chunks:
+                        self.assertEqual(chunk["Roots"]["Values"].shape[0], 1000)
+                        break
+                self.assertLess(time.monotonic() - start, 30.)
+
+    async def test_iter_pop_async_closes_chunks_early(self):
+        # Held here, so that only iter_pop_async can close the generator
+        generators = []
+
+        def tracked_iter_pop(*args, **kwargs):
+            generators.append(iter_pop(*args, **kwargs))
+            return generators[-1]
+
+        children = set(multiprocessing.active_children())
+        with mock.patch('pypopgenbe.generatepopasync.iter_pop', tracked_iter_pop):
+            async with contextlib.aclosing(iter_pop_async(100, workers=2, **INPUTS)) as chunks:
+                async for _ in chunks:
+                    break
+
+        # The generator and its worker pool are released by the time the iteration is closed
+        self.assertIsNone(generators[0].gi_frame)
+        self.assertLessEqual(set(multiprocessing.active_children()), children)
+
+    async def test_iter_pop_async_errors_are_raised(self):
+        for executor in [PoolType.Thread, PoolType.Process]:
+            with self.subTest(executor=executor):
+                with self.assertRaises(ValueError):
+                    async for _ in iter_pop_async(100, executor=executor, **{**INPUTS, "prob_of_male": 2.}):
+                        pass
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import numpy as np
+from pypopgenbe.generatepop import generate_pop
+from pypopgenbe.generatepops import generate_pops
+from pypopgenbe.impl.enum import Dataset, Engine
+
+THIS_DIR = Path(__file__).parent
+
+INPUTS = {
+    "population_size": 300,
+    "dataset_name": Dataset.P3M,
+    "age_range": (18, 60),
+    "bmi_range": (20, 25),
+    "height_range": (120, 170),
+    "prob_of_male": 0.5,
+    "probs_of_ethnicities": (0.3, 0.4, 0.3),
+    "seed": 42,
+    "engine": Engine.Vectorized
+}
+
+SCENARIOS = [
+    INPUTS,
+    {**INPUTS, "dataset_name": "NDNS", "age_range": (2, 4), "height_range": (80, 110), "bmi_range": (14, 20), "probs_of_ethnicities": None},
+    {**INPUTS, "prob_of_male": 2.},
+    {**INPUTS, "population_size": 1000, "enzyme_rate_parameter": "Vmax", "enzyme_names": ["CYP3A4"],
+     "enzyme_rate_units": "PicoMolsPerMinute"},
+    {**INPUTS, "unknown_argument": 1}
+]
+
+
+@unittest.skipUnless((THIS_DIR.parent / 'popgenconsts.pkl').exists(), "popgenconsts.pkl has not been built")
+class TestGeneratePops(unittest.TestCase):
+
+    def test_results_match_generate_pop(self):
+        results = list(generate_pops(SCENARIOS, workers=2))
+
+        self.assertEqual([result.scenario_index for result in results], list(range(len(SCENARIOS))))
+        for result in results:
+            with self.subTest(index=result.scenario_index):
+                if result.scenario_index in (2, 4):
+                    # Failures are captured without stopping the other scenarios
+                    self.assertIsNone(result.population)
+                    self.assertIsInstance(result.error, (ValueError, TypeError))
+                    continue
+
+                self.assertIsNone(result.error)
+                assert result.population is not None
+                expected, expected_discarded = generate_pop(**SCENARIOS[result.scenario_index])
+                assert expected is not None
+                np.testing.assert_array_equal(result.population["Roots"]["Values"], expected["Roots"]["Values"])
+                self.assertEqual(result.number_of_individuals_discarded, expected_discarded)
+
+    def test_as_completed(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(generate_pops(SCENARIOS, ordered=False, executor=executor))
+            self.assertEqual(sorted(result.scenario_index for result in results), list(range(len(SCENARIOS))))
+
+            # The executor is the caller's and is left running
+            self.assertEqual(executor.submit(sum, [1, 2]).result(), 3)
+
+    def test_failure_does_not_stop_others(self):
+        results = list(generate_pops([{**INPUTS, "enzyme_names": ["CYP3A4"]}, INPUTS], workers=1))
+        self.assertIsInstance(results[0].error, ValueError)
+        self.assertIsNone(results[1].error)
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            generate_pops(SCENARIOS, workers=0)
+
+    def test_scenario_workers_are_rejected(self):
+        # Scenarios run in the pool's own processes rather than starting pools of their own
+        results = list(generate_pops([{**INPUTS, "workers": 2}, INPUTS], workers=1))
+        self.assertIsInstance(results[0].error, ValueError)
+        self.assertIsNone(results[1].error)
+
+    def test_cache_and_checkpoint_arguments(self):
+        expected, expected_discarded = generate_pop(**INPUTS)
+        assert expected is not None
+
+        with tempfile.TemporaryDirectory() as cache_dir, tempfile.TemporaryDirectory() as checkpoint_dir:
+            scenarios = [{**INPUTS, "cache": cache_dir}, {**INPUTS, "cache": cache_dir},
+                         {**INPUTS, "checkpoint_dir": checkpoint_dir, "checkpoint_every": 1.}]
+            results = list(generate_pops(scenarios, workers=1))
+
+            for result in results:
+                with self.subTest(index=result.scenario_index):
+                    self.assertIsNone(result.error)
+                    assert result.population is not None
+                    np.testing.assert_array_equal(result.population["Roots"]["Values"], expected["Roots"]["Values"])
+                    self.assertEqual(result.number_of_individuals_discarded, expected_discarded)
+            self.assertTrue(any(Path(cache_dir).iterdir()))
+
+
+if __name__ == '__main__':
+    unittest.main()
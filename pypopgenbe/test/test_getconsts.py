@@ -0,0 +1,83 @@
+import importlib.util
+import pickle
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+import numpy as np
+from pypopgenbe.impl import getconsts
+from pypopgenbe.impl.getconsts import (
+    CONSTS_PATH, PACKAGE_DIR, _BUILD_SCRIPT, build_consts, get_consts, get_compiled, hash_consts_sources
+)
+from pypopgenbe.impl.compileanthropometriccurves import compile_anthropometric_curves
+from pypopgenbe.impl.compileorganvariation import compile_organ_variation
+
+THIS_DIR = Path(__file__).parent
+
+
+@unittest.skipUnless((THIS_DIR.parent / 'popgenconsts.pkl').exists(), "popgenconsts.pkl has not been built")
+class TestGetConsts(unittest.TestCase):
+
+    def test_loaded_once(self):
+        self.assertIs(get_consts(), get_consts())
+
+    def test_read_only(self):
+        CONSTS = get_consts()
+        with self.assertRaises(ValueError):
+            CONSTS["ORGAN"]["Mass"]["Mean"][0][0] = 0.
+        with self.assertRaises(ValueError):
+            CONSTS["INDEX"]["AllProperties"][0] = 1
+
+    def test_built_from_current_sources(self):
+        source_hash = hash_consts_sources()
+        if source_hash is not None:
+            self.assertEqual(get_consts()["SOURCE_HASH"], source_hash)
+
+    def test_build_when_up_to_date(self):
+        source_hash = hash_consts_sources()
+        if source_hash is None:
+            self.skipTest("The sources of the constants are not present")
+
+        get_consts()
+        modified = CONSTS_PATH.stat().st_mtime_ns
+        self.assertEqual(build_consts()["SOURCE_HASH"], source_hash)
+        self.assertEqual(CONSTS_PATH.stat().st_mtime_ns, modified)
+
+    @unittest.skipUnless(importlib.util.find_spec('pandas'), "pandas is needed to build the constants")
+    def test_define_consts_stamps_source_hash(self):
+        source_hash = hash_consts_sources()
+        if source_hash is None:
+            self.skipTest("The sources of the constants are not present")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pkl_path = Path(temp_dir) / 'popgenconsts.pkl'
+            subprocess.run([sys.executable, '-c', _BUILD_SCRIPT, str(pkl_path)], cwd=PACKAGE_DIR, check=True,
+                           stdout=subprocess.DEVNULL)
+            with open(pkl_path, 'rb') as f:
+                self.assertEqual(pickle.load(f)["SOURCE_HASH"], source_hash)
+
+    def test_failed_rebuild_uses_existing_constants(self):
+        expected = get_consts()
+        with mock.patch.object(getconsts, '_consts', None), \
+                mock.patch.object(getconsts, 'hash_consts_sources', return_value='stale'), \
+                mock.patch.object(getconsts.subprocess, 'run', side_effect=subprocess.CalledProcessError(1, 'build')):
+            with self.assertWarns(RuntimeWarning):
+                CONSTS = get_consts()
+        self.assertEqual(CONSTS["ORGAN"]["Names"], expected["ORGAN"]["Names"])
+
+    def test_compiled_once(self):
+        curves = get_compiled(compile_anthropometric_curves)
+        self.assertIs(get_compiled(compile_anthropometric_curves), curves)
+        self.assertFalse(curves["Coeffs"].flags.writeable)
+
+        mass_variation = get_compiled(compile_organ_variation, "Mass")
+        flow_variation = get_compiled(compile_organ_variation, "Flow")
+        self.assertIsNot(mass_variation, flow_variation)
+        np.testing.assert_array_equal(
+            mass_variation["Sigma"], compile_organ_variation(get_consts(), "Mass")["Sigma"])
+
+
+if __name__ == '__main__':
+    unittest.main()
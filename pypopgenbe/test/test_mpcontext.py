@@ -0,0 +1,29 @@
+import multiprocessing
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+
+
+class TestMpContext(unittest.TestCase):
+
+    @unittest.skipUnless('forkserver' in multiprocessing.get_all_start_methods(), "forkserver is not available")
+    def test_keeps_application_preload(self):
+        # In a fresh interpreter, as the forkserver and its preloads are shared by the whole process
+        code = (
+            'import multiprocessing\n'
+            'from multiprocessing import forkserver\n'
+            'from pypopgenbe.impl.mpcontext import mp_context\n'
+            'multiprocessing.set_forkserver_preload(["json"])\n'
+            'assert mp_context() is mp_context()\n'
+            'print(" ".join(forkserver._forkserver._preload_modules))'
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.split(), ['json', 'pypopgenbe.generatepop'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+import numpy as np
+from pypopgenbe.generatepop import generate_pop
+from pypopgenbe.impl.popcache import PopCache
+from pypopgenbe.impl.enum import Dataset, Engine
+
+THIS_DIR = Path(__file__).parent
+
+INPUTS = {
+    "population_size": 50,
+    "dataset_name": Dataset.HSE,
+    "age_range": (18, 60),
+    "bmi_range": (20, 25),
+    "height_range": (120, 170),
+    "prob_of_male": 0.5,
+    "probs_of_ethnicities": (0.3, 0.4, 0.3),
+    "enzyme_rate_parameter": "CLint",
+    "enzyme_names": ["CYP3A4", "CYP2D6"],
+    "in_vitro_enzyme_rates": [1., 2.],
+    "in_vitro_enzyme_rate_coeffs_of_var": [0.3, 0.3],
+    "enzyme_rate_units": "MicroLitresPerMinute",
+    "seed": 5,
+    "engine": Engine.Vectorized
+}
+
+
+@unittest.skipUnless((THIS_DIR.parent / 'popgenconsts.pkl').exists(), "popgenconsts.pkl has not been built")
+class TestPopCache(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = Path(temp_dir.name) / 'cache'
+
+    def entries(self):
+        return [p for p in self.directory.iterdir() if not p.name.startswith('.')]
+
+    def test_hit(self):
+        expected, expected_discarded = generate_pop(**INPUTS, cache=self.directory)
+        assert expected is not None
+        self.assertEqual(len(self.entries()), 1)
+
+        # The same inputs, spelt differently
+        pop, discarded = generate_pop(**{**INPUTS, "age_range": (18., 60.), "engine": "vectorized"}, cache=self.directory)
+        assert pop is not None
+        self.assertEqual(len(self.entries()), 1)
+        self.assertEqual(discarded, expected_discarded)
+        self.assertIsInstance(pop["Tissues"]["Values"], np.memmap)
+        for group, key in [('Roots', 'Values'), ('Tissues', 'Values'), ('Enzymes', 'MPPGLs'), ('Enzymes', 'InVivoEnzymeRates')]:
+            np.testing.assert_array_equal(pop[group][key], expected[group][key])
+        self.assertEqual(pop["Diagnostics"], expected["Diagnostics"])
+
+    def test_miss(self):
+        generate_pop(**INPUTS, cache=self.directory)
+        for changes in [{"seed": 6}, {"in_vitro_enzyme_rates": [1., 3.]}, {"engine": Engine.Loop}, {"workers": 2}]:
+            with self.subTest(changes=changes):
+                pop, _ = generate_pop(**{**INPUTS, **changes}, cache=self.directory)
+                assert pop is not None
+                self.assertNotIsInstance(pop["Tissues"]["Values"], np.memmap)
+        self.assertEqual(len(self.entries()), 5)
+
+    def test_not_cached(self):
+        # No seed, or a population cut short
+        generate_pop(**{**INPUTS, "seed": None}, cache=self.directory)
+        generate_pop(**{**INPUTS, "max_attempts": 10}, cache=self.directory)
+        self.assertFalse(self.directory.exists() and self.entries())
+
+    def test_lru_eviction(self):
+        generate_pop(**INPUTS, cache=self.directory)
+        (entry_5,) = self.entries()
+        size = sum(f.stat().st_size for f in entry_5.iterdir())
+        cache = PopCache(self.directory, max_bytes=int(2.5 * size))
+
+        generate_pop(**{**INPUTS, "seed": 1}, cache=cache)
+        (entry_1,) = set(self.entries()) - {entry_5}
+
+        # Seed 1 was saved last, but seed 5 is used again after it, so seed 1 is evicted when seed 2 is saved
+        now = entry_5.stat().st_mtime
+        os.utime(entry_5 / 'manifest.json', (now - 100, now - 100))
+        os.utime(entry_1 / 'manifest.json', (now - 50, now - 50))
+        pop, _ = generate_pop(**INPUTS, cache=cache)
+        assert pop is not None
+        self.assertIsInstance(pop["Tissues"]["Values"], np.memmap)
+        generate_pop(**{**INPUTS, "seed": 2}, cache=cache)
+
+        self.assertEqual(len(self.entries()), 2)
+        self.assertIn(entry_5, self.entries())
+        self.assertNotIn(entry_1, self.entries())
+
+    def test_concurrent_puts(self):
+        results = []
+
+        def run():
+            results.append(generate_pop(**INPUTS, cache=self.directory))
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 4)
+        self.assertEqual(len(self.entries()), 1)
+        self.assertEqual(os.listdir(self.directory), [self.entries()[0].name])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import io
+import json
+import unittest
+from pathlib import Path
+import numpy as np
+from pypopgenbe.generatepop import generate_pop, iter_pop
+from pypopgenbe.impl.popwriter import PopWriter
+from pypopgenbe.impl.summaryaccumulator import SummaryAccumulator
+from pypopgenbe.impl.writepopcsv import write_pop_csv
+
+THIS_DIR = Path(__file__).parent
+
+INPUTS = {
+    "population_size": 500,
+    "dataset_name": "P3M",
+    "age_range": (18, 60),
+    "bmi_range": (20, 25),
+    "height_range": (120, 170),
+    "prob_of_male": 0.5,
+    "probs_of_ethnicities": (0.3, 0.4, 0.3),
+    "enzyme_rate_parameter": "Vmax",
+    "enzyme_names": ["CYP3A4", "CYP2D6"],
+    "enzyme_rate_units": "PicoMolsPerMinute",
+    "seed": 42
+}
+
+
+def write_chunks(chunks, output_format) -> bytes:
+    fh = io.BytesIO()
+    writer = PopWriter(fh, output_format)
+    for chunk in chunks:
+        writer.write(chunk)
+    writer.close()
+    return fh.getvalue()
+
+
+@unittest.skipUnless((THIS_DIR.parent / 'popgenconsts.pkl').exists(), "popgenconsts.pkl has not been built")
+class TestPopWriter(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pop, _ = generate_pop(**INPUTS)
+        cls.chunks = [chunk for chunk, _ in iter_pop(chunk_size=200, **INPUTS)]
+
+    def test_csv_in_one_chunk_matches_write_pop_csv(self):
+        expected = io.BytesIO()
+        write_pop_csv(self.pop, expected)
+        self.assertEqual(write_chunks([self.pop], 'csv'), expected.getvalue())
+
+    def test_csv_in_chunks(self):
+        lines = write_chunks(self.chunks, 'csv').decode('utf-8').splitlines()
+
+        # One header, then the individuals numbered across the chunks
+        rows = lines[1:501]
+        self.assertEqual([int(row.split(',')[0]) for row in rows], list(range(1, 501)))
+        first_chunk = io.StringIO()
+        write_pop_csv(self.chunks[0], first_chunk)
+        self.assertEqual(lines[:201], first_chunk.getvalue().splitlines()[:201])
+
+        # The summary is that of all the chunks
+        summary = SummaryAccumulator()
+        for chunk in self.chunks:
+            summary.update(chunk)
+        male_mean = lines[501].split(',')
+        self.assertEqual(male_mean[5:7], ['Male', 'Mean'])
+        np.testing.assert_allclose(
+            float(male_mean[-1]), summary.summary()['Male']['InVivoEnzymeRate']['Mean'][-1])
+        self.assertEqual(lines[-1], ',Enzyme Rate,picomolsperminute')
+
+    def test_jsonl(self):
+        lines = write_chunks(self.chunks, 'jsonl').decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 501)
+
+        records = [json.loads(line) for line in lines[:500]]
+        self.assertEqual([record['Individual No.'] for record in records], list(range(1, 501)))
+        self.assertIn(records[0]['Sex'], ['Male', 'Female'])
+        roots = np.concatenate([chunk['Roots']['Values'] for chunk in self.chunks])
+        np.testing.assert_array_equal([record['Age'] for record in records], roots[:, 0])
+        np.testing.assert_array_equal(
+            [record['CYP2D6'] for record in records],
+            np.concatenate([chunk['Enzymes']['InVivoEnzymeRates'][:, 1] for chunk in self.chunks])
+        )
+
+        footer = json.loads(lines[-1])
+        self.assertEqual(footer['Inputs']['Population']['Size'], 500)
+        self.assertEqual(len(footer['Summary']['Female']['Mass']['Median']), len(self.pop['Tissues']['Names']))
+
+    def test_npy(self):
+        fh = io.BytesIO(write_chunks(self.chunks, 'npy'))
+
+        names = np.load(fh)
+        blocks = [np.load(fh) for _ in self.chunks]
+        labels = np.load(fh)
+        summary = np.load(fh)
+        inputs = json.loads(str(np.load(fh)))
+        self.assertEqual(fh.read(), b'')
+
+        rows = np.concatenate(blocks)
+        self.assertEqual(rows.shape, (500, len(names)))
+        np.testing.assert_array_equal(rows[:, 0], np.arange(1, 501))
+        np.testing.assert_array_equal(rows[:, 1:7], np.concatenate([chunk['Roots']['Values'] for chunk in self.chunks]))
+        self.assertEqual(list(names[-3:]), ['MPPGL', 'CYP3A4', 'CYP2D6'])
+
+        self.assertEqual(labels[0], 'Male Mean')
+        self.assertEqual(summary.shape, (18, len(names)))
+        self.assertTrue(np.all(np.isnan(summary[:, :7])))
+        self.assertEqual(inputs['Population']['Seed'], 42)
+
+    def test_nothing_written(self):
+        self.assertEqual(write_chunks([], 'csv'), b'')
+
+
+if __name__ == '__main__':
+    unittest.main()
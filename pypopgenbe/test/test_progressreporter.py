@@ -0,0 +1,62 @@
+import math
+import unittest
+from pypopgenbe.impl.enum import Stage
+from pypopgenbe.impl.progressreporter import ProgressReporter
+
+
+class TestProgressReporter(unittest.TestCase):
+
+    def test_reports_each_fraction(self):
+        reports = []
+        reporter = ProgressReporter(1000, progress=lambda p: reports.append(p) or False, interval=3600., fraction=0.1)
+        for generated in range(1001):
+            reporter.update(generated, 2 * generated)
+
+        self.assertEqual([p.generated for p in reports], list(range(100, 1001, 100)))
+        self.assertEqual(reports[-1].discarded, 2000)
+        self.assertAlmostEqual(reports[-1].acceptance_rate, 1. / 3.)
+        self.assertEqual(reports[-1].eta_seconds, 0.)
+        self.assertAlmostEqual(reports[0].fraction_complete, 0.1)
+
+    def test_reports_over_time_without_acceptances(self):
+        reports = []
+        reporter = ProgressReporter(1000, progress=lambda p: reports.append(p) or False, interval=0., fraction=1.)
+        for discarded in range(1, 6):
+            reporter.update(0, discarded)
+
+        self.assertEqual([p.discarded for p in reports], [1, 2, 3, 4, 5])
+        self.assertTrue(all(p.stage == Stage.Sampling for p in reports))
+        self.assertTrue(math.isnan(reports[-1].eta_seconds))
+        self.assertEqual(reports[-1].acceptance_rate, 0.)
+
+    def test_stages_are_always_reported(self):
+        reports = []
+        calls = []
+        reporter = ProgressReporter(
+            10,
+            callback=lambda generated, discarded: calls.append((generated, discarded)) or False,
+            progress=lambda p: reports.append(p.stage) or False,
+            interval=3600.
+        )
+        for stage in Stage:
+            reporter.set_stage(stage)
+
+        self.assertEqual(reports, list(Stage))
+        # The callback of two ints only hears about sampling
+        self.assertEqual(calls, [(0, 0)])
+
+    def test_cancel(self):
+        for kwargs in [{"callback": lambda generated, _: generated >= 5}, {"progress": lambda p: p.generated >= 5}]:
+            with self.subTest(kwargs=list(kwargs)):
+                reporter = ProgressReporter(10, interval=3600., fraction=0.1, **kwargs)
+                self.assertEqual([reporter.update(generated, 0) for generated in range(7)], [False] * 5 + [True] * 2)
+                self.assertTrue(reporter.is_cancelled)
+
+    def test_cancel_is_ignored_after_sampling(self):
+        reporter = ProgressReporter(10, progress=lambda p: True)
+        self.assertFalse(reporter.set_stage(Stage.Stats))
+        self.assertFalse(reporter.is_cancelled)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+import numpy as np
+from pypopgenbe.generatepop import generate_pop
+from pypopgenbe.impl.savepop import save_pop
+from pypopgenbe.impl.loadpop import load_pop
+from pypopgenbe.impl.writepopcsv import write_pop_csv
+from pypopgenbe.impl.enum import Dataset, Engine
+
+THIS_DIR = Path(__file__).parent
+
+INPUTS = {
+    "population_size": 50,
+    "dataset_name": Dataset.HSE,
+    "age_range": (18, 60),
+    "bmi_range": (20, 25),
+    "height_range": (120, 170),
+    "prob_of_male": 0.5,
+    "probs_of_ethnicities": (0.3, 0.4, 0.3),
+    "enzyme_rate_parameter": "CLint",
+    "enzyme_names": ["CYP3A4", "CYP2D6"],
+    "in_vitro_enzyme_rates": [1., 2.],
+    "in_vitro_enzyme_rate_coeffs_of_var": [0.3, 0.3],
+    "enzyme_rate_units": "MicroLitresPerMinute",
+    "is_richly_perfused_tissue_discrete": True,
+    "seed": 5,
+    "engine": Engine.Vectorized
+}
+
+
+@unittest.skipUnless((THIS_DIR.parent / 'popgenconsts.pkl').exists(), "popgenconsts.pkl has not been built")
+class TestSavePop(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = Path(temp_dir.name) / 'pop'
+
+    def assert_same_pop(self, expected, actual):
+        self.assertEqual(expected.keys(), actual.keys())
+        for k in expected:
+            if isinstance(expected[k], dict):
+                self.assert_same_pop(expected[k], actual[k])
+            elif isinstance(expected[k], np.ndarray) or isinstance(expected[k], np.floating):
+                np.testing.assert_array_equal(actual[k], expected[k])
+            else:
+                self.assertEqual(actual[k], expected[k])
+
+    def test_round_trip(self):
+        pop, _ = generate_pop(**INPUTS)
+        save_pop(pop, self.directory)
+
+        for mmap in [True, False]:
+            with self.subTest(mmap=mmap):
+                loaded = load_pop(self.directory, mmap=mmap)
+                self.assert_same_pop(pop, loaded)
+                self.assertEqual(isinstance(loaded['Tissues']['Values'], np.memmap), mmap)
+
+                expected_csv, actual_csv = io.StringIO(), io.StringIO()
+                write_pop_csv(pop, expected_csv)
+                write_pop_csv(loaded, actual_csv)
+                self.assertEqual(actual_csv.getvalue(), expected_csv.getvalue())
+
+    def test_columns_are_contiguous(self):
+        pop, _ = generate_pop(**INPUTS)
+        save_pop(pop, self.directory)
+        tissues = load_pop(self.directory)['Tissues']['Values']
+        self.assertTrue(tissues[:, 3, 0].flags['C_CONTIGUOUS'])
+
+    def test_without_enzymes(self):
+        inputs = {k: v for k, v in INPUTS.items() if not k.startswith(('enzyme', 'in_vitro'))}
+        pop, _ = generate_pop(**inputs)
+        save_pop(pop, self.directory)
+        loaded = load_pop(self.directory)
+        self.assert_same_pop(pop, loaded)
+        self.assertEqual(loaded['Enzymes']['InVivoEnzymeRates'].shape, (50, 0))
+
+    def test_interrupted_overwrite(self):
+        pop, _ = generate_pop(**INPUTS)
+        save_pop(pop, self.directory)
+
+        other, _ = generate_pop(**{**INPUTS, "seed": 6})
+        with mock.patch('pypopgenbe.impl.savepop.np.save', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                save_pop(other, self.directory)
+
+        # The old manifest is gone, so the old names and Inputs are not paired with the new arrays
+        with self.assertRaises(ValueError):
+            load_pop(self.directory)
+
+        save_pop(other, self.directory)
+        self.assert_same_pop(other, load_pop(self.directory))
+        self.assertEqual([path.name for path in self.directory.glob('.*')], [])
+
+    def test_missing(self):
+        with self.assertRaises(ValueError):
+            load_pop(self.directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+import http.client
+import io
+import json
+import os
+import signal
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+from pypopgenbe.generatepop import iter_pop
+from pypopgenbe.impl.enum import Engine
+from pypopgenbe.impl.inputsfromjson import inputs_from_json
+from pypopgenbe.impl.popwriter import PopWriter
+from pypopgenbe.serve import PopGenServer
+
+THIS_DIR = Path(__file__).parent
+
+INPUTS = {
+    "population_size": 500,
+    "dataset_name": "P3M",
+    "age_range": [18, 60],
+    "bmi_range": [20, 25],
+    "height_range": [120, 170],
+    "prob_of_male": 0.5,
+    "probs_of_ethnicities": [0.3, 0.4, 0.3],
+    "seed": 42
+}
+
+# Large enough that the loop engine would take minutes to finish
+SLOW_INPUTS = {**INPUTS, "population_size": 10**5, "engine": Engine.Loop.value}
+
+
+@unittest.skipUnless((THIS_DIR.parent / 'popgenconsts.pkl').exists(), "popgenconsts.pkl has not been built")
+class TestServe(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = PopGenServer(('127.0.0.1', 0), workers=2, max_body_bytes=10000, verbose=False)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.thread.join()
+        cls.server.server_close()
+
+    def connect(self) -> http.client.HTTPConnection:
+        host, port = self.server.server_address[:2]
+        return http.client.HTTPConnection(host, port, timeout=60)
+
+    def post(self, path: str, inputs) -> http.client.HTTPResponse:
+        connection = self.connect()
+        self.addCleanup(connection.close)
+        connection.request('POST', path, json.dumps(inputs), {'Content-Type': 'application/json'})
+        return connection.getresponse()
+
+    def test_csv_matches_pop_writer(self):
+        expected = io.BytesIO()
+        writer = PopWriter(expected)
+        for chunk, _ in iter_pop(200, **inputs_from_json(dict(INPUTS))):
+            writer.write(chunk)
+        writer.close()
+
+        response = self.post('/generate?chunk_size=200', INPUTS)
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.getheader('Transfer-Encoding'), 'chunked')
+        self.assertEqual(response.read(), expected.getvalue())
+
+    def test_small_chunk_size_is_raised(self):
+        # Chunk k is sampled from its own stream, so the population shows the chunk size it was generated in
+        expected = io.BytesIO()
+        writer = PopWriter(expected)
+        for chunk, _ in iter_pop(125, **inputs_from_json(dict(INPUTS))):
+            writer.write(chunk)
+        writer.close()
+
+        with mock.patch('pypopgenbe.serve._MAX_CHUNKS_PER_REQUEST', 4):
+            response = self.post('/generate?chunk_size=1', INPUTS)
+            self.assertEqual(response.status, 200)
+            self.assertEqual(response.read(), expected.getvalue())
+
+    def test_jsonl(self):
+        response = self.post('/generate?format=jsonl&chunk_size=100', INPUTS)
+        self.assertEqual(response.status, 200)
+        lines = response.read().decode('utf-8').splitlines()
+        self.assertEqual(len(lines), INPUTS["population_size"] + 1)
+        self.assertEqual(json.loads(lines[-1])["Inputs"]["Population"]["Size"], INPUTS["population_size"])
+
+    def test_errors(self):
+        cases = [
+            ('/generate', {**INPUTS, "prob_of_male": 2.}, 400),
+            ('/generate', {**INPUTS, "workers": 4}, 400),
+            ('/generate', {**INPUTS, "deadline_seconds": 4}, 400),
+            ('/generate', [1, 2], 400),
+            ('/generate?format=xml', INPUTS, 400),
+            ('/generate?chunk_size=0', INPUTS, 400),
+            ('/generate', {**INPUTS, "population_size": 10**7}, 413),
+            ('/generate', {**INPUTS, "enzyme_names": ["x" * 10000]}, 413),
+            ('/nowhere', INPUTS, 404),
+        ]
+        for path, inputs, status in cases:
+            with self.subTest(path=path, inputs=inputs):
+                response = self.post(path, inputs)
+                self.assertEqual(response.status, status)
+                self.assertIn('error', json.loads(response.read()))
+
+    def test_health(self):
+        connection = self.connect()
+        self.addCleanup(connection.close)
+        connection.request('GET', '/health')
+        response = connection.getresponse()
+        self.assertEqual(response.status, 200)
+        self.assertEqual(json.loads(response.read())['workers'], 2)
+
+    def test_time_limit(self):
+        # Nothing is sent before the first chunk, which would take minutes
+        start = time.monotonic()
+        response = self.post('/generate?time_limit=0.5&chunk_size=1000000', SLOW_INPUTS)
+        self.assertEqual(response.status, 504)
+        response.read()
+        self.assertLess(time.monotonic() - start, 30.)
+
+        # Cut short after the first chunks, even when they come faster than the server polls. The time limit
+        # allows a few chunks at the speed of this machine, and the population takes a thousand or more.
+        for chunk_size in [100, 10]:
+            with self.subTest(chunk_size=chunk_size):
+                chunks = iter_pop(chunk_size, **inputs_from_json(dict(SLOW_INPUTS)))
+                start = time.monotonic()
+                next(chunks)
+                time_limit = 1. + 5. * (time.monotonic() - start)
+                chunks.close()
+
+                start = time.monotonic()
+                response = self.post(f'/generate?time_limit={time_limit}&chunk_size={chunk_size}', SLOW_INPUTS)
+                self.assertEqual(response.status, 200)
+                with self.assertRaises(http.client.IncompleteRead):
+                    response.read()
+                self.assertLess(time.monotonic() - start, 30.)
+
+    def test_disconnect_frees_the_worker(self):
+        # Take every worker, then hang up
+        for _ in range(self.server.workers):
+            connection = self.connect()
+            connection.request('POST', '/generate?chunk_size=1000', json.dumps(SLOW_INPUTS))
+            response = connection.getresponse()
+            self.assertEqual(response.status, 200)
+            response.read(1000)
+            connection.close()
+
+        start = time.monotonic()
+        response = self.post('/generate', INPUTS)
+        self.assertEqual(response.status, 200)
+        response.read()
+        self.assertLess(time.monotonic() - start, 30.)
+
+
+@unittest.skipUnless((THIS_DIR.parent / 'popgenconsts.pkl').exists(), "popgenconsts.pkl has not been built")
+class TestServeWorkerDeath(unittest.TestCase):
+
+    def setUp(self):
+        self.server = PopGenServer(('127.0.0.1', 0), workers=1, verbose=False)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.shutdown)
+
+    def request(self, method: str, path: str, inputs=None) -> http.client.HTTPResponse:
+        host, port = self.server.server_address[:2]
+        connection = http.client.HTTPConnection(host, port, timeout=60)
+        self.addCleanup(connection.close)
+        connection.request(method, path, None if inputs is None else json.dumps(inputs))
+        return connection.getresponse()
+
+    def kill_worker(self):
+        for pid in list(self.server.executor._processes):
+            os.kill(pid, signal.SIGKILL)
+
+    def test_worker_dies_while_streaming(self):
+        start = time.monotonic()
+        response = self.request('POST', '/generate?chunk_size=100', SLOW_INPUTS)
+        self.assertEqual(response.status, 200)
+        response.read(1000)
+
+        self.kill_worker()
+        with self.assertRaises(http.client.IncompleteRead):
+            response.read()
+        self.assertLess(time.monotonic() - start, 30.)
+
+        # The pool has been replaced
+        self.assertEqual(self.request('GET', '/health').status, 200)
+        response = self.request('POST', '/generate', INPUTS)
+        self.assertEqual(response.status, 200)
+        response.read()
+
+    def test_worker_dies_while_idle(self):
+        self.kill_worker()
+        deadline = time.monotonic() + 30.
+        while True:
+            response = self.request('GET', '/health')
+            body = json.loads(response.read())
+            if response.status == 503 or time.monotonic() > deadline:
+                break
+            time.sleep(0.05)
+        self.assertEqual(response.status, 503)
+        self.assertEqual(body['status'], 'broken')
+
+        response = self.request('POST', '/generate', INPUTS)
+        self.assertEqual(response.status, 503)
+        self.assertIn('error', json.loads(response.read()))
+
+        response = self.request('POST', '/generate', INPUTS)
+        self.assertEqual(response.status, 200)
+        response.read()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+THIS_DIR = Path(__file__).parent
+ROOT_DIR = THIS_DIR.parent.parent
+
+
+def modules_loaded_by(code: str) -> set:
+    """Runs code in a fresh interpreter and returns the names of the modules it has loaded."""
+    result = subprocess.run(
+        [sys.executable, '-c', code + '\nimport sys\nprint("\\n".join(sys.modules))'],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return set(result.stdout.split())
+
+
+def seconds_to_run(code: str, repeats: int = 3) -> float:
+    """Returns the shortest time, over fresh interpreters, taken to run code, not counting interpreter start-up."""
+    code = f'import time\nstart = time.perf_counter()\n{code}\nprint(time.perf_counter() - start)'
+    return min(
+        float(subprocess.run(
+            [sys.executable, '-c', code], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout)
+        for _ in range(repeats)
+    )
+
+
+def import_seconds(module: str, repeats: int = 3) -> float:
+    """Returns the shortest time, over fresh interpreters, taken to import a module."""
+    return seconds_to_run(f'import {module}', repeats)
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_import_is_lazy(self):
+        modules = modules_loaded_by('import pypopgenbe')
+        self.assertIn('pypopgenbe', modules)
+        self.assertNotIn('pypopgenbe.generatepop', modules)
+        self.assertNotIn('numpy', modules)
+        self.assertNotIn('scipy', modules)
+
+    def test_import_is_faster_than_numpy(self):
+        # Neither time includes starting the interpreter, and the package's own import is a few milliseconds
+        self.assertLess(import_seconds('pypopgenbe'), import_seconds('numpy'))
+
+    @unittest.skipUnless((THIS_DIR.parent / 'popgenconsts.pkl').exists(), "popgenconsts.pkl has not been built")
+    def test_first_generation_is_faster_than_eager_imports(self):
+        # Importing the package and generating a first small population, constants and all, takes less time
+        # than the SciPy modules the generator used to import before it could generate anything
+        first_generation = seconds_to_run(
+            'from pypopgenbe import generate_pop\n'
+            'generate_pop(10, "P3M", (18, 60), (20, 25), (120, 170), 0.5, (0.3, 0.4, 0.3), seed=1)'
+        )
+        self.assertLess(first_generation, seconds_to_run('import numpy, scipy.stats, scipy.interpolate'))
+
+    def test_names_resolve(self):
+        import pypopgenbe
+        for name in pypopgenbe.__all__:
+            with self.subTest(name=name):
+                self.assertIsNotNone(getattr(pypopgenbe, name))
+        with self.assertRaises(AttributeError):
+            getattr(pypopgenbe, 'no_such_name')
+
+    @unittest.skipUnless((THIS_DIR.parent / 'popgenconsts.pkl').exists(), "popgenconsts.pkl has not been built")
+    def test_generation_needs_only_scipy_special(self):
+        self.assertNotIn('scipy', modules_loaded_by('import pypopgenbe.generatepop'))
+
+        modules = modules_loaded_by(
+            'from pypopgenbe import generate_pop\n'
+            'generate_pop(10, "P3M", (18, 60), (20, 25), (120, 170), 0.5, (0.3, 0.4, 0.3), seed=1)\n'
+            'generate_pop(10, "HSE", (18, 60), (20, 25), (120, 170), 0.5, (0.3, 0.4, 0.3), seed=1, engine="vectorized")'
+        )
+        self.assertIn('pypopgenbe.generatepop', modules)
+        self.assertIn('scipy.special', modules)
+        self.assertNotIn('scipy.stats', modules)
+        self.assertNotIn('scipy.interpolate', modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+from pypopgenbe.impl.generatestats import generate_stats
+from pypopgenbe.impl.statsaccumulator import StatsAccumulator, PERCENTILES, PERCENTILE_NAMES
+
+
+def rank_errors(x: np.ndarray, stats: dict) -> np.ndarray:
+    """Distance between the rank of each reported percentile and the requested rank, as a fraction of the rows."""
+    n = x.shape[0]
+    sorted_x = np.sort(x, axis=0)
+    errors = []
+    for p, name in zip(PERCENTILES, PERCENTILE_NAMES):
+        ranks = np.array([np.searchsorted(sorted_x[:, j], stats[name][j]) for j in range(x.shape[1])])
+        errors.append(np.abs(ranks - p / 100. * n) / n)
+    return np.array(errors)
+
+
+class TestStatsAccumulator(unittest.TestCase):
+
+    def test_exact_below_capacity(self):
+        rng = np.random.default_rng(1)
+        x = rng.lognormal(size=(1000, 4))
+        accumulator = StatsAccumulator(capacity=2048)
+        for chunk in np.array_split(x, 7):
+            accumulator.update(chunk)
+
+        self.assertTrue(accumulator.is_exact())
+        expected = generate_stats(x)
+        for key, value in accumulator.stats().items():
+            with self.subTest(key=key):
+                assert_array_equal(value, expected[key])
+
+    def test_single_column_shapes_match_generate_stats(self):
+        for n in (0, 1, 5):
+            x = np.arange(1., n + 1.)
+            stats = StatsAccumulator().update(x).stats()
+            for key, value in generate_stats(x).items():
+                with self.subTest(n=n, key=key):
+                    self.assertEqual(np.shape(stats[key]), np.shape(value))
+
+    def test_streaming_within_bound(self):
+        rng = np.random.default_rng(2)
+        x = rng.lognormal(mean=1., sigma=0.5, size=(100000, 3))
+        accumulator = StatsAccumulator(capacity=512)
+        for chunk in np.array_split(x, 37):
+            accumulator.update(chunk)
+        stats = accumulator.stats()
+
+        self.assertFalse(accumulator.is_exact())
+        assert_allclose(stats['Mean'], np.mean(x, axis=0), rtol=1e-12)
+        assert_allclose(stats['StdDev'], np.std(x, axis=0, ddof=1), rtol=1e-10)
+        assert_allclose(stats['GeoMean'], np.exp(np.mean(np.log(x), axis=0)), rtol=1e-12)
+        assert_allclose(stats['GeoStdDev'], np.exp(np.std(np.log(x), axis=0)), rtol=1e-10)
+
+        bound = accumulator.rank_error_bound()
+        self.assertLess(bound, 0.05)
+        self.assertTrue(np.all(rank_errors(x, stats) <= bound + 1. / x.shape[0]))
+
+    def test_merge_matches_single_accumulator(self):
+        rng = np.random.default_rng(3)
+        x = rng.normal(10., 2., size=(20000, 2))
+        parts = np.array_split(x, 4)
+
+        merged = StatsAccumulator(capacity=256)
+        for part in parts:
+            merged.merge(StatsAccumulator(capacity=256).update(part))
+        stats = merged.stats()
+
+        self.assertEqual(merged.count, x.shape[0])
+        assert_allclose(stats['Mean'], np.mean(x, axis=0), rtol=1e-12)
+        assert_allclose(stats['StdDev'], np.std(x, axis=0, ddof=1), rtol=1e-10)
+        self.assertTrue(np.all(rank_errors(x, stats) <= merged.rank_error_bound() + 1. / x.shape[0]))
+
+    def test_zeros_and_negatives(self):
+        x = np.tile([[0., 1., -1.], [0., 2., 1.], [0., 4., 2.]], (400, 1))
+        stats = StatsAccumulator(capacity=64).update(x).stats()
+        assert_allclose(stats['GeoMean'][:2], [0., 2.])
+        self.assertTrue(np.isnan(stats['GeoStdDev'][0]))
+        self.assertTrue(np.isnan(stats['GeoMean'][2]))
+        self.assertTrue(np.isnan(stats['GeoStdDev'][2]))
+
+    def test_mismatched_columns(self):
+        accumulator = StatsAccumulator().update(np.ones((2, 3)))
+        with self.assertRaises(ValueError):
+            accumulator.update(np.ones((2, 4)))
+        with self.assertRaises(ValueError):
+            StatsAccumulator(capacity=3)
@@ -0,0 +1,55 @@
+import unittest
+from pathlib import Path
+import numpy as np
+from pypopgenbe.generatepop import generate_pop, iter_pop
+from pypopgenbe.impl.summaryaccumulator import SummaryAccumulator
+from pypopgenbe.impl.enum import Dataset
+
+THIS_DIR = Path(__file__).parent
+
+INPUTS = {
+    "population_size": 400,
+    "dataset_name": Dataset.P3M,
+    "age_range": (18, 60),
+    "bmi_range": (20, 25),
+    "height_range": (120, 170),
+    "prob_of_male": 0.5,
+    "probs_of_ethnicities": (0.3, 0.4, 0.3),
+    "seed": 7
+}
+
+
+@unittest.skipUnless((THIS_DIR.parent / 'popgenconsts.pkl').exists(), "popgenconsts.pkl has not been built")
+class TestSummaryAccumulator(unittest.TestCase):
+
+    def test_chunks_match_whole_population(self):
+        pop, _ = generate_pop(**INPUTS, workers=4)
+        assert pop is not None
+
+        # Four workers sample four chunks each
+        accumulator = SummaryAccumulator()
+        for chunk, _ in iter_pop(chunk_size=25, **INPUTS):
+            accumulator.update(chunk)
+        summary = accumulator.summary()
+
+        self.assertEqual(summary.keys(), pop["Summary"].keys())
+        for sex in ["Male", "Female"]:
+            for prop in ["Mass", "Flow"]:
+                for key, value in pop["Summary"][sex][prop].items():
+                    with self.subTest(sex=sex, prop=prop, key=key):
+                        np.testing.assert_array_equal(summary[sex][prop][key], value)
+
+    def test_merge(self):
+        chunks = [chunk for chunk, _ in iter_pop(chunk_size=100, **INPUTS)]
+
+        whole = SummaryAccumulator()
+        for chunk in chunks:
+            whole.update(chunk)
+        merged = SummaryAccumulator().update(chunks[0]).merge(
+            SummaryAccumulator().update(chunks[1]).update(chunks[2]).update(chunks[3]))
+
+        for sex in ["Male", "Female"]:
+            for prop in ["Mass", "Flow", "MPPGL"]:
+                with self.subTest(sex=sex, prop=prop):
+                    np.testing.assert_allclose(
+                        merged.summary()[sex][prop]["Median"], whole.summary()[sex][prop]["Median"])
@@ -0,0 +1,42 @@
+import unittest
+import numpy as np
+from scipy.stats import truncnorm, kstest
+from pypopgenbe.impl.truncatednormrnd import truncated_norm_rnd
+
+
+class TestTruncatedNormRnd(unittest.TestCase):
+
+    def test_matches_truncnorm(self):
+        rng = np.random.default_rng(3)
+        for mu, sigma, lower, upper in [(70., 10., 50., 80.), (70., 10., 75., 120.), (20., 4., -np.inf, 18.)]:
+            with self.subTest(mu=mu, sigma=sigma, lower=lower, upper=upper):
+                n = 50000
+                r = truncated_norm_rnd(np.full(n, mu), np.full(n, sigma), lower, upper, rng)
+                assert isinstance(r, np.ndarray)
+                self.assertTrue(np.all((r >= lower) & (r <= upper)))
+                a, b = (lower - mu) / sigma, (upper - mu) / sigma
+                _, p = kstest(r, truncnorm(a, b, loc=mu, scale=sigma).cdf)
+                self.assertGreater(p, 0.001)
+
+    def test_far_tails(self):
+        rng = np.random.default_rng(4)
+        n = 10000
+        for lower, upper in [(40., 41.), (-41., -40.), (60., np.inf)]:
+            with self.subTest(lower=lower, upper=upper):
+                r = truncated_norm_rnd(np.zeros(n), np.ones(n), lower, upper, rng)
+                assert isinstance(r, np.ndarray)
+                self.assertTrue(np.all(np.isfinite(r)))
+                self.assertTrue(np.all((r >= lower) & (r <= upper)))
+                # Mass is concentrated at the bound nearest the mean
+                nearest = lower if lower > 0 else upper
+                self.assertLess(np.median(np.abs(r - nearest)), 0.1)
+                self.assertGreater(np.unique(r).size, n // 2)
+
+    def test_array_inputs_and_scalar_output(self):
+        rng = np.random.default_rng(5)
+        mu = np.array([10., 50., 90.])
+        r = truncated_norm_rnd(mu, 0.1 * mu, 0., 100., rng)
+        assert isinstance(r, np.ndarray)
+        self.assertEqual(r.shape, (3,))
+        self.assertIsInstance(truncated_norm_rnd(70., 7., 60., 80., rng), float)
+        self.assertEqual(truncated_norm_rnd(70., 0., 60., 80., rng), 70.)
@@ -0,0 +1,47 @@
+import unittest
+import numpy as np
+from pypopgenbe.impl.varyorgans import vary_organs, vary_lognormal
+
+
+class TestVaryOrgans(unittest.TestCase):
+
+    variation = {
+        "Sigma": np.array([
+            [np.sqrt(np.log(0.3**2 + 1.)), 0.1],
+            [np.sqrt(np.log(0.5**2 + 1.)), 0.2]
+        ]),
+        "IsLognormal": np.array([
+            [True, False],
+            [True, False]
+        ])
+    }
+
+    def test_moments_by_sex(self):
+        rng = np.random.default_rng(7)
+        n = 200000
+        sexes = np.repeat([1, 2], n // 2)
+        targets = np.tile([4., 2.], (n, 1))
+
+        varied = vary_organs(targets, sexes, self.variation, rng)
+
+        self.assertEqual(varied.shape, targets.shape)
+        for sex, coeffs_of_var in ((1, [0.3, 0.1]), (2, [0.5, 0.2])):
+            rows = varied[sexes == sex]
+            np.testing.assert_allclose(rows.mean(axis=0), [4., 2.], rtol=0.01)
+            np.testing.assert_allclose(rows.std(axis=0) / rows.mean(axis=0), coeffs_of_var, rtol=0.03)
+        self.assertTrue(np.all(varied[:, 0] > 0))
+
+    def test_negative_lognormal_target_is_nan(self):
+        varied = vary_organs(np.array([[-1., -1.]]), np.array([1]), self.variation, np.random.default_rng(8))
+
+        self.assertTrue(np.isnan(varied[0, 0]))
+        self.assertTrue(np.isfinite(varied[0, 1]))
+
+    def test_vary_lognormal(self):
+        rng = np.random.default_rng(9)
+        means = np.full(200000, 3.)
+
+        varied = vary_lognormal(means, 0.42, rng)
+
+        self.assertAlmostEqual(varied.mean(), 3., delta=0.03)
+        self.assertAlmostEqual(varied.std() / varied.mean(), 0.42, delta=0.01)
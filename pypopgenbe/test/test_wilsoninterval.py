@@ -0,0 +1,24 @@
+import unittest
+import numpy as np
+from pypopgenbe.impl.wilsoninterval import wilson_interval
+
+
+class TestWilsonInterval(unittest.TestCase):
+
+    def test_covers_proportion(self):
+        rng = np.random.default_rng(9)
+        for p in [0.5, 0.1, 0.001]:
+            with self.subTest(p=p):
+                trials = 5000
+                bounds = [wilson_interval(s, trials) for s in rng.binomial(trials, p, size=2000)]
+                is_covered = [lower <= p <= upper for lower, upper in bounds]
+                self.assertGreater(np.mean(is_covered), 0.93)
+
+    def test_no_successes(self):
+        lower, upper = wilson_interval(0, 10000)
+        self.assertEqual(lower, 0.)
+        self.assertLess(upper, 5e-4)
+
+
+if __name__ == '__main__':
+    unittest.main()
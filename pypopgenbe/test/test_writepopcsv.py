@@ -0,0 +1,73 @@
+import io
+import unittest
+from pathlib import Path
+from pypopgenbe.generatepop import generate_pop
+from pypopgenbe.impl.poptocsv import pop_to_csv
+from pypopgenbe.impl.writepopcsv import write_pop_csv
+from pypopgenbe.impl.enum import Dataset, Engine
+
+THIS_DIR = Path(__file__).parent
+
+INPUTS = {
+    "population_size": 60,
+    "dataset_name": Dataset.P3M,
+    "age_range": (18, 60),
+    "bmi_range": (20, 25),
+    "height_range": (120, 170),
+    "prob_of_male": 0.5,
+    "probs_of_ethnicities": (0.3, 0.4, 0.3),
+    "seed": 11,
+    "engine": Engine.Vectorized
+}
+
+
+@unittest.skipUnless((THIS_DIR.parent / 'popgenconsts.pkl').exists(), "popgenconsts.pkl has not been built")
+class TestWritePopCsv(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pops = [
+            generate_pop(**INPUTS)[0],
+            generate_pop(**INPUTS | {
+                "dataset_name": Dataset.HSE,
+                "enzyme_rate_parameter": "CLint",
+                "enzyme_names": ["CYP3A4", "CYP2D6"],
+                "in_vitro_enzyme_rates": [1., 2.],
+                "in_vitro_enzyme_rate_coeffs_of_var": [0.3, 0.3],
+                "enzyme_rate_units": "MicroLitresPerMinute",
+                "is_richly_perfused_tissue_discrete": True
+            })[0]
+        ]
+
+    def test_matches_pop_to_csv(self):
+        for pop in self.pops:
+            for delim in [',', ';', '\t', ' ', '.', 'e', '1']:
+                with self.subTest(dataset=pop['Inputs']['Population']['Dataset'], delim=delim):
+                    expected = ''.join(line + '\n' for line in pop_to_csv(pop, delim))
+
+                    text = io.StringIO()
+                    write_pop_csv(pop, text, delim, block_size=7)
+                    self.assertEqual(text.getvalue(), expected)
+
+                    binary = io.BytesIO()
+                    write_pop_csv(pop, binary, delim)
+                    self.assertEqual(binary.getvalue(), expected.encode('utf-8'))
+
+    def test_float_format(self):
+        pop = self.pops[0]
+        text = io.StringIO()
+        write_pop_csv(pop, text, float_format='%.3f')
+        row = text.getvalue().splitlines()[1].split(',')
+        self.assertEqual(row[0], '1')
+        self.assertEqual(row[1], f"{pop['Roots']['Values'][0, 0]:.3f}")
+        self.assertEqual(row[2], pop['Roots']['Sexes'][int(pop['Roots']['Values'][0, 1]) - 1])
+
+    def test_invalid_delim(self):
+        with self.assertRaises(ValueError):
+            write_pop_csv(self.pops[0], io.StringIO(), '"')
+        with self.assertRaises(TypeError):
+            write_pop_csv(self.pops[0], io.StringIO(), ', ')
+
+
+if __name__ == '__main__':
+    unittest.main()